@@ -0,0 +1,128 @@
+"""
+bench_logging.py
+================
+
+Log throughput benchmark.
+
+- "sync": handlers called in the logging thread, with the previous size check that formats
+  and encodes every record a second time and asks the stream for its position.
+- "queue": the project setup; callers only enqueue, one listener thread writes through a
+  `HandlerFanout` to the rotating file handler (running size estimate) and the console.
+- Reports the time worker threads spend inside logging calls and the time until every record
+  is on disk. The console handler writes to os.devnull.
+
+Usage: python benchmarks/bench_logging.py [--threads T] [--records N]
+
+日志吞吐基准测试。
+
+- "sync"：在调用线程中同步写入，使用旧的大小检查（每条日志重复格式化、编码并查询文件位置）。
+- "queue"：项目当前方案，调用线程只入队，由监听线程通过 `HandlerFanout` 写入轮转文件（累计估算大小）和控制台。
+- 统计工作线程在日志调用中花费的时间，以及全部日志落盘所需时间。控制台输出重定向到 os.devnull。
+"""
+
+# ===== Standard Library Modules =====
+import argparse
+import logging
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# ===== Custom Project Modules =====
+from logger import HandlerFanout, SizeAndTimeRotatingFileHandler, formatter
+
+
+class LegacyRotatingFileHandler(SizeAndTimeRotatingFileHandler):
+    """Size check as it was before the running estimate."""
+
+    def shouldRollover(self, record):
+        if logging.handlers.TimedRotatingFileHandler.shouldRollover(self, record):
+            return 1
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0:
+            msg = f"{self.format(record)}\n"
+            if self.stream.tell() + len(msg.encode(self.encoding or "utf-8")) >= self.maxBytes:
+                return 1
+        return 0
+
+    def emit(self, record):
+        logging.handlers.TimedRotatingFileHandler.emit(self, record)
+
+
+def make_handlers(handler_cls, log_path: Path, devnull) -> list[logging.Handler]:
+    file_handler = handler_cls(log_path, maxBytes=5 * 1024 * 1024, backupDays=1)
+    console_handler = logging.StreamHandler(devnull)
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(formatter)
+    return [file_handler, console_handler]
+
+
+def run(name: str, threads: int, records: int, tmp_dir: Path, devnull) -> tuple[float, float]:
+    bench_logger = logging.getLogger(f"bench_{name}")
+    bench_logger.setLevel(logging.INFO)
+    bench_logger.propagate = False
+    listener = None
+
+    if name == "sync":
+        handlers = make_handlers(LegacyRotatingFileHandler, tmp_dir / "sync.log", devnull)
+        for handler in handlers:
+            bench_logger.addHandler(handler)
+    else:
+        handlers = make_handlers(SizeAndTimeRotatingFileHandler, tmp_dir / "queue.log", devnull)
+        fanout = HandlerFanout()
+        for handler in handlers:
+            fanout.add(handler)
+        log_queue = queue.SimpleQueue()
+        bench_logger.addHandler(QueueHandler(log_queue))
+        listener = QueueListener(log_queue, fanout)
+        listener.start()
+
+    caller_time = [0.0] * threads
+
+    def worker(n: int):
+        start = time.perf_counter()
+        for i in range(records):
+            bench_logger.info("Page %s Book %s: https://img.example.com/cover/%s.jpg saved", n, i, i)
+        caller_time[n] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    if listener is not None:
+        listener.stop()
+    total = time.perf_counter() - start
+
+    for handler in handlers:
+        handler.close()
+    bench_logger.handlers.clear()
+    return max(caller_time), total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[4])
+    parser.add_argument("--threads", type=int, default=8, help="Logging threads")
+    parser.add_argument("--records", type=int, default=20000, help="Records per thread")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        results = {name: run(name, args.threads, args.records, Path(tmp), devnull) for name in ("sync", "queue")}
+
+    count = args.threads * args.records
+    print(f"{args.threads} threads x {args.records} records")
+    print(f"{'mode':<7}{'caller s':>10}{'total s':>10}{'records/s (caller)':>20}")
+    for name, (caller, total) in results.items():
+        print(f"{name:<7}{caller:>10.3f}{total:>10.3f}{count / caller:>20.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+bench_pipeline.py
+=================
+
+Offline end-to-end benchmark of the crawl pipeline against the local fixture server.
+
+- Drives the same stages as `main.run_pipeline`: result pages and covers (`parse_product_http`,
+  or `parse_product` through Selenium, with `process_image` running in the image stage),
+  `final_download_for_fail_img` on seeded first-attempt failures, then `save_info`.
+- Reports items/sec, images/sec, stage timings, peak RSS and what the server injected, and
+  writes them as JSON so a later run can be compared with `--baseline`.
+- Image store, HTTP cache and rate limiting are off unless asked for, so every run pays the
+  full network path.
+
+Usage:
+    python benchmarks/bench_pipeline.py --pages 10 --items-per-page 60 --latency 0.02 --error-rate 0.05 \\
+        --output benchmarks/results/current.json --baseline benchmarks/results/baseline.json
+
+基于本地夹具服务器的离线端到端基准测试。
+
+- 执行与 `main.run_pipeline` 相同的阶段：结果页与封面（`parse_product_http`，或通过 Selenium 的
+  `parse_product`，`process_image` 在图片阶段中运行）、对预置的首次下载失败执行
+  `final_download_for_fail_img`，最后 `save_info`。
+- 输出每秒商品数、每秒图片数、各阶段耗时、峰值内存以及服务器注入的故障统计，并写成 JSON，
+  之后可用 `--baseline` 与新结果对比。
+- 默认关闭图片存储、HTTP 缓存和限速，每次运行都走完整的网络路径。
+"""
+
+# ===== Standard Library Modules =====
+import argparse
+import json
+import platform
+import shutil
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Optional: peak RSS on Unix
+try:
+    import resource
+except ImportError:
+    resource = None
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+# ===== Custom Project Modules =====
+import config
+import context as ctx_mod
+import image_process as img_pro
+import parse_module as parse_m
+import request_module as req_m
+import storage_module as sto_m
+from fixture_server import FixtureServer, add_fault_arguments, faults_from_args
+from logger import flush_log_writers, remove_file_handler
+
+BENCH_KEYWORD = "benchmark"
+
+# Results compared against a baseline; higher is better unless listed in LOWER_IS_BETTER
+COMPARED = ["items_per_sec", "images_per_sec", "parse_seconds", "retry_seconds", "save_seconds",
+            "total_seconds", "peak_rss_mb"]
+LOWER_IS_BETTER = {"parse_seconds", "retry_seconds", "save_seconds", "total_seconds", "peak_rss_mb"}
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in MB (None where `resource` is unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def configure(args, server: FixtureServer):
+    """Point the project configuration at the fixture server."""
+    config.HTTP_FETCH_CONFIG["fetch_mode"] = args.fetch
+    config.HTTP_FETCH_CONFIG["search_url"] = f"{server.base_url}/search"
+    config.PARSE_PRODUCT_CONFIG["total_pages"] = args.pages
+    config.IMAGE_DOWNLOAD_CONFIG["engine"] = args.engine
+    config.IMAGE_STORE_CONFIG["enabled"] = args.image_store
+    config.HTTP_CACHE_CONFIG["enabled"] = args.http_cache
+    config.RATE_LIMIT_CONFIG["enabled"] = args.rate_limit
+    config.OUTPUT_CONFIG["format"] = args.sink
+
+
+def tap_rows(context, count: int) -> list:
+    """Keep the first `count` rows streamed to the sink (the pipeline itself holds no rows)."""
+    rows = []
+    write_rows = context.sink.write_rows
+
+    def tapped(records, update=False):
+        if not update:
+            rows.extend(records[:count - len(rows)])
+        write_rows(records, update)
+
+    context.sink.write_rows = tapped
+    return rows
+
+
+def seed_retries(rows: list, context, base_url: str) -> int:
+    """Queue rows for the second-pass download, as if their first save had failed."""
+    seeded = 0
+    for record in rows:
+        img_path = context.images_dir / f"retry_{record.page}_{record.idx}.jpg"
+        img_pro.fail_download_image_add_logging(
+            context.first_download_fail_list, f"{base_url}/img/retry/{record.page}_{record.idx}.jpg", str(img_path),
+            record.title, record.price, record.author, record.page, record.idx,
+            "Seeded by benchmark", "OK", 0, False
+        )
+        seeded += 1
+    return seeded
+
+
+def run(args) -> dict:
+    server = FixtureServer(faults_from_args(args), record_dir=args.record_dir).start()
+    configure(args, server)
+    context = ctx_mod.create_context(BENCH_KEYWORD)
+    run_dir = context.excel_path.parent
+    dev_dir = context.metrics_summary_path.parent
+    timings = {}
+    seed_rows = tap_rows(context, args.retry_items)
+    try:
+        start = time.perf_counter()
+        if args.fetch == "http":
+            page_counts = parse_m.parse_product_http(
+                BENCH_KEYWORD, context, config.PARSE_PRODUCT_CONFIG, config.HTTP_FETCH_CONFIG
+            )
+        else:
+            driver = req_m.open_search_page(BENCH_KEYWORD, f"{server.base_url}/", config.PARSE_PRODUCT_CONFIG)
+            try:
+                page_counts = parse_m.parse_product(driver, context, config.PARSE_PRODUCT_CONFIG)
+            finally:
+                req_m.driver_quit(driver)
+        timings["parse_seconds"] = time.perf_counter() - start
+
+        seeded = seed_retries(seed_rows, context, server.base_url)
+        start = time.perf_counter()
+        img_pro.final_download_for_fail_img(context, config.IMAGE_DOWNLOAD_CONFIG)
+        timings["retry_seconds"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sto_m.save_info(context)
+        timings["save_seconds"] = time.perf_counter() - start
+    finally:
+        context.image_client.close()
+        if context.async_engine is not None:
+            context.async_engine.close()
+        context.checkpoint.close()
+        if context.rate_limiter is not None:
+            context.rate_limiter.record_metrics(context.metrics)
+        summary = context.metrics.summary()
+        flush_log_writers()
+        if context.run_log_handler is not None:
+            remove_file_handler(context.run_log_handler)
+        server.stop()
+
+    items = sum(page_counts.values())
+    images = sum(1 for path in context.images_dir.iterdir() if path.suffix == ".jpg")
+    image_seconds = timings["parse_seconds"] + timings["retry_seconds"]
+    result = {
+        "started_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "baseline", "keep")},
+        "items": items,
+        "images_saved": images,
+        "retries_seeded": seeded,
+        **{key: round(value, 3) for key, value in timings.items()},
+        "total_seconds": round(sum(timings.values()), 3),
+        "items_per_sec": round(items / timings["parse_seconds"], 1) if timings["parse_seconds"] else None,
+        "images_per_sec": round(images / image_seconds, 1) if image_seconds else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "server": dict(server.stats),
+        "metrics": summary,
+    }
+    if not args.keep:
+        shutil.rmtree(run_dir, ignore_errors=True)
+        shutil.rmtree(dev_dir, ignore_errors=True)
+    return result
+
+
+def compare(result: dict, baseline: dict):
+    """Print every compared value next to the baseline, with the change in percent."""
+    print(f"{'metric':<16}{'baseline':>12}{'current':>12}{'change':>10}")
+    for key in COMPARED:
+        old, new = baseline.get(key), result.get(key)
+        if old is None or new is None:
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        better = (change < 0) == (key in LOWER_IS_BETTER)
+        marker = "" if abs(change) < 1 else (" +" if better else " -")
+        print(f"{key:<16}{old:>12}{new:>12}{change:>9.1f}%{marker}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline end-to-end pipeline benchmark")
+    parser.add_argument("--fetch", choices=["http", "selenium"], default="http",
+                        help="Result page path (selenium needs Chrome)")
+    parser.add_argument("--engine", choices=["asyncio", "threads"], default=config.IMAGE_DOWNLOAD_CONFIG["engine"],
+                        help="Image engine")
+    parser.add_argument("--sink", default="csv", help="Row sink format (csv, jsonl, parquet)")
+    parser.add_argument("--retry-items", type=int, default=20,
+                        help="Rows seeded as first-download failures for the second pass")
+    parser.add_argument("--record-dir", help="Serve recorded page_<N>.html files instead of generated pages")
+    parser.add_argument("--image-store", action="store_true", help="Keep the content-addressed image store on")
+    parser.add_argument("--http-cache", action="store_true", help="Keep the conditional HTTP cache on")
+    parser.add_argument("--rate-limit", action="store_true", help="Keep the per-host rate limiter on")
+    parser.add_argument("--output", help="Write the result JSON here")
+    parser.add_argument("--baseline", help="Result JSON of an earlier run to compare with")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark's output and dev log directories")
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+
+    result = run(args)
+    print(json.dumps({key: value for key, value in result.items() if key != "metrics"}, ensure_ascii=False, indent=2))
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.baseline:
+        compare(result, json.loads(Path(args.baseline).read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
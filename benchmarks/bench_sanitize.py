@@ -0,0 +1,107 @@
+"""
+bench_sanitize.py
+=================
+
+Micro-benchmark for file name sanitization.
+
+- Compares the previous `sanitize_filename` (regexes compiled per call, jieba on every
+  CJK title) with the precompiled, cached `FilenameSanitizer`.
+- Runs a cold pass (every title new) and a warm pass (titles repeated, as on reruns and
+  second-pass retries).
+
+Usage: python benchmarks/bench_sanitize.py [--titles N] [--repeat R]
+
+文件名清理的微基准测试。
+
+- 对比旧版 `sanitize_filename`（每次调用编译正则、所有中文标题都走 jieba 分词）与预编译并带缓存的
+  `FilenameSanitizer`。
+- 分别测量冷启动（标题均不重复）和热缓存（标题重复出现，如重跑和二次重试）两种情况。
+"""
+
+# ===== Standard Library Modules =====
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# ===== Third-Party Library Modules =====
+import jieba
+
+# ===== Custom Project Modules =====
+import image_process as img_pro
+from config import SANITIZE_RULES
+
+CN_WORDS = ["深度学习", "人工智能", "入门", "实战", "教程", "数据", "分析", "算法", "第3版", "精装"]
+EN_WORDS = ["Python", "Deep", "Learning", "for", "Data", "Analysis", "Second", "Edition", "Guide"]
+
+
+def legacy_sanitize_filename(title: str, rules: dict) -> str:
+    """
+    Per-call `sanitize_filename` as it was before the precompiled sanitizer, with the CJK
+    check moved ahead of the character filter (the old order never reached jieba at all).
+    """
+    allowed_chars = rules.get("allowed_chars", "")
+    if re.search(r'[\u4e00-\u9fff]', title):
+        title = re.sub(f"[^0-9a-zA-Z\u4e00-\u9fff{re.escape(allowed_chars)}]", "", title)
+        clean_title = re.sub(r'[\/:*?"<>|]', '', title)
+        words = list(jieba.cut(clean_title))
+        title = ''.join(words[:rules.get("max_words_cn")])
+        if len(title) > rules.get("max_length"):
+            title = title[:rules.get("max_length")] + '...'
+    else:
+        title = re.sub(f"[^0-9a-zA-Z{re.escape(allowed_chars)}]", "_", title)
+        title = img_pro.truncate_english(title, max_words=rules.get("max_words_en"),
+                                         max_length=rules.get("max_length"))
+        title = title.replace(" ", rules.get("replace_space", "_"))
+    return title
+
+
+def make_titles(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    titles = []
+    for i in range(count):
+        words = CN_WORDS if i % 2 else EN_WORDS
+        sep = "" if i % 2 else " "
+        titles.append(sep.join(rng.choice(words) for _ in range(rng.randint(1, 6))) + f" {i}")
+    return titles
+
+
+def bench(func, titles: list[str]) -> float:
+    start = time.perf_counter()
+    for title in titles:
+        func(title)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[4])
+    parser.add_argument("--titles", type=int, default=2000, help="Distinct titles")
+    parser.add_argument("--repeat", type=int, default=5, help="Passes over the titles in the warm run")
+    args = parser.parse_args(argv)
+
+    jieba.initialize()
+    img_pro.warm_tokenizer()
+    titles = make_titles(args.titles)
+    warm = titles * args.repeat
+
+    legacy = lambda t: legacy_sanitize_filename(t, SANITIZE_RULES)
+    sanitizer = img_pro.FilenameSanitizer(SANITIZE_RULES)
+
+    legacy_cold = bench(legacy, titles)
+    new_cold = bench(sanitizer.sanitize, titles)
+    legacy_warm = bench(legacy, warm)
+    new_warm = bench(sanitizer.sanitize, warm)
+
+    print(f"{'pass':<6}{'titles':>9}{'legacy s':>11}{'new s':>9}{'speedup':>9}")
+    for name, n, old, new in (("cold", len(titles), legacy_cold, new_cold),
+                              ("warm", len(warm), legacy_warm, new_warm)):
+        print(f"{name:<6}{n:>9}{old:>11.3f}{new:>9.3f}{old / new:>8.1f}x")
+    print(f"cache: {sanitizer.sanitize.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
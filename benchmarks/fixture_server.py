@@ -0,0 +1,304 @@
+"""
+fixture_server.py
+=================
+
+Local HTTP server that stands in for dangdang.com during benchmarks.
+
+- `/` serves a home page with the `key_S` search box, so the Selenium path can search.
+- `/search?key=...&page_index=N` serves result pages built from the HTML fixtures in
+  `benchmarks/fixtures/`, or recorded pages (`page_<N>.html`) from a directory, with their
+  cover URLs rewritten to this server.
+- `/img/...` serves synthetic JPEG covers with an ETag, answering a matching If-None-Match with 304.
+- Faults are injected per `FaultConfig`: latency (with jitter), 503 responses, placeholder
+  cover URLs and truncated image bodies. 503s and truncation hit the first attempt of a URL
+  only, so retries can succeed; which URLs are hit is decided by a seeded hash, so runs
+  are repeatable.
+
+Usage: python benchmarks/fixture_server.py --port 8000 --latency 0.02 --error-rate 0.05
+
+基准测试用的本地 HTTP 服务器，代替 dangdang.com。
+
+- `/` 提供带 `key_S` 搜索框的首页，供 Selenium 路径搜索。
+- `/search?key=...&page_index=N` 返回由 `benchmarks/fixtures/` 中 HTML 模板生成的结果页，
+  或目录中录制的页面（`page_<N>.html`），封面地址会改写为本服务器。
+- `/img/...` 返回带 ETag 的合成 JPEG 封面，If-None-Match 匹配时返回 304。
+- 按 `FaultConfig` 注入故障：延迟（含抖动）、503 响应、占位图地址、截断的图片响应。
+  503 和截断只作用于同一 URL 的首次请求，重试可以成功；命中哪些 URL 由带种子的哈希决定，结果可复现。
+"""
+
+# ===== Standard Library Modules =====
+import argparse
+import collections
+import hashlib
+import http.server
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlsplit
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Cover hosts of recorded pages, rewritten to the fixture server
+RECORDED_IMAGE_HOST = re.compile(r'(?:https?:)?//img\d*m?\d*\.ddimg\.cn/')
+
+
+@dataclass
+class FaultConfig:
+    """
+    Response shaping of the fixture server.
+
+    Attributes:
+        latency: Seconds added to every response.
+        jitter: Extra random latency, uniform in [0, jitter] seconds.
+        error_rate: Share of cover URLs whose first request gets a 503.
+        placeholder_rate: Share of products whose cover URL is a placeholder graphic.
+        truncated_rate: Share of cover URLs whose first response is cut off mid-body.
+        image_size: Bytes per synthetic cover.
+        pages: Result pages with products (later pages are empty).
+        items_per_page: Products per generated result page.
+        seed: Seed of the per-URL fault decisions.
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    placeholder_rate: float = 0.0
+    truncated_rate: float = 0.0
+    image_size: int = 20_000
+    pages: int = 10
+    items_per_page: int = 60
+    seed: int = 0
+
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    """Request handler; configuration and counters live on the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        server.count("requests")
+        server.delay(self.path)
+
+        if url.path.startswith("/img/"):
+            return self._send_image(url.path)
+        if url.path == "/search":
+            try:
+                query = parse_qs(url.query, errors="strict")
+            except UnicodeDecodeError:
+                # Keywords are GBK-encoded like on DangDang; the home page form sends UTF-8
+                query = parse_qs(url.query, encoding="gbk")
+            page = int(query.get("page_index", ["1"])[0])
+            keyword = query.get("key", [""])[0]
+            return self._send(200, "text/html; charset=utf-8", server.result_page(keyword, page))
+        if url.path == "/":
+            return self._send(200, "text/html; charset=utf-8", HOME_PAGE)
+        return self._send(404, "text/plain", b"not found")
+
+    def _send_image(self, path: str):
+        server = self.server
+        attempt = server.attempt(path)
+        if attempt == 1 and server.hit(path, "error", server.faults.error_rate):
+            server.count("503")
+            return self._send(503, "text/plain", b"")
+        body = server.image_body(path)
+        if attempt == 1 and server.hit(path, "truncated", server.faults.truncated_rate):
+            server.count("truncated")
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            server.count("304")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        server.count("images")
+        server.count("image_bytes", len(body))
+        self._send(200, "image/jpeg", body, {"ETag": etag})
+
+    def _send(self, status: int, content_type: str, body: bytes, headers: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+HOME_PAGE = (
+    '<html><head><meta charset="utf-8"></head><body>'
+    '<form action="/search" method="get"><input id="key_S" name="key" type="text"></form>'
+    '</body></html>'
+).encode("utf-8")
+
+
+class FixtureServer(http.server.ThreadingHTTPServer):
+    """
+    Threaded fixture server.
+
+    Attributes:
+        faults (FaultConfig): Response shaping.
+        stats (collections.Counter): Requests, 503s, truncated bodies, images and bytes served.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, faults: FaultConfig = None, host: str = "127.0.0.1", port: int = 0,
+                 record_dir=None):
+        """
+        Args:
+            faults: Response shaping; defaults to no faults.
+            host: Bind address.
+            port: Bind port (0 picks a free one).
+            record_dir: Directory with recorded result pages `page_<N>.html` to serve instead
+                of the generated ones.
+        """
+        super().__init__((host, port), FixtureHandler)
+        self.faults = faults or FaultConfig()
+        self.stats = collections.Counter()
+        self._attempts = collections.Counter()
+        self._lock = threading.Lock()
+        self._page_template = (FIXTURE_DIR / "search_page.html").read_text(encoding="utf-8")
+        self._item_template = (FIXTURE_DIR / "search_item.html").read_text(encoding="utf-8")
+        self._recorded = self._load_recorded(Path(record_dir)) if record_dir else None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self) -> "FixtureServer":
+        """Serve in a daemon thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def attempt(self, path: str) -> int:
+        """Number of requests made for a path so far, this one included."""
+        with self._lock:
+            self._attempts[path] += 1
+            return self._attempts[path]
+
+    def hit(self, path: str, fault: str, rate: float) -> bool:
+        """Seeded, per-path decision whether a fault applies."""
+        if rate <= 0:
+            return False
+        digest = hashlib.blake2b(f"{self.faults.seed}:{fault}:{path}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2 ** 64 < rate
+
+    def delay(self, path: str):
+        faults = self.faults
+        wait = faults.latency
+        if faults.jitter:
+            digest = hashlib.blake2b(f"{path}:{self.stats['requests']}".encode(), digest_size=4).digest()
+            wait += faults.jitter * int.from_bytes(digest, "big") / 2 ** 32
+        if wait > 0:
+            time.sleep(wait)
+
+    def image_body(self, path: str) -> bytes:
+        """Synthetic JPEG: SOI/APP0 magic bytes followed by path-dependent filler."""
+        filler = hashlib.sha256(path.encode()).digest()
+        size = max(self.faults.image_size, 16)
+        return (b"\xff\xd8\xff\xe0" + filler * (size // len(filler) + 1))[:size]
+
+    def result_page(self, keyword: str, page: int) -> bytes:
+        if self._recorded is not None:
+            return self._recorded.get(page, b"<html><body></body></html>")
+        if page > self.faults.pages:
+            return self._page_template.format(keyword=keyword, items="", next_page="").encode("utf-8")
+
+        host = f"//{self.server_address[0]}:{self.server_address[1]}"
+        items = []
+        for idx in range(1, self.faults.items_per_page + 1):
+            sku = 29000000 + page * 1000 + idx
+            if self.hit(f"{page}/{idx}", "placeholder", self.faults.placeholder_rate):
+                img_url = f"{host}/img/images/model/guan/nofound_o.jpg"
+            else:
+                img_url = f"{host}/img/{sku}-1_b_3.jpg"
+            items.append(self._item_template.format(
+                idx=idx, sku=sku, img_url=img_url,
+                title=f"{keyword} 实战教程 第{page}页 第{idx}本 Python 深度学习 机器学习 入门到精通",
+                price=f"{40 + idx % 50}.80", list_price=f"{60 + idx % 50}.00", author=f"作者{idx}"
+            ))
+        next_page = ""
+        if page < self.faults.pages:
+            key = quote(keyword, encoding="gbk")
+            next_page = f'<li class="next"><a href="/search?key={key}&amp;page_index={page + 1}" title="下一页">下一页</a></li>'
+        return self._page_template.format(keyword=keyword, items="\n".join(items), next_page=next_page).encode("utf-8")
+
+    def _load_recorded(self, record_dir: Path) -> dict[int, bytes]:
+        pages = {}
+        for path in record_dir.glob("page_*.html"):
+            page = int(re.search(r"page_(\d+)", path.name).group(1))
+            html = path.read_bytes().decode("utf-8", errors="replace")
+            html = RECORDED_IMAGE_HOST.sub(f"//{self.server_address[0]}:{self.server_address[1]}/img/", html)
+            pages[page] = html.encode("utf-8")
+        return pages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local dangdang.com stand-in for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--record-dir", help="Serve recorded page_<N>.html files from this directory")
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = FixtureServer(faults_from_args(args), args.host, args.port, args.record_dir)
+    print(f"Serving on {server.base_url} (search URL: {server.base_url}/search)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(dict(server.stats))
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser):
+    """Command line options for every `FaultConfig` field."""
+    defaults = FaultConfig()
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=defaults.jitter, help="Extra random latency (max seconds)")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate,
+                        help="Share of cover URLs whose first request gets a 503")
+    parser.add_argument("--placeholder-rate", type=float, default=defaults.placeholder_rate,
+                        help="Share of products with a placeholder cover URL")
+    parser.add_argument("--truncated-rate", type=float, default=defaults.truncated_rate,
+                        help="Share of cover URLs whose first response is truncated")
+    parser.add_argument("--image-size", type=int, default=defaults.image_size, help="Bytes per synthetic cover")
+    parser.add_argument("--pages", type=int, default=defaults.pages, help="Result pages with products")
+    parser.add_argument("--items-per-page", type=int, default=defaults.items_per_page, help="Products per page")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Seed of the fault decisions")
+
+
+def faults_from_args(args: argparse.Namespace) -> FaultConfig:
+    return FaultConfig(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        placeholder_rate=args.placeholder_rate, truncated_rate=args.truncated_rate,
+        image_size=args.image_size, pages=args.pages, items_per_page=args.items_per_page, seed=args.seed
+    )
+
+
+if __name__ == "__main__":
+    main()
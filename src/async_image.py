@@ -0,0 +1,362 @@
+"""
+async_image.py
+==============
+
+This module provides an asyncio engine for cover image requests, built on aiohttp.
+
+- One event loop running in a background thread serves every image request of a run, so
+  thousands of covers can be in flight without a thread each.
+- Concurrent requests are capped per host by an asyncio semaphore (and by the connector's
+  global connection limit).
+- Retries back off with `asyncio.sleep`, so a waiting request blocks nothing else.
+- Requests are paced by the shared per-host rate limiter without blocking the loop.
+- Async versions of `is_valid_image`, `validate_image_with_retry`, `download_image`,
+  `process_image` and `final_download_for_fail_img`. The functions in image_process stay
+  synchronous and delegate here when the context carries an engine.
+- aiohttp is optional: without it `get_async_engine` returns None and the thread-pool path is used.
+
+本模块提供基于 aiohttp 的封面图 asyncio 下载引擎。
+
+- 后台线程中运行一个事件循环，承载本次运行的全部图片请求，上千张封面可同时处理而无需对应数量的线程。
+- 通过 asyncio 信号量按主机限制并发请求数（连接器另有全局连接数上限）。
+- 重试退避使用 `asyncio.sleep`，等待中的请求不会阻塞其他请求。
+- 请求由共享的按主机限速器控制节奏，等待令牌时不阻塞事件循环。
+- 提供 `is_valid_image`、`validate_image_with_retry`、`download_image`、`process_image` 和
+  `final_download_for_fail_img` 的异步版本；image_process 中的同步函数保持不变，
+  当 context 带有引擎时委托给本模块执行。
+- aiohttp 为可选依赖：未安装时 `get_async_engine` 返回 None，继续使用线程池方式。
+"""
+
+# ===== Standard Library Modules =====
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# ===== Third-Party Library Modules =====
+# Optional: asyncio image engine
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# ===== Custom Project Modules =====
+import image_process as img_pro
+from config import IMAGE_VALIDATION_CONFIG, IMAGE_DOWNLOAD_CONFIG
+from logger import *
+
+
+class AsyncImageEngine:
+    """
+    aiohttp session and event loop shared by all image jobs of one run.
+
+    The loop runs in a daemon thread. Synchronous callers use `run` (wait for one
+    coroutine) or `submit` (get a `concurrent.futures.Future`); the coroutines
+    themselves never block on the network.
+
+    Attributes:
+        per_host_limit (int): Maximum concurrent requests to one host.
+        requests (int): HTTP requests sent, retries included.
+        retries (int): Requests repeated after an error or a retryable status.
+        peak_in_flight (int): Highest number of concurrent requests seen.
+        rate_limiter: Shared per-host `HostRateLimiter`, or None.
+    """
+
+    def __init__(self, config: dict, rate_limiter=None):
+        """
+        Args:
+            config: Download configuration (per_host_limit, connection_limit,
+                session_max_retries, backoff_factor, status_forcelist).
+            rate_limiter: Shared per-host rate limiter (also used by page fetching).
+        """
+        self.per_host_limit = max(config.get("per_host_limit", 16), 1)
+        self.connection_limit = config.get("connection_limit", 100)
+        self.max_retries = config.get("session_max_retries", 3)
+        self.backoff_factor = config.get("backoff_factor", 1)
+        self.status_forcelist = set(config.get("status_forcelist", []))
+        self.requests = 0
+        self.retries = 0
+        self.peak_in_flight = 0
+        self.rate_limiter = rate_limiter
+        self._in_flight = 0
+        # Only touched from the loop thread, so no lock is needed
+        self._host_slots = {}
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-image-engine", daemon=True)
+        self._thread.start()
+        self._session = self.run(self._open_session())
+
+    async def _open_session(self):
+        connector = aiohttp.TCPConnector(limit=self.connection_limit, limit_per_host=self.per_host_limit)
+        return aiohttp.ClientSession(connector=connector)
+
+    def run(self, coro):
+        """Run a coroutine on the engine loop and wait for its result (not from the loop thread)."""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("AsyncImageEngine.run called from its own event loop; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def submit(self, coro) -> Future:
+        """Schedule a coroutine on the engine loop without waiting for it."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    @asynccontextmanager
+    async def get(self, url: str, headers: dict = None, timeout: float = 15):
+        """
+        Open a GET response with per-host concurrency and non-blocking retries.
+
+        Connection errors, timeouts and statuses in `status_forcelist` are retried up to
+        `session_max_retries` times, sleeping `backoff_factor * 2 ** attempt` seconds in
+        between (the same schedule as urllib3's Retry). The host slot is held while the
+        caller reads the body and released when the context exits.
+
+        Args:
+            url: Request URL.
+            headers: Request headers.
+            timeout: Connect and per-read timeout in seconds.
+
+        Yields:
+            aiohttp.ClientResponse: The final response (its status is not checked).
+        """
+        host = urlsplit(url).netloc
+        slots = self._host_slots.get(host)
+        if slots is None:
+            slots = self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        client_timeout = aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout)
+
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(url)
+            async with slots:
+                self.requests += 1
+                self._in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+                try:
+                    start = self._loop.time()
+                    try:
+                        response = await self._session.get(url, headers=headers, timeout=client_timeout)
+                    except (aiohttp.ClientError, asyncio.TimeoutError):
+                        self._observe(url, None, start)
+                        if last_attempt:
+                            raise
+                        response = None
+                    else:
+                        self._observe(url, response, start)
+
+                    if response is not None and (last_attempt or response.status not in self.status_forcelist):
+                        try:
+                            yield response
+                        finally:
+                            response.release()
+                        return
+                    if response is not None:
+                        response.release()
+                finally:
+                    self._in_flight -= 1
+            # Back off outside the host slot, so other requests to the host can proceed
+            self.retries += 1
+            await asyncio.sleep(self.backoff_factor * 2 ** attempt)
+
+    def _observe(self, url: str, response, start: float):
+        """Report a request's outcome to the rate limiter."""
+        if self.rate_limiter is None:
+            return
+        if response is None:
+            self.rate_limiter.observe(url, None, self._loop.time() - start)
+        else:
+            self.rate_limiter.observe(url, response.status, self._loop.time() - start,
+                                      response.headers.get("Retry-After"))
+
+    async def _stream_body(self, response, tmp_dir, config: dict) -> tuple[img_pro.ImageBody | None, str]:
+        """Async counterpart of `img_pro.stream_image_body`; the spool's file work runs in the default executor."""
+        reason = img_pro.check_image_headers(response.headers, config)
+        if reason is not None:
+            return None, reason
+
+        spool = await asyncio.to_thread(img_pro.ImageSpool, tmp_dir, config)
+        try:
+            async for chunk in response.content.iter_chunked(spool.chunk_size):
+                reason = await asyncio.to_thread(spool.feed, chunk)
+                if reason is not None:
+                    await asyncio.to_thread(spool.abort)
+                    return None, reason
+        except BaseException:
+            spool.abort()
+            raise
+        return await asyncio.to_thread(spool.finish)
+
+    async def _read_image(self, img_url: str, response, cache, tmp_dir, config: dict) -> tuple:
+        """Validate a full (non-304) response and spool its body."""
+        if response.status != 200:
+            return False, img_url, "Network Response Failed (Retryable)", None
+
+        if any(key in str(response.url) for key in img_pro.PLACEHOLDER_KEYWORDS):
+            logger.info(f"{img_url} response URL identified as placeholder")
+            return False, img_url, "Placeholder Graphic", None
+
+        body, reason = await self._stream_body(response, tmp_dir, config)
+        if body is None:
+            return False, img_url, reason, None
+        if cache is not None:
+            await asyncio.to_thread(cache.store, img_url, response.headers, body)
+        return True, img_url, "OK", body
+
+    async def is_valid_image(self, img_url: str, context, config: dict) -> tuple:
+        """Async version of `img_pro.is_valid_image`; same checks and return value."""
+        img_url = img_pro.normalize_image_url(img_url)
+        reason = img_pro.check_image_url(img_url)
+        if reason is not None:
+            return False, img_url, reason, None
+
+        start = time.perf_counter()
+        result = await self._request_image(img_url, context, config)
+        img_pro.record_validation_metrics(context, result, time.perf_counter() - start)
+        return result
+
+    async def _request_image(self, img_url: str, context, config: dict) -> tuple:
+        """
+        HTTP request and content validation part of `is_valid_image`.
+
+        Cache lookups (SQLite) and file copies run in the default executor, so they never
+        hold up the other requests on the loop.
+        """
+        try:
+            cache = getattr(context, "http_cache", None)
+            tmp_dir = getattr(context, "images_dir", None)
+            conditional = await asyncio.to_thread(cache.conditional_headers, img_url) if cache is not None else {}
+            async with self.get(img_url, {**img_pro.IMAGE_REQUEST_HEADERS, **conditional}) as response:
+                if response.status != 304 or not conditional:
+                    return await self._read_image(img_url, response, cache, tmp_dir, config)
+            # Unchanged since the cached copy: reuse its body without a transfer
+            cached_path = await asyncio.to_thread(cache.not_modified_path, img_url)
+            if cached_path is not None:
+                return True, img_url, "OK", await asyncio.to_thread(img_pro.spool_file, cached_path, tmp_dir)
+            async with self.get(img_url, img_pro.IMAGE_REQUEST_HEADERS) as response:
+                return await self._read_image(img_url, response, cache, tmp_dir, config)
+        except aiohttp.ClientPayloadError as e:
+            return img_pro.log_truncated_body(img_url, e)
+        except Exception as e:
+            return img_pro.log_validation_exception(img_url, e, context)
+
+    async def validate_image_with_retry(self, img_url: str, img_path, title: str, price: str, author: str,
+                                        context, config: dict) -> tuple:
+        """Async version of `img_pro.validate_image_with_retry`."""
+        total_num_of_retry = config.get("total_num_of_retry")
+        result = await self.is_valid_image(img_url, context, IMAGE_VALIDATION_CONFIG)
+        num_of_retry = 0
+        while img_pro.retry_validation(result, num_of_retry, total_num_of_retry, img_path,
+                                       title, price, author, context):
+            num_of_retry += 1
+            result = await self.is_valid_image(img_url, context, IMAGE_VALIDATION_CONFIG)
+        return result
+
+    async def download_image(self, img_url: str, save_path, config: dict) -> tuple[bool, str, str]:
+        """Async version of `img_pro.download_image`."""
+        try:
+            async with self.get(img_url, timeout=5) as response:
+                if response.status != 200:
+                    return False, f"Network Response Failed (status {response.status})", "OK"
+                body, reason = await self._stream_body(response, Path(save_path).parent, IMAGE_VALIDATION_CONFIG)
+            if body is None:
+                return False, reason, "OK"
+            await asyncio.to_thread(os.replace, body.path, save_path)
+            return True, "OK", "OK"
+        except Exception as e:
+            return img_pro.log_download_exception(img_url, save_path, e)
+
+    async def process_image(self, img_url: str, title: str, price: str, author: str, page: int, idx: int,
+                            context) -> tuple[str, str]:
+        """
+        Async version of `img_pro.process_image`.
+
+        Filename sanitizing, store lookups and saving touch the disk (and jieba), so they
+        run in the default executor to keep the loop free for network I/O.
+        """
+        img_path, result = await asyncio.to_thread(img_pro.prepare_image, img_url, title, page, idx, context)
+        if result is not None:
+            return result
+
+        validation = await self.validate_image_with_retry(
+            img_url, img_path, title, price, author, context, IMAGE_VALIDATION_CONFIG
+        )
+        return await asyncio.to_thread(
+            img_pro.finish_image, validation, img_path, title, price, author, page, idx, context
+        )
+
+    async def final_download_for_fail_img(self, context, config: dict):
+        """
+        Async version of `img_pro.final_download_for_fail_img`; eligible entries run concurrently.
+
+        Results are recorded in the default executor (patched rows go to the sink and the
+        checkpoint), one at a time, since the retry queue itself is not thread-safe.
+        """
+        retry_queue = img_pro.FailedImageRetryQueue(context, config)
+        if not len(retry_queue):
+            return
+        logger.info(f"Starting second attempt for {len(retry_queue)} failed images")
+
+        async def attempt(item):
+            start = time.perf_counter()
+            result = await self.download_image(item.img_url, item.img_path, IMAGE_DOWNLOAD_CONFIG)
+            return item, result, time.perf_counter() - start
+
+        running = set()
+        while len(retry_queue) or running:
+            item = retry_queue.pop_ready()
+            while item is not None:
+                running.add(asyncio.ensure_future(attempt(item)))
+                item = retry_queue.pop_ready()
+
+            timeout = retry_queue.next_wait()
+            if not running:
+                await asyncio.sleep(timeout)
+                continue
+            done, running = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                await asyncio.to_thread(retry_queue.record, *task.result())
+
+    def stats(self) -> dict:
+        """Return request counters."""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "peak_in_flight": self.peak_in_flight,
+            "hosts": len(self._host_slots)
+        }
+
+    def close(self):
+        """Close the aiohttp session and stop the event loop."""
+        if not self._loop.is_running():
+            return
+        try:
+            self.run(self._session.close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+
+def get_async_engine(config: dict, rate_limiter=None) -> AsyncImageEngine | None:
+    """
+    Start an asyncio engine for one run if the configuration asks for it.
+
+    Args:
+        config: Download configuration, e.g. IMAGE_DOWNLOAD_CONFIG.
+        rate_limiter: Shared per-host rate limiter, or None.
+
+    Returns:
+        AsyncImageEngine | None: New engine, or None for the thread-pool engine
+        (configured, or aiohttp not installed).
+    """
+    if config.get("engine") != "asyncio":
+        return None
+    if aiohttp is None:
+        logger.warning("aiohttp is not installed, image downloads fall back to the thread-pool engine.")
+        return None
+    return AsyncImageEngine(config, rate_limiter)
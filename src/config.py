@@ -6,8 +6,20 @@ This module contains the base configuration for the crawler project, including:
 - Search keyword and target website
 - Network request and retry configuration (used in image processing module)
 - Product page parsing parameters
+- Browserless (HTTP) search page fetching
+- Selenium Chrome driver profile
+- Multi-keyword batch crawling
+- Multi-process sharded crawling
+- Persistent job queue for crawl nodes
+- Scraped data output format
 - File name sanitization rules
-- Image validation and download settings
+- Lazy jieba dictionary loading and caching
+- Image validation and download settings (thread-pool or asyncio engine)
+- Content-addressed image store
+- Conditional HTTP revalidation cache
+- Per-host adaptive rate limit
+- Run metrics export (JSON summary, Prometheus textfile)
+- Single-run profiling (--profile)
 
 All configurations are global constants and can be imported in other project modules.
 
@@ -16,8 +28,20 @@ All configurations are global constants and can be imported in other project mod
 - 搜索关键词与目标网站
 - 网络请求和重试配置（用于图片处理模块）
 - 解析产品页面的参数配置
+- 无浏览器（HTTP）搜索结果页抓取配置
+- Selenium Chrome 驱动配置
+- 多关键词批量抓取配置
+- 多进程分片抓取配置
+- 抓取节点共享的持久化任务队列
+- 抓取数据输出格式
 - 文件名清理规则
-- 图片验证和下载相关配置
+- jieba 词典延迟加载与缓存
+- 图片验证和下载相关配置（线程池或 asyncio 引擎）
+- 按内容寻址的图片存储
+- HTTP 协商缓存
+- 按主机自适应限速
+- 运行指标导出（JSON 汇总、Prometheus 文本文件）
+- 单次运行性能分析（--profile）
 
 所有配置均为全局常量，可在项目各模块中导入使用。
 """
@@ -34,9 +58,72 @@ TARGET_SITE: str = "https://www.dangdang.com/"  # The target website URL
 # Session and retry mechanism can prevent occasional network errors
 
 # Product page parsing configuration
-PARSE_PRODUCT_CONFIG: dict[str, int] = {
+PARSE_PRODUCT_CONFIG: dict[str, int | str] = {
     "total_pages": 3,  # Total number of pages to scrape
-    "wait_time": 10    # Explicit wait time in seconds
+    "wait_time": 10,   # Explicit wait time in seconds
+    # "page_source": read the page HTML once and parse it in-process with lxml
+    # "webdriver": query every field through WebDriver (one round trip per field)
+    "extract_mode": "page_source"
+}
+
+# Browserless search page fetching (Selenium is used as fallback)
+HTTP_FETCH_CONFIG: dict[str, int | str | list[int]] = {
+    "fetch_mode": "http",        # "http": request result pages directly; "selenium": drive Chrome
+    "search_url": "https://search.dangdang.com/",  # Search endpoint for result pages
+    "keyword_encoding": "gbk",   # Encoding of the keyword in the query string (DangDang search URLs are GBK)
+    "page_workers": 4,           # Result pages fetched in parallel
+    "timeout": 10,               # Request timeout in seconds
+    "session_max_retries": 3,    # Session retries for result pages
+    "pool_connections": 2,       # Number of per-host connection pools to cache
+    "pool_maxsize": 4,           # Max keep-alive connections kept per host
+    "backoff_factor": 1,         # Backoff factor between session retries
+    "status_forcelist": [500, 502, 503, 504]  # HTTP status codes retried by the session
+}
+
+# Selenium Chrome driver profile (used by the Selenium path / fallback)
+DRIVER_CONFIG: dict[str, bool | str | list[str] | None] = {
+    "profile": "default",        # "default": maximized window, full page loads; "fast": opt in to the settings below
+    "headless": True,            # Run Chrome without a window
+    "page_load_strategy": "eager",  # Return once the DOM is ready instead of waiting for all resources
+    "block_resources": True,     # Block images, CSS and fonts (only DOM text and attributes are read)
+    "blocked_url_patterns": [    # URL patterns blocked through CDP when block_resources is enabled
+        "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg",
+        "*.css", "*.woff", "*.woff2", "*.ttf", "*.otf"
+    ],
+    "user_data_dir": None        # Reusable Chrome profile directory (None: fresh temporary profile)
+}
+
+# Multi-keyword batch crawling
+BATCH_CONFIG: dict[str, int] = {
+    "max_workers": 4,            # Keywords crawled at the same time (global concurrency cap)
+    "max_drivers": 2             # Max Chrome instances alive in the shared driver pool
+}
+
+# Multi-process sharded crawling (main.py --processes)
+SHARD_CONFIG: dict[str, int | str | None] = {
+    "processes": 4,              # Worker processes, each crawling one shard at a time
+    "pages_per_shard": 5,        # Result pages per work unit (keyword, page range)
+    "start_method": "spawn",     # "spawn", "forkserver" or "fork" (fork inherits a prewarmed jieba dictionary)
+    "merge_name": "merged"       # Directory of the merged output under output/ and dev_logs/
+}
+
+# Persistent job queue shared by crawl nodes (main.py --queue)
+QUEUE_CONFIG: dict[str, int | float | str] = {
+    "backend": "sqlite",         # Queue backend registered in job_queue.QUEUE_BACKENDS
+    "path": "output/queue/jobs.sqlite3",        # Queue database (relative to the project root), shared by all nodes
+    "store_path": "output/queue/jobs.sqlite3",  # Result rows database; may be the queue file itself
+    "name": "queue",             # Directory of node outputs and the export under output/ and dev_logs/
+    "visibility_timeout": 120,   # Seconds a leased job stays hidden before another node may take it
+    "max_attempts": 5,           # Leases per job before it is given up (written to the failure summary)
+    "retry_delay": 5.0,          # Seconds before the first retry of a failed job; doubles per attempt
+    "node_threads": 8,           # Jobs worked on at the same time by one node
+    "poll_interval": 1.0         # Seconds an idle node waits while other nodes still hold leases
+}
+
+# Scraped data output
+OUTPUT_CONFIG: dict[str, str | bool] = {
+    "format": "csv",             # Streaming row output: "csv", "jsonl" or "parquet" (needs pyarrow)
+    "export_excel": True         # Also export the per-page Excel workbook at the end of the run
 }
 
 # File name sanitization rules
@@ -46,18 +133,94 @@ SANITIZE_RULES: dict[str, int | str] = {
     "max_length": 20,            # Maximum length of file name
     "max_words_cn": 3,           # Max number of words for Chinese titles
     "max_words_en": 5,           # Max number of words for English titles
+    "cjk_fast_path_width": 20,   # CJK titles up to this display width (CJK = 2) are kept whole, no jieba
+    "cache_size": 4096,          # Sanitized titles memoized per process (LRU)
+}
+
+# Chinese word segmentation (jieba), loaded only when a long CJK title has to be shortened
+JIEBA_CONFIG: dict[str, bool | str | None] = {
+    "dictionary": None,          # Custom (e.g. smaller) dictionary file; None uses jieba's default
+    "cache_file": "output/jieba/jieba.cache",  # Prefix dict cache (relative to the project root); None: system temp dir
+    "prewarm": False             # Load the dictionary at startup (before worker processes start)
+}
+
+# Content-addressed image store shared across runs
+IMAGE_STORE_CONFIG: dict[str, bool | str] = {
+    "enabled": True,             # Store each cover once by SHA-256 and skip URLs seen in earlier runs
+    "store_dir": "output/image_store",  # Store directory (relative to the project root)
+    "link_mode": "hardlink",     # Per-run file -> stored blob: "hardlink", "symlink" or "copy"
+    "skip_known_urls": True      # True: no request for indexed URLs; False: revalidate them (HTTP cache)
+}
+
+# Conditional HTTP revalidation cache for cover images
+HTTP_CACHE_CONFIG: dict[str, bool | str | int] = {
+    # Send If-None-Match / If-Modified-Since for cached covers. Only useful with the image store's
+    # skip_known_urls off (known URLs are otherwise never requested); bodies then stay in the store
+    "enabled": False,
+    "cache_dir": "output/http_cache",  # Cache directory (relative to the project root)
+    "max_bytes": 512 * 1024 * 1024,    # Max total size of bodies copied by the cache (without the image store)
+    "max_age_days": 30           # Entries older than this are evicted (0: no age limit)
+}
+
+# Per-host adaptive rate limit shared by result page and image requests (AIMD token buckets)
+RATE_LIMIT_CONFIG: dict[str, bool | float | list[int]] = {
+    "enabled": True,             # Pace requests per host
+    "initial_rate": 10.0,        # Requests per second a host starts with
+    "min_rate": 0.5,             # Lower bound of a host's rate
+    "max_rate": 100.0,           # Upper bound of a host's rate
+    "burst": 10,                 # Requests that may be sent back to back (bucket capacity)
+    "increase_step": 1.0,        # Additive increase: req/s gained per second of successful traffic
+    "decrease_factor": 0.5,      # Multiplicative decrease on 429 / 5xx / errors / slow responses
+    "latency_threshold": 3.0,    # Responses slower than this (seconds) count as congestion (0: ignore)
+    "cooldown": 1.0,             # Min seconds between two decreases of the same host
+    "throttle_statuses": [429, 500, 502, 503, 504]  # Statuses treated as "slow down"
+}
+
+# Run metrics (stage timings, counters) exported at the end of every run
+METRICS_CONFIG: dict[str, bool | str | list[float] | None] = {
+    "summary_json": True,        # Write metrics_summary.json next to the run's dev logs
+    "prometheus_textfile_dir": None,  # Directory read by node_exporter's textfile collector (None: off)
+    "buckets": [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]  # Latency histogram bounds (s)
+}
+
+# Profiling of a single run (main.py --profile)
+PROFILE_CONFIG: dict[str, bool | float | int | str] = {
+    # Default for a bare --profile: "sample" (all threads: image workers, asyncio loop, jieba loading)
+    # or "cprofile" (deterministic, but only the main thread)
+    "mode": "sample",
+    "sample_interval": 0.005,    # Seconds between stack samples in "sample" mode
+    "top_n": 30,                 # Entries in the text reports
+    "tracemalloc": True,         # Allocation snapshots at page boundaries (slows the run down)
+    "tracemalloc_frames": 1,     # Frames stored per allocation
+    "output_dir": "dev_logs/profiles"  # Report directory (relative to the project root)
 }
 
 # Image validation configuration
 IMAGE_VALIDATION_CONFIG: dict[str, int] = {
-    "max_retries": 3,            # Max retry times if validation fails
+    "max_retries": 3,            # Max retry times if validation fails (session retries use IMAGE_DOWNLOAD_CONFIG)
     "min_image_file_size": 1024, # Minimum image file size in bytes
+    "max_image_file_size": 10 * 1024 * 1024,  # Abort downloads larger than this (bytes, 0 = no cap)
+    "chunk_size": 64 * 1024,     # Bytes read per chunk while streaming an image to disk
+    "check_magic_bytes": True,   # Reject bodies whose first bytes are not a known image format
     "total_num_of_retry": 3      # Total retry attempts
     # Placeholder for image keyword filtering can be added later
 }
 
 # Image download configuration
-IMAGE_DOWNLOAD_CONFIG: dict[str, int] = {
+IMAGE_DOWNLOAD_CONFIG: dict[str, int | str | list[int]] = {
     "session_max_retries": 3,    # Max retry times if download fails
-    "total_num_of_retry": 3      # Total retry attempts
+    "total_num_of_retry": 3,     # Total retry attempts
+    # Shared HTTP session used for all image traffic
+    "pool_connections": 10,      # Number of per-host connection pools to cache
+    "pool_maxsize": 10,          # Max keep-alive connections kept per host
+    "backoff_factor": 1,         # Backoff factor between session retries
+    "status_forcelist": [500, 502, 503, 504],  # HTTP status codes retried by the session
+    # Concurrent image stage (runs alongside page parsing)
+    "max_workers": 8,            # Image worker threads; 0 processes images inline
+    "max_in_flight": 32,         # Max queued + running image jobs before parsing waits
+    # asyncio engine (requires aiohttp; falls back to the worker threads above without it)
+    "engine": "asyncio",         # "asyncio" or "threads"
+    "per_host_limit": 16,        # Max concurrent requests to one host
+    "connection_limit": 100,     # Max open connections across all hosts
+    "async_max_in_flight": 1000  # Max queued + running image coroutines before parsing waits
 }
@@ -7,19 +7,32 @@ during the scraping process. It centralizes all file paths, logging paths, and f
 so that different modules can access and update shared runtime data consistently.
 
 A helper function `create_context` is provided to initialize the Context object with proper
-paths obtained from the storage module.
+paths obtained from the storage module. Passing a keyword gives the run its own output and
+log directories, so several keywords can be crawled concurrently.
 
 模块说明：
 该模块定义了 Context 数据类，用于在爬取过程中存储路径和运行时状态信息。
 它集中管理所有文件路径、日志路径及失败列表，使不同模块能够一致地访问和更新共享运行数据。
 
 提供了辅助函数 `create_context` 来使用 storage_module 提供的路径初始化 Context 对象。
+传入关键词时，每个关键词使用独立的输出和日志目录，便于并发抓取多个关键词。
 """
 
-from dataclasses import dataclass
-from typing import List
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import storage_module as sto_m
+import image_process as img_pro
+import image_store as img_store
+import http_cache as http_c
+import async_image as async_img
+import rate_limiter as rate_lim
+import metrics as met
+from config import (HTTP_CACHE_CONFIG, IMAGE_DOWNLOAD_CONFIG, IMAGE_STORE_CONFIG, METRICS_CONFIG, OUTPUT_CONFIG,
+                    RATE_LIMIT_CONFIG)
+from logger import add_file_handler, add_thread_file_handler
+from records import BookRecord, ImageFailure
 
 
 @dataclass
@@ -35,9 +48,22 @@ class Context:
         parsing_error_log_path: Path to log parsing errors.
         img_validation_failures_log_path: Path to log images that failed validation multiple times.
         download_img_failures_log_path: Path to log images that failed downloading multiple times.
-        img_validation_fail_list: List of items failed during image validation.
-        first_download_fail_list: List of items that failed during the first download attempt.
-        second_download_fail_list: List of items that failed during the second download attempt.
+        metrics_summary_path: Path of the JSON run summary written from `metrics`.
+        img_validation_fail_list: `ImageFailure`s of images that failed validation.
+        first_download_fail_list: `ImageFailure`s of images that failed the first download attempt.
+        second_download_fail_list: `ImageFailure`s of images that failed the second download attempt.
+        image_client: Shared pooled HTTP client used for all image requests of this run.
+        run_log_handler: Thread-scoped run log handler for batch runs (None for single runs).
+        checkpoint: Progress checkpoint used to resume an interrupted crawl.
+        sink: Streaming writer that receives each page's rows as soon as the page is finished.
+        export_excel: Whether to export the Excel workbook from the streamed rows at the end.
+        image_store: Content-addressed image store shared across runs (None if disabled).
+        http_cache: Conditional revalidation cache for cover requests (None if disabled).
+        async_engine: asyncio image engine of this run (None for the thread-pool engine).
+        rate_limiter: Per-host rate limiter shared by page and image requests (None if disabled).
+        result_index: `BookRecord`s whose cover failed to save, keyed by (page, idx), for the second-pass retry.
+        metrics: Counters and stage timings of this run.
+        run_name: Per-keyword (or per-shard) directory name of a batch run (None for single runs).
     """
     images_dir: Path
     excel_path: Path
@@ -47,26 +73,56 @@ class Context:
     parsing_error_log_path: Path
     img_validation_failures_log_path: Path
     download_img_failures_log_path: Path
-    img_validation_fail_list: List
-    first_download_fail_list: List
-    second_download_fail_list: List
+    metrics_summary_path: Path
+    img_validation_fail_list: List[ImageFailure]
+    first_download_fail_list: List[ImageFailure]
+    second_download_fail_list: List[ImageFailure]
+    image_client: Optional[img_pro.ImageHttpClient] = None
+    run_log_handler: Optional[logging.Handler] = None
+    checkpoint: Optional[sto_m.CrawlCheckpoint] = None
+    sink: Optional[sto_m.RowSink] = None
+    export_excel: bool = True
+    image_store: Optional[img_store.ImageStore] = None
+    http_cache: Optional[http_c.HttpImageCache] = None
+    async_engine: Optional[async_img.AsyncImageEngine] = None
+    rate_limiter: Optional[rate_lim.HostRateLimiter] = None
+    result_index: Dict[Tuple[int, int], BookRecord] = field(default_factory=dict)
+    metrics: met.MetricsRegistry = field(default_factory=met.MetricsRegistry)
+    run_name: Optional[str] = None
 
 
-def create_context() -> Context:
+def create_context(keyword: str = None, resume: bool = False, run_name: str = None, row_output: bool = True,
+                   process_log: bool = False) -> Context:
     """
     Factory function to initialize and return a Context object with proper paths.
 
+    Args:
+        keyword: Optional keyword of a batch run; its outputs and logs go into a
+            per-keyword directory and its run log only records the calling thread.
+        resume: Continue from the checkpoint of an earlier, interrupted run.
+        run_name: Directory name of the run, overriding the one derived from `keyword`
+            (shard runs of one keyword use one directory per page range).
+        row_output: Open the checkpoint and the row sink; queue nodes write their rows to the
+            shared result store instead and leave both None.
+        process_log: Record every thread of the process in the run log, not only the calling
+            thread (crawl nodes run their jobs on worker threads, one node per process).
+
     Returns:
-        Context: Initialized context object with paths and empty failure lists.
+        Context: Initialized context object with paths, empty failure lists and a shared image client.
     """
+    if run_name is None and keyword:
+        run_name = sto_m.run_dir_name(keyword)
     (
         images_dir, excel_path, logger_path,
         img_not_valid_retry_log_path,
         img_not_valid_unhandled_exception_log_path,
         parsing_error_log_path,
         img_validation_failures_log_path,
-        download_img_failures_log_path
-    ) = sto_m.create_file()
+        download_img_failures_log_path,
+        metrics_summary_path
+    ) = sto_m.create_file(run_name)
+    rate_limiter = rate_lim.get_rate_limiter(RATE_LIMIT_CONFIG)
+    image_store = img_store.get_image_store(IMAGE_STORE_CONFIG)
 
     return Context(
         images_dir=images_dir,
@@ -77,7 +133,23 @@ def create_context() -> Context:
         parsing_error_log_path=parsing_error_log_path,
         img_validation_failures_log_path=img_validation_failures_log_path,
         download_img_failures_log_path=download_img_failures_log_path,
+        metrics_summary_path=metrics_summary_path,
         img_validation_fail_list=[],
         first_download_fail_list=[],
-        second_download_fail_list=[]
+        second_download_fail_list=[],
+        image_client=img_pro.ImageHttpClient(IMAGE_DOWNLOAD_CONFIG, rate_limiter),
+        run_log_handler=(
+            (add_file_handler if process_log else add_thread_file_handler)(logger_path) if run_name else None
+        ),
+        checkpoint=sto_m.CrawlCheckpoint(excel_path.parent / "checkpoint.jsonl", resume) if row_output else None,
+        sink=sto_m.create_sink(excel_path, OUTPUT_CONFIG.get("format", "csv")) if row_output else None,
+        export_excel=OUTPUT_CONFIG.get("export_excel", True),
+        image_store=image_store,
+        http_cache=http_c.get_http_cache(HTTP_CACHE_CONFIG, image_store),
+        async_engine=async_img.get_async_engine(IMAGE_DOWNLOAD_CONFIG, rate_limiter),
+        rate_limiter=rate_limiter,
+        metrics=met.MetricsRegistry(METRICS_CONFIG.get("buckets", met.DEFAULT_BUCKETS),
+                                    {"run": run_name or "default"}),
+        run_name=run_name
     )
+
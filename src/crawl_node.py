@@ -0,0 +1,360 @@
+"""
+crawl_node.py
+=============
+
+This module runs crawl nodes that pull work from the shared job queue (`job_queue`).
+
+- `enqueue_keywords` adds one "page" job per (keyword, result page).
+- A `CrawlNode` leases jobs with several threads: a page job fetches and parses one result
+  page over HTTP, writes its rows to the shared `ResultStore` and adds one "image" job per
+  cover; an image job validates and saves one cover and fills in the row's image columns.
+  Cover jobs are preferred, so rows are completed while pages are still queued.
+- Failed jobs go back to the queue with backoff; jobs of a crashed node are picked up again
+  once their lease expires. Nodes stop when the queue has no unfinished jobs left.
+- `export_results` writes the store as one dataset (with a Keyword column, one row per
+  keyword, page and index) and the jobs given up on as the failure summary.
+
+本模块运行从共享任务队列（`job_queue`）领取任务的抓取节点。
+
+- `enqueue_keywords` 为每个（关键词、结果页）添加一个 "page" 任务。
+- `CrawlNode` 用多个线程领取任务：page 任务通过 HTTP 获取并解析一页结果，将数据行写入共享的
+  `ResultStore`，并为每张封面添加一个 "image" 任务；image 任务校验并保存一张封面，补全该行的图片字段。
+  优先处理封面任务，页面仍在排队时数据行就能陆续补全。
+- 失败任务按退避策略放回队列；节点崩溃后，其任务在租约到期后会被重新领取。队列中没有未完成任务时节点退出。
+- `export_results` 将结果库导出为一个数据集（带 Keyword 列，每个关键词、页码和序号一行），并将放弃的任务写入失败汇总。
+"""
+
+# ===== Standard Library Modules =====
+import dataclasses
+import os
+import socket
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# ===== Third-Party Library Modules =====
+import pandas as pd
+
+# ===== Custom Project Modules =====
+import context as ctx_mod
+import image_process as img_pro
+import job_queue as jq
+import metrics as met
+import parse_module as parse_m
+import request_module as req_m
+import storage_module as sto_m
+from config import HTTP_FETCH_CONFIG, METRICS_CONFIG
+from logger import logger, flush_log_writers, log_to_json, remove_file_handler
+from product_selectors import SELECTORS
+from sqlite_util import connect_sqlite, project_path
+
+PAGE_JOB = "page"
+IMAGE_JOB = "image"
+# Lower runs first: covers before further pages
+JOB_PRIORITY = {IMAGE_JOB: 0, PAGE_JOB: 1}
+
+
+class ResultStore:
+    """
+    Scraped rows shared by all nodes, in a SQLite file keyed by (keyword, page, idx).
+
+    Writing a row again (a page job retried after its lease expired) updates it in place, and
+    keeps cover columns that an image job already filled in.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS books (
+            keyword TEXT NOT NULL,
+            page INTEGER NOT NULL,
+            idx INTEGER NOT NULL,
+            title TEXT,
+            price TEXT,
+            author TEXT,
+            img_url TEXT,
+            cover_img_filename TEXT,
+            cover_img_path TEXT,
+            node TEXT,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (keyword, page, idx)
+        );
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Database file (may be the queue's own SQLite file).
+        """
+        self.path = project_path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._conn().executescript(self.SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect_sqlite(self.path)
+        return conn
+
+    def upsert_rows(self, keyword: str, page: int, rows: list[tuple], node: str):
+        """Write (idx, title, price, author, img_url) rows of one page."""
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO books (keyword, page, idx, title, price, author, img_url, node, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (keyword, page, idx) DO UPDATE SET "
+                "title = excluded.title, price = excluded.price, author = excluded.author, "
+                "img_url = excluded.img_url, node = excluded.node, updated_at = excluded.updated_at",
+                [(keyword, page, idx, title, price, author, img_url, node, now)
+                 for idx, title, price, author, img_url in rows]
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def set_cover(self, keyword: str, page: int, idx: int, filename: str, path: str, node: str):
+        """Fill in the image columns of one row."""
+        self._conn().execute(
+            "UPDATE books SET cover_img_filename = ?, cover_img_path = ?, node = ?, updated_at = ? "
+            "WHERE keyword = ? AND page = ? AND idx = ?",
+            (filename, path, node, time.time(), keyword, page, idx)
+        )
+
+    def frame(self) -> pd.DataFrame:
+        """All rows in the combined dataset layout (Keyword column plus the sink columns)."""
+        rows = self._conn().execute(
+            "SELECT keyword, page, idx, title, price, author, cover_img_filename, cover_img_path "
+            "FROM books ORDER BY keyword, page, idx"
+        ).fetchall()
+        return pd.DataFrame(rows, columns=["Keyword", *sto_m.SINK_COLUMNS])
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def enqueue_keywords(queue: jq.JobQueue, keywords: list[str], total_pages: int) -> int:
+    """
+    Add a page job for every keyword and result page.
+
+    Jobs are keyed by keyword and page, so enqueueing the same keywords again adds nothing.
+
+    Returns:
+        int: Jobs added.
+    """
+    jobs = [
+        ({"keyword": keyword, "page": page}, f"{PAGE_JOB}:{keyword}:{page}")
+        for keyword in dict.fromkeys(keywords)
+        for page in range(1, total_pages + 1)
+    ]
+    added = queue.put_many(PAGE_JOB, jobs, JOB_PRIORITY[PAGE_JOB])
+    logger.info(f"Enqueued {added} page jobs ({len(jobs) - added} already queued)")
+    return added
+
+
+class CrawlNode:
+    """
+    One node working through the queue with `node_threads` threads.
+
+    Covers are saved under the node's own output directory
+    (`output/<name>/nodes/<node_id>/images/<keyword>/`); rows go to the shared store. Each
+    image job gets its own failure lists, since failed covers are retried through the queue;
+    a cover's validation failures are logged once the queue gives up on it. The node's run
+    log records all of its threads.
+
+    Attributes:
+        node_id (str): Lease owner name, `<host>_<pid>` by default.
+        counts (Counter): Jobs finished per kind and outcome.
+    """
+
+    def __init__(self, queue: jq.JobQueue, store: ResultStore, config: dict, node_id: str = None):
+        """
+        Args:
+            queue: Shared job queue.
+            store: Shared result store.
+            config: Queue configuration, e.g. QUEUE_CONFIG.
+            node_id: Lease owner name.
+        """
+        self.queue = queue
+        self.store = store
+        self.node_id = node_id or f"{socket.gethostname()}_{os.getpid()}"
+        self.threads = max(config.get("node_threads", 1), 1)
+        self.poll_interval = config.get("poll_interval", 1.0)
+        self.context = ctx_mod.create_context(
+            run_name=f"{config.get('name', 'queue')}/nodes/{self.node_id}", row_output=False, process_log=True
+        )
+        self.page_client = img_pro.ImageHttpClient(HTTP_FETCH_CONFIG, self.context.rate_limiter)
+        self.counts = Counter()
+        self._keyword_contexts = {}
+        self._lock = threading.Lock()
+
+    def run(self) -> dict:
+        """Work until the queue has no unfinished jobs; returns the job counts."""
+        logger.info(f"Crawl node {self.node_id} started with {self.threads} threads")
+        try:
+            with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="crawl-node") as pool:
+                for future in [pool.submit(self._work) for _ in range(self.threads)]:
+                    future.result()
+        finally:
+            self.close()
+        logger.info(f"Crawl node {self.node_id} finished: {dict(self.counts)}")
+        return dict(self.counts)
+
+    def _work(self):
+        while True:
+            job = self.queue.lease([IMAGE_JOB, PAGE_JOB], self.node_id)
+            if job is None:
+                # Leases held elsewhere may still expire and come back, so only stop once nothing is pending
+                if self.queue.pending() == 0:
+                    return
+                time.sleep(self.poll_interval)
+                continue
+            try:
+                if job.kind == PAGE_JOB:
+                    self._page_job(job)
+                else:
+                    self._image_job(job)
+            except Exception as e:
+                error = f"{type(e).__name__} - {e}"
+                logger.error(f"Job {job.id} ({job.kind}) failed: {error}")
+                self._finish(job, self.queue.fail(job, error))
+
+    def _finish(self, job: jq.Job, outcome: str | None):
+        with self._lock:
+            self.counts[f"{job.kind}_{outcome or 'lease_lost'}"] += 1
+
+    def _page_job(self, job: jq.Job):
+        keyword, page = job.payload["keyword"], job.payload["page"]
+        metrics = self.context.metrics
+        url = req_m.build_search_url(keyword, page, HTTP_FETCH_CONFIG)
+        with metrics.timer("page_wait_seconds", mode="http"):
+            page_html = req_m.fetch_search_page(url, self.page_client, HTTP_FETCH_CONFIG)
+        if page_html is None:
+            self._finish(job, self.queue.fail(job, f"Search page request failed: {url}"))
+            return
+        metrics.inc("page_bytes_total", len(page_html))
+
+        rows = []
+        images = []
+        for idx, item in enumerate(parse_m.html_product_items(page_html, SELECTORS), start=1):
+            try:
+                title, price, author, img_url = parse_m.extract_fields_html(item, SELECTORS)
+            except Exception as e:
+                metrics.inc("item_errors_total")
+                logger.error(f"Failed to parse book {idx} on page {page} of '{keyword}': {type(e).__name__} - {e}")
+                continue
+            metrics.inc("items_parsed_total")
+            rows.append((idx, title, price, author, img_url))
+            images.append((
+                {"keyword": keyword, "page": page, "idx": idx, "img_url": img_url,
+                 "title": title, "price": price, "author": author},
+                f"{IMAGE_JOB}:{keyword}:{page}:{idx}"
+            ))
+        if not rows:
+            logger.info(f"No products on page {page} of '{keyword}'")
+
+        self.store.upsert_rows(keyword, page, rows, self.node_id)
+        self.queue.put_many(IMAGE_JOB, images, JOB_PRIORITY[IMAGE_JOB])
+        self._finish(job, "done" if self.queue.ack(job) else None)
+
+    def _image_job(self, job: jq.Job):
+        p = job.payload
+        # Fresh failure lists per job: retries go through the queue, not the single-run lists
+        context = dataclasses.replace(
+            self._keyword_context(p["keyword"]),
+            img_validation_fail_list=[], first_download_fail_list=[], second_download_fail_list=[]
+        )
+        filename, path = img_pro.process_image(
+            p["img_url"], p["title"], p["price"], p["author"], p["page"], p["idx"], context
+        )
+        if path == "No Image" and (filename == "Download Failed" or img_pro.is_retryable(filename)):
+            outcome = self.queue.fail(job, filename)
+            if outcome == "dead":
+                self.store.set_cover(p["keyword"], p["page"], p["idx"], filename, path, self.node_id)
+                # Logged once, when the queue gives up on the cover
+                for item in context.img_validation_fail_list:
+                    log_to_json(item.to_dict(), context.img_validation_failures_log_path)
+            self._finish(job, outcome)
+            return
+        self.store.set_cover(p["keyword"], p["page"], p["idx"], filename, str(path), self.node_id)
+        self._finish(job, "done" if self.queue.ack(job) else None)
+
+    def _keyword_context(self, keyword: str):
+        """The node's Context with a per-keyword images directory (file names only carry page and index)."""
+        with self._lock:
+            context = self._keyword_contexts.get(keyword)
+            if context is None:
+                images_dir = self.context.images_dir / sto_m.run_dir_name(keyword)
+                images_dir.mkdir(parents=True, exist_ok=True)
+                context = self._keyword_contexts[keyword] = dataclasses.replace(self.context, images_dir=images_dir)
+            return context
+
+    def close(self):
+        """Release the node's clients and write its metrics and logs."""
+        context = self.context
+        self.page_client.close()
+        context.image_client.close()
+        if context.async_engine is not None:
+            context.async_engine.close()
+        if context.http_cache is not None:
+            context.http_cache.save()
+        if context.rate_limiter is not None:
+            context.rate_limiter.record_metrics(context.metrics)
+        met.export_run_metrics(context.metrics, context.metrics_summary_path, context.run_name, METRICS_CONFIG)
+        flush_log_writers()
+        if context.run_log_handler is not None:
+            remove_file_handler(context.run_log_handler)
+
+
+def run_node(config: dict) -> dict:
+    """Open the queue and store from the configuration and run one node until the queue is drained."""
+    queue = jq.create_queue(config)
+    store = ResultStore(config.get("store_path", config.get("path")))
+    try:
+        return CrawlNode(queue, store, config).run()
+    finally:
+        store.close()
+        queue.close()
+
+
+def export_results(queue: jq.JobQueue, store: ResultStore, config: dict, output_config: dict) -> dict:
+    """
+    Write the shared store as one dataset and the dead jobs as its failure summary.
+
+    Rows are unique per (keyword, page, idx) in the store, so nothing is deduplicated here; rows
+    with the same title, author and price are distinct listings (editions, sellers) and are all kept.
+
+    Args:
+        queue: Job queue (for the dead jobs).
+        store: Result store.
+        config: Queue configuration (its `name` is the output directory).
+        output_config: Output configuration (format, export_excel), e.g. OUTPUT_CONFIG.
+
+    Returns:
+        dict: Row and failure counts plus the queue state.
+    """
+    pending = queue.pending()
+    if pending:
+        logger.warning(f"{pending} jobs are still queued or leased, the export is incomplete.")
+    df = store.frame()
+    failures = [
+        {"Keyword": job["payload"].get("keyword"), "Stage": job["kind"], "Page": job["payload"].get("page"),
+         "Index": job["payload"].get("idx"), "Img_URL": job["payload"].get("img_url"),
+         "Attempts": job["attempts"], "Error": job["last_error"]}
+        for job in queue.dead_jobs()
+    ]
+    output_dir, dev_log_dir = sto_m.run_dirs(config.get("name", "queue"))
+    data_path, failure_path = sto_m.write_dataset(df, failures, output_dir, dev_log_dir, output_config)
+    summary = {
+        "rows": len(df),
+        "failures": len(failures),
+        "pending": pending,
+        "jobs": queue.stats(),
+    }
+    logger.info(f"Queue results exported: {len(df)} rows, {len(failures)} failed jobs -> {data_path}, {failure_path}")
+    return summary
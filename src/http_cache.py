@@ -0,0 +1,293 @@
+"""
+http_cache.py
+=============
+
+This module provides an on-disk HTTP revalidation cache for cover images.
+
+- Entries are keyed by the normalized image URL and keep the ETag / Last-Modified validators
+  together with the body's SHA-256. With the content-addressed image store, the body is the
+  store's blob and the cache holds validators only; without it, the cache keeps its own copy.
+- Requests for cached URLs send If-None-Match / If-Modified-Since; a 304 response reuses the
+  cached body, so the image is not transferred again.
+- The cache is bounded by the size of its own copies (least recently used entries go first)
+  and by entry age.
+- The index is a SQLite table written through on every store, so shard processes sharing the cache
+  directory never overwrite each other's entries.
+- Hit / miss / eviction counters are kept for the end-of-run summary.
+
+本模块为封面图提供磁盘 HTTP 协商缓存。
+
+- 以规范化后的图片 URL 为键，保存 ETag / Last-Modified 校验信息及图片内容的 SHA-256。启用按内容寻址的图片存储时，
+  图片内容即存储中的文件，缓存只保存校验信息；未启用时，缓存自行保存一份图片。
+- 对已缓存的 URL 发送 If-None-Match / If-Modified-Since；服务器返回 304 时直接复用缓存内容，不再重新传输。
+- 按自行保存的图片总大小（优先淘汰最久未使用的条目）和条目存活时间进行淘汰。
+- 索引为 SQLite 表，每次缓存即时写入，多个分片进程共享缓存目录时不会互相覆盖条目。
+- 记录命中 / 未命中 / 淘汰统计，用于运行结束时汇总。
+"""
+
+# ===== Standard Library Modules =====
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# ===== Custom Project Modules =====
+from logger import logger
+from sqlite_util import connect_sqlite
+
+
+class HttpImageCache:
+    """
+    Conditional-request cache of image bodies keyed by normalized URL.
+
+    The index is a SQLite table (WAL mode) that every entry is written through to, so shard
+    processes sharing the cache directory add to one index instead of overwriting each other's.
+
+    Attributes:
+        cache_dir (Path): Directory holding the index and the cache's own bodies.
+        max_bytes (int): Maximum total size of the cache's own bodies.
+        max_age (float): Maximum entry age in seconds (0 disables age eviction).
+        image_store (ImageStore | None): Store whose blobs serve as bodies; None keeps copies.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        url TEXT PRIMARY KEY,
+        etag TEXT,
+        last_modified TEXT,
+        sha256 TEXT NOT NULL,
+        stored_in TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        stored_at REAL NOT NULL,
+        last_used REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+    """
+
+    def __init__(self, cache_dir, max_bytes: int, max_age_days: float, image_store=None):
+        """
+        Args:
+            cache_dir: Cache directory.
+            max_bytes: Maximum total size of the cache's own bodies in bytes.
+            max_age_days: Entries older than this are evicted (0 keeps them forever).
+            image_store: Content-addressed image store holding the bodies (no copy is kept).
+        """
+        self.cache_dir = Path(cache_dir)
+        self.image_store = image_store
+        self.body_dir = self.cache_dir / "bodies"
+        self.body_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / "index.sqlite3"
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.not_modified = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections = []
+        self._conn().executescript(self.SCHEMA)
+        logger.info(f"HTTP cache opened: {self.stats()['entries']} entries in {self.index_path}")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect_sqlite(self.index_path)
+            conn.row_factory = sqlite3.Row
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _entry(self, url: str) -> sqlite3.Row | None:
+        """Index row of a URL, or None if it is not cached or has expired."""
+        entry = self._conn().execute("SELECT * FROM entries WHERE url = ?", (url,)).fetchone()
+        if entry is None or self._expired(entry):
+            return None
+        return entry
+
+    def _body_path(self, url: str) -> Path:
+        """Path of the cache's own copy of a body."""
+        return self.body_dir / hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _entry_body(self, url: str, entry) -> Path:
+        """Body of an entry: the store blob for store-backed entries, the own copy otherwise."""
+        if entry["stored_in"] == "image_store" and self.image_store is not None:
+            return self.image_store.blob_path(entry["sha256"])
+        return self._body_path(url)
+
+    def conditional_headers(self, url: str) -> dict:
+        """
+        Return If-None-Match / If-Modified-Since headers for a cached URL.
+
+        Args:
+            url: Normalized image URL.
+
+        Returns:
+            dict: Conditional request headers (empty if the URL is not cached, expired or its body is gone).
+        """
+        entry = self._entry(url)
+        if entry is None or not self._entry_body(url, entry).exists():
+            return {}
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def not_modified_path(self, url: str) -> Path | None:
+        """
+        Return the cached body file after a 304 response and count the hit.
+
+        Args:
+            url: Normalized image URL.
+
+        Returns:
+            Path | None: Cached body file, or None if it is no longer available.
+        """
+        conn = self._conn()
+        entry = conn.execute("SELECT * FROM entries WHERE url = ?", (url,)).fetchone()
+        if entry is None:
+            return None
+        body_path = self._entry_body(url, entry)
+        try:
+            size = body_path.stat().st_size
+        except OSError:
+            return None
+        conn.execute("UPDATE entries SET last_used = ? WHERE url = ?", (time.time(), url))
+        with self._lock:
+            self.not_modified += 1
+            self.bytes_saved += size
+        return body_path
+
+    def store(self, url: str, response_headers, body):
+        """
+        Cache a full 200 response if it carries a validator.
+
+        With an image store only the validators and the body's hash are recorded (the body
+        is saved into the store by `save_image_body`); otherwise the body is copied.
+
+        Args:
+            url: Normalized image URL.
+            response_headers: Response headers (case-insensitive mapping).
+            body (ImageBody): Validated image body (copied, not moved).
+        """
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        with self._lock:
+            self.misses += 1
+        if not etag and not last_modified:
+            return
+
+        if self.image_store is not None:
+            stored_in, size = "image_store", 0
+        else:
+            cache_path = self._body_path(url)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            shutil.copyfile(body.path, tmp_path)
+            os.replace(tmp_path, cache_path)
+            stored_in, size = "cache", body.size
+        now = time.time()
+        self._conn().execute(
+            "INSERT OR REPLACE INTO entries (url, etag, last_modified, sha256, stored_in, size, stored_at, last_used)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, etag, last_modified, body.sha256, stored_in, size, now, now)
+        )
+        with self._lock:
+            self.stored += 1
+
+    def _expired(self, entry) -> bool:
+        return self.max_age > 0 and time.time() - entry["stored_at"] > self.max_age
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until the own copies fit in max_bytes."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            victims = []
+            if self.max_age > 0:
+                victims = conn.execute(
+                    "SELECT url, stored_in FROM entries WHERE stored_at < ?", (time.time() - self.max_age,)
+                ).fetchall()
+            expired = {entry["url"] for entry in victims}
+            total = 0
+            remaining = []
+            for entry in conn.execute("SELECT url, stored_in, size FROM entries ORDER BY last_used"):
+                if entry["url"] not in expired:
+                    remaining.append(entry)
+                    total += entry["size"]
+            for entry in remaining:
+                if total <= self.max_bytes:
+                    break
+                victims.append(entry)
+                total -= entry["size"]
+            conn.executemany("DELETE FROM entries WHERE url = ?", [(entry["url"],) for entry in victims])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        for entry in victims:
+            # Store blobs belong to the image store and may back other URLs
+            if entry["stored_in"] != "image_store":
+                self._body_path(entry["url"]).unlink(missing_ok=True)
+        with self._lock:
+            self.evicted += len(victims)
+
+    def save(self):
+        """Evict at the end of a run; entries are already written through to the index."""
+        self.evict()
+
+    def stats(self) -> dict:
+        """Return revalidation counters and the cache size."""
+        entries, cached_bytes = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        with self._lock:
+            return {
+                "not_modified": self.not_modified,
+                "misses": self.misses,
+                "stored": self.stored,
+                "evicted": self.evicted,
+                "bytes_saved": self.bytes_saved,
+                "entries": entries,
+                "cached_bytes": cached_bytes
+            }
+
+    def close(self):
+        """Close the index connections of all threads."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+# Caches are shared by every run of the process that uses the same directory
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_http_cache(config: dict, image_store=None) -> HttpImageCache | None:
+    """
+    Return the shared HTTP cache for a configuration, creating it on first use.
+
+    Args:
+        config: Cache configuration, e.g. HTTP_CACHE_CONFIG.
+        image_store: Content-addressed image store whose blobs back the cached bodies, if enabled.
+
+    Returns:
+        HttpImageCache | None: Shared cache, or None if the cache is disabled.
+    """
+    if not config.get("enabled"):
+        return None
+    cache_dir = Path(config.get("cache_dir"))
+    if not cache_dir.is_absolute():
+        cache_dir = Path(__file__).resolve().parent.parent / cache_dir
+    with _caches_lock:
+        if cache_dir not in _caches:
+            _caches[cache_dir] = HttpImageCache(
+                cache_dir, config.get("max_bytes", 0), config.get("max_age_days", 0), image_store
+            )
+        return _caches[cache_dir]
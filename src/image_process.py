@@ -9,9 +9,10 @@ sanitize filenames for saving, and maintain logging of failures.
 Key functionalities:
 - Validate images with URL checks and content checks
 - Retry logic for network failures or incomplete images
-- Filename sanitization for both Chinese and English titles
+- Filename sanitization for both Chinese and English titles (jieba is loaded only for long CJK titles)
 - Logging of validation and download failures for debugging and analysis
 - Handling placeholder images to avoid saving non-informative graphics
+- Streaming downloads to temporary files with early type / size / magic-byte rejection
 
 模块说明：
 该模块提供了爬取目标网站商品图片的处理工具，包括图片验证、下载重试、
@@ -20,15 +21,24 @@ Key functionalities:
 主要功能：
 - 对图片 URL 及内容进行有效性验证
 - 针对网络失败或加载不全图片的重试逻辑
-- 中文和英文标题的文件名清理
+- 中文和英文标题的文件名清理（仅在需要截断较长中文标题时才加载 jieba）
 - 记录验证及下载失败日志，方便调试和分析
 - 处理占位图，避免保存无效图片
+- 流式下载到临时文件，提前按类型 / 大小 / 文件头拒绝无效图片
 """
 
 # ===== Standard Libraries =====
+import functools
+import hashlib
+import heapq
+import itertools
+import tempfile
+import threading
+import time
 import traceback
-
-import jieba
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
 
 # ===== Third-Party Libraries =====
 import requests
@@ -39,6 +49,8 @@ from config import *
 
 # ===== Project Custom Modules =====
 from logger import *
+from metrics import metrics_for, reason_label
+from records import BookRecord, ImageFailure
 
 # Keywords for placeholder images
 PLACEHOLDER_KEYWORDS = [
@@ -55,81 +67,485 @@ PLACEHOLDER_KEYWORDS = [
     "cover_default"
 ]
 
+# Headers sent with every cover image request
+IMAGE_REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0',
+    'Referer': 'https://www.dangdang.com'
+}
+
+# Leading bytes of accepted image formats (WebP is checked separately: RIFF....WEBP)
+IMAGE_MAGIC_BYTES = (
+    b"\xff\xd8\xff",          # JPEG
+    b"\x89PNG\r\n\x1a\n",      # PNG
+    b"GIF87a", b"GIF89a",     # GIF
+    b"BM",                    # BMP
+)
+# Leading bytes needed to check every signature (RIFF + 4-byte size + WEBP)
+MAGIC_PREFIX_SIZE = 12
+
+
+@dataclass
+class ImageBody:
+    """Validated image body spooled to a temporary file.
+
+    Attributes:
+        path (Path): Temporary file holding the body (moved or deleted once saved).
+        size (int): Body size in bytes.
+        sha256 (str): SHA-256 hex digest of the body.
+    """
+    path: Path
+    size: int
+    sha256: str
+
+    def discard(self):
+        """Delete the temporary file."""
+        self.path.unlink(missing_ok=True)
+
+
+def has_image_magic(head: bytes) -> bool:
+    """Check the first bytes of a body against known image signatures."""
+    return head.startswith(IMAGE_MAGIC_BYTES) or (head[:4] == b"RIFF" and head[8:12] == b"WEBP")
+
+
+def check_image_headers(headers, config: dict) -> str | None:
+    """Reject a response from its headers alone, before any of the body is read.
+
+    Args:
+        headers: Response headers (case-insensitive mapping).
+        config (dict): Validation configuration (min/max image size).
+
+    Returns:
+        str | None: Rejection reason, or None if the body is worth reading.
+    """
+    content_type = headers.get('Content-Type', '')
+    if not content_type.startswith("image/"):
+        return "Not Image Link"
+
+    content_length = headers.get("Content-Length", "")
+    if content_length.isdigit():
+        content_length = int(content_length)
+        max_size = config.get("max_image_file_size", 0)
+        if content_length == 0:
+            return "Empty Image"
+        if max_size and content_length > max_size:
+            return "Image Too Large"
+        if content_length < config.get("min_image_file_size"):
+            return "Incomplete Image (Retryable)"
+    return None
+
+
+class ImageSpool:
+    """Incremental writer that spools body chunks into a temporary file.
+
+    Each chunk is checked as it arrives (the running size against max_image_file_size),
+    hashed and written, so memory use stays at one chunk per download. The first
+    `MAGIC_PREFIX_SIZE` bytes are held back until they are all there and checked once
+    against the image signatures, since a stream may start with a shorter chunk. Shared
+    by the thread-pool and asyncio engines.
+    """
+
+    def __init__(self, tmp_dir, config: dict):
+        """
+        Args:
+            tmp_dir: Directory for the temporary file (same filesystem as the final path).
+            config (dict): Validation configuration (min/max image size, chunk size, magic check).
+        """
+        self.chunk_size = config.get("chunk_size", 64 * 1024)
+        self.min_size = config.get("min_image_file_size")
+        self.max_size = config.get("max_image_file_size", 0)
+        self.check_magic = config.get("check_magic_bytes", True)
+        self.size = 0
+        # Bytes held back until the magic check can run (None once it has)
+        self._head = b"" if self.check_magic else None
+        self._hasher = hashlib.sha256()
+        fd, tmp_name = tempfile.mkstemp(suffix=".part", dir=tmp_dir)
+        self.path = Path(tmp_name)
+        self._file = os.fdopen(fd, "wb")
+
+    def feed(self, chunk: bytes) -> str | None:
+        """Check and write one chunk; returns a rejection reason, or None to keep reading."""
+        if not chunk:
+            return None
+        self.size += len(chunk)
+        if self.max_size and self.size > self.max_size:
+            return "Image Too Large"
+        if self._head is not None:
+            self._head += chunk
+            if len(self._head) < MAGIC_PREFIX_SIZE:
+                return None
+            chunk, self._head = self._head, None
+            if not has_image_magic(chunk):
+                return "Not Image Content"
+        self._hasher.update(chunk)
+        self._file.write(chunk)
+        return None
+
+    def finish(self) -> tuple[ImageBody | None, str]:
+        """Check a body shorter than the magic prefix, close the file and apply the final size checks."""
+        if self._head:
+            head, self._head = self._head, None
+            if not has_image_magic(head):
+                self.abort()
+                return None, "Not Image Content"
+            self._hasher.update(head)
+            self._file.write(head)
+        self._file.close()
+        if self.size == 0:
+            reason = "Empty Image"
+        elif self.size < self.min_size:
+            reason = "Incomplete Image (Retryable)"
+        else:
+            return ImageBody(self.path, self.size, self._hasher.hexdigest()), "OK"
+        self.path.unlink(missing_ok=True)
+        return None, reason
+
+    def abort(self):
+        """Close and delete the temporary file."""
+        self._file.close()
+        self.path.unlink(missing_ok=True)
+
+
+def stream_image_body(response, tmp_dir, config: dict) -> tuple[ImageBody | None, str]:
+    """Stream a 200 response into a temporary file, rejecting bad bodies as early as possible.
+
+    Checks run in this order, each before any more of the body is read: Content-Type,
+    Content-Length (empty / too small / above max_image_file_size), the magic bytes of the
+    first 12 bytes, and the running size while chunks are written.
+
+    Args:
+        response: `requests.Response` opened with `stream=True`.
+        tmp_dir: Directory for the temporary file (same filesystem as the final path).
+        config (dict): Validation configuration (min/max image size, chunk size, magic check).
+
+    Returns:
+        tuple[ImageBody | None, str]: (body, reason); body is None unless reason is "OK".
+    """
+    reason = check_image_headers(response.headers, config)
+    if reason is not None:
+        return None, reason
+
+    spool = ImageSpool(tmp_dir, config)
+    try:
+        for chunk in response.iter_content(chunk_size=spool.chunk_size):
+            reason = spool.feed(chunk)
+            if reason is not None:
+                spool.abort()
+                return None, reason
+    except BaseException:
+        spool.abort()
+        raise
+    return spool.finish()
+
+
+def spool_file(src, tmp_dir) -> ImageBody:
+    """Copy a file (e.g. a cached body) into a temporary ImageBody, hashing it on the way."""
+    hasher = hashlib.sha256()
+    size = 0
+    fd, tmp_name = tempfile.mkstemp(suffix=".part", dir=tmp_dir)
+    try:
+        with open(src, "rb") as src_f, os.fdopen(fd, "wb") as f:
+            for chunk in iter(lambda: src_f.read(64 * 1024), b""):
+                hasher.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return ImageBody(Path(tmp_name), size, hasher.hexdigest())
+
+
+class ImageHttpClient:
+    """Shared, pooled HTTP session for all image traffic of a run.
+
+    One `requests.Session` with a single mounted `HTTPAdapter` is reused for every
+    validation and download, so connections to the same CDN host are kept alive
+    instead of paying a new TCP + TLS handshake for each cover. With a rate limiter,
+    every request waits for its host's token and reports its outcome back.
+
+    Attributes:
+        session: The underlying `requests.Session`.
+        adapter: The `HTTPAdapter` mounted for both http and https.
+        request_count (int): Number of requests sent through this client.
+        rate_limiter: Shared per-host `HostRateLimiter`, or None.
+    """
+
+    def __init__(self, config: dict, rate_limiter=None):
+        """Build the session, retry policy and connection pool from config.
+
+        Args:
+            config (dict): Download configuration, e.g. IMAGE_DOWNLOAD_CONFIG.
+            rate_limiter (HostRateLimiter, optional): Shared per-host rate limiter.
+        """
+        retries = Retry(
+            total=config.get("session_max_retries"),
+            backoff_factor=config.get("backoff_factor", 1),
+            status_forcelist=config.get("status_forcelist", [500, 502, 503, 504]),
+            allowed_methods=["GET"]
+        )
+        self.adapter = HTTPAdapter(
+            pool_connections=config.get("pool_connections", 10),
+            pool_maxsize=config.get("pool_maxsize", 10),
+            max_retries=retries
+        )
+        self.session = requests.Session()
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        self.request_count = 0
+        self.rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request through the shared session, paced by the rate limiter."""
+        with self._lock:
+            self.request_count += 1
+        if self.rate_limiter is None:
+            return self.session.get(url, **kwargs)
+
+        self.rate_limiter.acquire(url)
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, **kwargs)
+        except requests.RequestException:
+            self.rate_limiter.observe(url, None, time.perf_counter() - start)
+            raise
+        # Attempts retried inside urllib3 are reported too, so the limiter sees every throttle
+        retries = getattr(response.raw, "retries", None)
+        for attempt in getattr(retries, "history", ()):
+            self.rate_limiter.observe(url, attempt.status, 0.0)
+        self.rate_limiter.observe(url, response.status_code, response.elapsed.total_seconds(),
+                                  response.headers.get("Retry-After"))
+        return response
+
+    def stats(self) -> dict:
+        """Return connection usage statistics of the pool.
+
+        Returns:
+            dict: requests sent, connections opened, connections reused and the
+            reuse ratio (reused / requests).
+        """
+        pools = self.adapter.poolmanager.pools
+        connections_opened = 0
+        pool_requests = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections_opened += pool.num_connections
+            pool_requests += pool.num_requests
+        reused = max(pool_requests - connections_opened, 0)
+        return {
+            "requests": self.request_count,
+            "connections_opened": connections_opened,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / pool_requests, 3) if pool_requests else 0.0
+        }
+
+    def close(self):
+        """Close the session and all pooled connections."""
+        self.session.close()
+
+
+# Fallback client for callers that do not pass one explicitly
+_default_client = None
+
+
+def get_default_client() -> ImageHttpClient:
+    """Return the module-wide image client, creating it on first use."""
+    global _default_client
+    if _default_client is None:
+        _default_client = ImageHttpClient(IMAGE_DOWNLOAD_CONFIG)
+    return _default_client
+
+
+def normalize_image_url(img_url: str) -> str:
+    """Turn protocol-relative and site-relative image URLs into absolute ones.
+
+    Args:
+        img_url (str): Image URL as found in the page (may be None).
+
+    Returns:
+        str: Absolute URL, or an empty string if there is no URL.
+    """
+    if not img_url:
+        return ""
+    if img_url.startswith("//"):
+        return "http:" + img_url
+    if img_url.startswith("/"):
+        return "https://www.dangdang.com" + img_url
+    return img_url
+
+
+def check_image_url(img_url: str) -> str | None:
+    """Reject a normalized image URL before any request is made.
+
+    Returns:
+        str | None: Rejection reason, or None if the URL is worth requesting.
+    """
+    if not img_url or img_url.strip() in ["", "#"]:
+        return "Null or Incorrect Link"
+    if any(key in img_url for key in PLACEHOLDER_KEYWORDS):
+        logger.info(f"{img_url} identified as placeholder image")
+        return "Placeholder Graphic"
+    return None
+
 
-def is_valid_image(img_url: str, context, config: dict) -> tuple[bool, str, str]:
+def is_retryable(reason: str) -> bool:
+    """Whether a validation failure is transient and worth another attempt."""
+    return reason.endswith("(Retryable)")
+
+
+def log_truncated_body(img_url: str, error: Exception) -> tuple[bool, str, str, None]:
+    """Treat a body cut off mid-transfer (e.g. IncompleteRead) as a retryable validation failure."""
+    logger.info(f"{img_url} body truncated mid-transfer: {type(error).__name__}")
+    return False, img_url, "Incomplete Image (Retryable)", None
+
+
+def log_validation_exception(img_url: str, error: Exception, context) -> tuple[bool, str, str, None]:
+    """Log an unexpected validation error and return the matching invalid verdict."""
+    error_msg = traceback.format_exc()
+    exception_reason = f"Unhandled Exception: {type(error).__name__} - {str(error)}"
+    exception_type = exception_reason.split(" - ")[0].replace("Unhandled Exception: ", "")
+    logger.error(f"is_valid_image unknown error: {img_url}: {exception_reason}")
+    log_to_json({"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "url": img_url,
+                 "error": exception_reason, "exception_type": exception_type, "error_msg": error_msg},
+                context.img_not_valid_unhandled_exception_log_path)
+    return False, img_url, exception_reason, None
+
+
+def is_valid_image(img_url: str, context, config: dict) -> tuple[bool, str, str, ImageBody | None]:
     """Check if the image URL is valid and content meets requirements.
 
+    The response is streamed into a temporary file next to the images directory and
+    returned together with the verdict, so a valid image can be saved directly without
+    requesting the same URL a second time. When the context carries an asyncio engine,
+    the check runs there and this function only waits for the result.
+
     Args:
         img_url (str): The URL of the image to validate.
         context: Runtime context object for logging paths.
-        config (dict): Configuration for validation, e.g., max retries, min file size.
+        config (dict): Configuration for validation, e.g., max retries, min/max file size.
 
     Returns:
-        tuple[bool, str, str]: (is_valid, normalized_img_url, reason)
+        tuple[bool, str, str, ImageBody | None]: (is_valid, normalized_img_url, reason, body);
+        body is None unless the image is valid.
     """
+    engine = getattr(context, "async_engine", None)
+    if engine is not None:
+        return engine.run(engine.is_valid_image(img_url, context, config))
+
     # Normalize URL
-    if img_url.startswith("//"):
-        img_url = "http:" + img_url
-    elif img_url.startswith("/"):
-        img_url = "https://www.dangdang.com" + img_url
+    img_url = normalize_image_url(img_url)
 
     # Basic URL validation
-    if not img_url or img_url.strip() in ["", "#"]:
-        return False, img_url, "Null or Incorrect Link"
-    if any(key in img_url for key in PLACEHOLDER_KEYWORDS):
-        logger.info(f"{img_url} identified as placeholder image")
-        return False, img_url, "Placeholder Graphic"
+    reason = check_image_url(img_url)
+    if reason is not None:
+        return False, img_url, reason, None
+
+    start = time.perf_counter()
+    result = _request_image(img_url, context, config)
+    record_validation_metrics(context, result, time.perf_counter() - start)
+    return result
 
-    # HTTP request and content validation
-    headers = {
-        'User-Agent': 'Mozilla/5.0',
-        'Referer': 'https://www.dangdang.com'
-    }
 
+def record_validation_metrics(context, result: tuple, elapsed: float):
+    """Record the latency and received bytes of one validation request."""
+    metrics = metrics_for(context)
+    metrics.observe("image_validate_seconds", elapsed, result="valid" if result[0] else "invalid")
+    if result[3] is not None:
+        metrics.inc("image_bytes_total", result[3].size)
+
+
+def _request_image(img_url: str, context, config: dict) -> tuple[bool, str, str, ImageBody | None]:
+    """HTTP request and content validation part of `is_valid_image`."""
     try:
-        session = requests.Session()
-        retries = Retry(
-            total=config.get("max_retries"),
-            backoff_factor=1,
-            status_forcelist=[500, 502, 503, 504],
-            allowed_methods=["GET"]
-        )
-        adapter = HTTPAdapter(max_retries=retries)
-        session.mount('http://', adapter)
-        session.mount('https://', adapter)
-        response = session.get(img_url, headers=headers, timeout=15)
+        client = getattr(context, "image_client", None) or get_default_client()
+        cache = getattr(context, "http_cache", None)
+        tmp_dir = getattr(context, "images_dir", None)
+        conditional = cache.conditional_headers(img_url) if cache is not None else {}
+        response = client.get(img_url, headers={**IMAGE_REQUEST_HEADERS, **conditional}, timeout=15, stream=True)
+
+        if response.status_code == 304 and conditional:
+            response.close()
+            # Unchanged since the cached copy: reuse its body without a transfer
+            cached_path = cache.not_modified_path(img_url)
+            if cached_path is not None:
+                return True, img_url, "OK", spool_file(cached_path, tmp_dir)
+            response = client.get(img_url, headers=IMAGE_REQUEST_HEADERS, timeout=15, stream=True)
 
-        if response.status_code == 200:
-            content_type = response.headers.get('Content-Type', '')
-            if not content_type.startswith("image/"):
-                return False, img_url, "Not Image Link"
+        with response:
+            if response.status_code != 200:
+                return False, img_url, "Network Response Failed (Retryable)", None
 
             if any(key in response.url for key in PLACEHOLDER_KEYWORDS):
                 logger.info(f"{img_url} response URL identified as placeholder")
-                return False, img_url, "Placeholder Graphic"
+                return False, img_url, "Placeholder Graphic", None
 
-            if len(response.content) == 0:
-                return False, img_url, "Empty Image"
-            elif 0 < len(response.content) < config.get("min_image_file_size"):
-                return False, img_url, "Incomplete Image (Retryable)"
-            else:
-                return True, img_url, "OK"
-        else:
-            return False, img_url, "Network Response Failed (Retryable)"
+            body, reason = stream_image_body(response, tmp_dir, config)
+            if body is None:
+                return False, img_url, reason, None
+            if cache is not None:
+                cache.store(img_url, response.headers, body)
+            return True, img_url, "OK", body
+    except requests.exceptions.ChunkedEncodingError as e:
+        return log_truncated_body(img_url, e)
     except Exception as e:
-        error_msg = traceback.format_exc()
-        exception_reason = f"Unhandled Exception: {type(e).__name__} - {str(e)}"
-        exception_type = exception_reason.split(" - ")[0].replace("Unhandled Exception: ", "")
-        logger.error(f"is_valid_image unknown error: {img_url}: {exception_reason}")
-        log_to_json({"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "url": img_url,
-                     "error": exception_reason, "exception_type": exception_type, "error_msg": error_msg},
-                    context.img_not_valid_unhandled_exception_log_path)
-        return False, img_url, exception_reason
+        return log_validation_exception(img_url, e, context)
+
+
+def retry_validation(result: tuple, num_of_retry: int, total_num_of_retry: int, img_path,
+                     title: str, price: str, author: str, context) -> bool:
+    """Log one validation attempt and decide whether another attempt is worthwhile.
+
+    Shared by the thread-pool and asyncio versions of `validate_image_with_retry`.
 
+    Args:
+        result (tuple): Verdict of the attempt, as returned by `is_valid_image`.
+        num_of_retry (int): Retries made so far (0 after the first attempt).
+        total_num_of_retry (int): Maximum number of retries.
+        img_path: Local path where image will be saved.
+        title (str): Product title.
+        price (str): Product price.
+        author (str): Product author.
+        context: Runtime context for logging.
 
-def validate_image_with_retry(img_url: str, img_path, title: str, price: str, author: str, context, config: dict) -> tuple[bool, str, str]:
+    Returns:
+        bool: True if the image should be validated again.
+    """
+    is_valid, new_img_url, not_valid_reason, _ = result
+    if is_valid:
+        return False
+    metrics = metrics_for(context)
+    if not is_retryable(not_valid_reason):
+        metrics.inc("image_failures_total", stage="validate", reason=reason_label(not_valid_reason))
+        if num_of_retry == 0:
+            logger.info(f"{img_path}: {new_img_url} is placeholder or invalid")
+        else:
+            logger.info(f"{img_path}: {new_img_url} identified as invalid")
+        return False
+
+    if num_of_retry > 0:
+        logger.info(f"{img_path}: {new_img_url} retry {num_of_retry} still invalid due to {not_valid_reason}")
+        log_to_json({"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                     "url": new_img_url, "retry_count": num_of_retry,
+                     "reason": not_valid_reason}, context.img_not_valid_retry_log_path)
+        if num_of_retry == total_num_of_retry:
+            context.img_validation_fail_list.append(
+                ImageFailure(title, price, author, new_img_url, not_valid_reason, num_of_retry)
+            )
+    if num_of_retry >= total_num_of_retry:
+        metrics.inc("image_failures_total", stage="validate", reason=reason_label(not_valid_reason))
+        return False
+    metrics.inc("image_retries_total", stage="validate", reason=reason_label(not_valid_reason))
+    logger.info(f"Retry {num_of_retry + 1}: Image URL not valid due to {not_valid_reason}")
+    return True
+
+
+def validate_image_with_retry(img_url: str, img_path, title: str, price: str, author: str, context, config: dict) -> tuple[bool, str, str, ImageBody | None]:
     """Validate image with multiple retries if needed.
 
+    Only failures marked "(Retryable)" are attempted again. When the context carries an
+    asyncio engine, all attempts run there and this function only waits for the result.
+
     Args:
         img_url (str): URL of the image.
         img_path: Local path where image will be saved.
@@ -140,39 +556,75 @@ def validate_image_with_retry(img_url: str, img_path, title: str, price: str, au
         config (dict): Validation configuration.
 
     Returns:
-        tuple[bool, str, str]: (is_valid, normalized_img_url, reason)
+        tuple[bool, str, str, ImageBody | None]: (is_valid, normalized_img_url, reason, body)
     """
+    engine = getattr(context, "async_engine", None)
+    if engine is not None:
+        return engine.run(engine.validate_image_with_retry(img_url, img_path, title, price, author, context, config))
+
     total_num_of_retry = config.get("total_num_of_retry")
-    is_valid, new_img_url, not_valid_reason = is_valid_image(img_url, context, IMAGE_VALIDATION_CONFIG)
+    result = is_valid_image(img_url, context, IMAGE_VALIDATION_CONFIG)
+    num_of_retry = 0
+    while retry_validation(result, num_of_retry, total_num_of_retry, img_path, title, price, author, context):
+        num_of_retry += 1
+        result = is_valid_image(img_url, context, IMAGE_VALIDATION_CONFIG)
+    return result
+
+
+# Characters Windows and POSIX file systems reject in file names
+RESERVED_FILENAME_CHARS = re.compile(r'[\/:*?"<>|]')
+CJK_CHARS = re.compile(r'[\u4e00-\u9fff]')
+
+
+# jieba is imported on first use: most titles never need segmentation, and loading its prefix
+# dictionary costs about a second and tens of MB in every process that touches it
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+
+
+def get_tokenizer(config: dict = JIEBA_CONFIG):
+    """
+    Return the shared jieba tokenizer, importing jieba and loading its dictionary on first use.
+
+    With `cache_file` set the prefix dictionary is built once and written to that file; every
+    later process (reruns, worker processes) loads the marshal cache instead of rebuilding it.
+
+    Args:
+        config (dict): Segmentation configuration, e.g. JIEBA_CONFIG.
+
+    Returns:
+        jieba.Tokenizer: Initialized tokenizer.
+    """
+    global _tokenizer
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                import jieba
+
+                tokenizer = jieba.Tokenizer(config.get("dictionary") or jieba.DEFAULT_DICT)
+                cache_file = config.get("cache_file")
+                if cache_file:
+                    cache_file = Path(cache_file)
+                    if not cache_file.is_absolute():
+                        cache_file = Path(__file__).resolve().parent.parent / cache_file
+                    cache_file.parent.mkdir(parents=True, exist_ok=True)
+                    tokenizer.cache_file = str(cache_file)
+                start = time.perf_counter()
+                tokenizer.initialize()
+                logger.info(f"jieba dictionary loaded in {time.perf_counter() - start:.2f}s "
+                            f"(cache: {tokenizer.cache_file or 'jieba default'})")
+                _tokenizer = tokenizer
+    return _tokenizer
 
-    if not is_valid:
-        if not_valid_reason not in ["Network Response Failed", "Incomplete Image"]:
-            logger.info(f"{img_path}: {new_img_url} is placeholder or invalid")
-        else:
-            for num_of_retry in range(1, total_num_of_retry + 1):
-                logger.info(f"Retry {num_of_retry}: Image URL not valid due to {not_valid_reason}")
-                is_valid, new_img_url, not_valid_reason = is_valid_image(img_url, context, IMAGE_VALIDATION_CONFIG)
-                if is_valid:
-                    break
-                else:
-                    if not_valid_reason not in ["Network Response Failed", "Incomplete Image"]:
-                        logger.info(f"{img_path}: {new_img_url} identified as invalid")
-                        break
-                    else:
-                        logger.info(f"{img_path}: {new_img_url} retry {num_of_retry} still invalid due to {not_valid_reason}")
-                        log_to_json({"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                                     "url": new_img_url, "retry_count": num_of_retry,
-                                     "reason": not_valid_reason}, context.img_not_valid_retry_log_path)
-                        if num_of_retry == total_num_of_retry:
-                            context.img_validation_fail_list.append({
-                                "Title": title,
-                                "Price": price,
-                                "Author": author,
-                                "Img_URL": new_img_url,
-                                "Fail_Reason": not_valid_reason,
-                                "Retry_Count": num_of_retry
-                            })
-    return is_valid, new_img_url, not_valid_reason
+
+def warm_tokenizer(config: dict = JIEBA_CONFIG):
+    """
+    Load the jieba dictionary now instead of on the first long CJK title.
+
+    Call it before starting worker processes: the dictionary cache file is then built once,
+    and forked workers inherit the loaded tokenizer.
+    """
+    return get_tokenizer(config)
 
 
 def truncate_chinese(title: str, max_words: int = 3, max_length: int = 20) -> str:
@@ -186,8 +638,8 @@ def truncate_chinese(title: str, max_words: int = 3, max_length: int = 20) -> st
     Returns:
         str: Truncated title.
     """
-    clean_title = re.sub(r'[\/:*?"<>|]', '', title)
-    words = list(jieba.cut(clean_title))
+    clean_title = RESERVED_FILENAME_CHARS.sub('', title)
+    words = list(get_tokenizer().cut(clean_title))
     truncated = ''.join(words[:max_words])
     if len(truncated) > max_length:
         truncated = truncated[:max_length] + '...'
@@ -205,7 +657,7 @@ def truncate_english(title: str, max_words: int = 5, max_length: int = 20) -> st
     Returns:
         str: Truncated title.
     """
-    clean_title = re.sub(r'[\/:*?"<>|]', '', title)
+    clean_title = RESERVED_FILENAME_CHARS.sub('', title)
     words = clean_title.split()
     truncated = ' '.join(words[:max_words])
     if len(truncated) > max_length:
@@ -216,6 +668,60 @@ def truncate_english(title: str, max_words: int = 5, max_length: int = 20) -> st
     return truncated
 
 
+def display_width(text: str) -> int:
+    """Display width of a string: CJK characters count as 2, everything else as 1."""
+    return len(text) + len(CJK_CHARS.findall(text))
+
+
+class FilenameSanitizer:
+    """Filename sanitizer built once from a rules dict.
+
+    Patterns are compiled in `__init__` and results are memoized per title in an LRU
+    cache, so repeated titles (reruns, retries, batch keywords) cost a dict lookup.
+    CJK titles keep their CJK characters; jieba segmentation only runs when the title is
+    wider than `cjk_fast_path_width`, shorter titles are kept whole.
+    """
+
+    def __init__(self, rules: dict):
+        """
+        Args:
+            rules (dict): Sanitization rules, e.g. SANITIZE_RULES.
+        """
+        self.rules = dict(rules)
+        allowed_chars = re.escape(rules.get("allowed_chars", ""))
+        self._unsafe_en = re.compile(f"[^0-9a-zA-Z{allowed_chars}]")
+        self._unsafe_cjk = re.compile(f"[^0-9a-zA-Z\u4e00-\u9fff{allowed_chars}]")
+        self.max_length = rules.get("max_length")
+        self.max_words_cn = rules.get("max_words_cn")
+        self.max_words_en = rules.get("max_words_en")
+        self.replace_space = rules.get("replace_space", "_")
+        self.cjk_fast_path_width = rules.get("cjk_fast_path_width", self.max_length)
+        self.sanitize = functools.lru_cache(maxsize=rules.get("cache_size", 4096))(self._sanitize)
+
+    def _sanitize(self, title: str) -> str:
+        if CJK_CHARS.search(title):
+            clean_title = self._unsafe_cjk.sub("", title)
+            if display_width(clean_title) <= self.cjk_fast_path_width:
+                return clean_title
+            return truncate_chinese(clean_title, max_words=self.max_words_cn, max_length=self.max_length)
+
+        title = self._unsafe_en.sub("_", title)
+        title = truncate_english(title, max_words=self.max_words_en, max_length=self.max_length)
+        return title.replace(" ", self.replace_space)
+
+
+_sanitizers = {}
+
+
+def get_sanitizer(rules: dict) -> FilenameSanitizer:
+    """Return the sanitizer for a rules dict, building it on first use."""
+    key = tuple(sorted(rules.items()))
+    sanitizer = _sanitizers.get(key)
+    if sanitizer is None:
+        sanitizer = _sanitizers.setdefault(key, FilenameSanitizer(rules))
+    return sanitizer
+
+
 def sanitize_filename(title: str, rules: dict) -> str:
     """Sanitize the title to be used as a valid filename.
 
@@ -226,15 +732,7 @@ def sanitize_filename(title: str, rules: dict) -> str:
     Returns:
         str: Sanitized filename.
     """
-    allowed_chars = rules.get("allowed_chars", "")
-    title = re.sub(f"[^0-9a-zA-Z{re.escape(allowed_chars)}]", "_", title)
-
-    if re.search(r'[\u4e00-\u9fff]', title):
-        return truncate_chinese(title, max_words=rules.get("max_words_cn"), max_length=rules.get("max_length"))
-    else:
-        title = truncate_english(title, max_words=rules.get("max_words_en"), max_length=rules.get("max_length"))
-        title = title.replace(" ", rules.get("replace_space", "_"))
-        return title
+    return get_sanitizer(rules).sanitize(title)
 
 
 def fail_download_image_add_logging(target_list: list, img_url: str, img_path, title: str, price: str, author: str,
@@ -243,7 +741,7 @@ def fail_download_image_add_logging(target_list: list, img_url: str, img_path, t
     """Log failed image download details into a list.
 
     Args:
-        target_list (list): List to append failure info.
+        target_list (list): List of `ImageFailure` records to append to.
         img_url (str): Image URL.
         img_path: Local image path.
         title (str): Product title.
@@ -256,131 +754,496 @@ def fail_download_image_add_logging(target_list: list, img_url: str, img_path, t
         retry_num (int): Retry count.
         retry_flag (bool): Whether retry succeeded.
     """
-    target_list.append({
-        "Title": title,
-        "Price": price,
-        "Author": author,
-        "Page": page,
-        "Index": idx,
-        "Img_URL": img_url,
-        "Img_Path": str(img_path),
-        "Fail_Reason": fail_reason,
-        "Error_MSG": error_msg,
-        "Retry_Count": retry_num,
-        "Retry_Success": retry_flag
-    })
-
-
-def download_image(img_url: str, save_path, config: dict) -> tuple[bool, str, str]:
+    target_list.append(ImageFailure(
+        title, price, author, img_url, fail_reason, retry_num,
+        page=page, idx=idx, img_path=str(img_path), error_msg=error_msg, retry_success=retry_flag
+    ))
+
+
+def save_image_body(body: ImageBody, save_path, img_url: str = None, store=None) -> tuple[bool, str, str]:
+    """Move an already validated image body into place.
+
+    The temporary file is renamed onto `save_path`, so a partially written image never
+    appears under its final name. With an image store, the body is kept once by content
+    hash and `save_path` is linked to the stored copy.
+
+    Args:
+        body (ImageBody): Body returned by `is_valid_image`; consumed by this call.
+        save_path: Local path to save the image.
+        img_url (str, optional): Normalized URL, indexed in the store.
+        store (ImageStore, optional): Content-addressed image store.
+
+    Returns:
+        tuple[bool, str, str]: (success_flag, reason, error_message)
+    """
+    try:
+        if store is not None:
+            store.link(store.put_file(img_url, body.path, body.sha256, body.size), save_path)
+        else:
+            os.replace(body.path, save_path)
+        return True, "OK", "OK"
+    except Exception as e:
+        body.discard()
+        error_msg = traceback.format_exc()
+        exception_reason = f"Error saving: {type(e).__name__} - {str(e)}"
+        logger.error(f"Saving: {save_path}: {exception_reason}")
+        return False, exception_reason, error_msg
+
+
+def download_image(img_url: str, save_path, config: dict, client: ImageHttpClient = None,
+                   engine=None) -> tuple[bool, str, str]:
     """Download an image from a URL with session retries and return status.
 
+    The body is streamed to a temporary file with the same early checks as
+    `is_valid_image` (Content-Type, Content-Length, magic bytes, size cap) and renamed
+    onto `save_path` only once it is complete.
+
     Args:
         img_url (str): URL of the image to download.
         save_path: Local path to save the downloaded image.
         config (dict): Download configuration including session_max_retries.
+        client (ImageHttpClient, optional): Shared client; defaults to the module-wide one.
+        engine (AsyncImageEngine, optional): Run the download on this asyncio engine instead.
 
     Returns:
         tuple[bool, str, str]: (success_flag, reason, error_message)
     """
+    if engine is not None:
+        return engine.run(engine.download_image(img_url, save_path, config))
     try:
-        # Configure session and retries
-        session = requests.Session()
-        retries = Retry(
-            total=config.get("session_max_retries"),
-            backoff_factor=1,
-            status_forcelist=[500, 502, 503, 504],
-            allowed_methods=["GET"]
-        )
-        adapter = HTTPAdapter(max_retries=retries)
-        session.mount('http://', adapter)
-        session.mount('https://', adapter)
-
-        response = session.get(img_url, timeout=5)
-        with open(save_path, "wb") as f:
-            f.write(response.content)
+        if client is None:
+            client = get_default_client()
+        with client.get(img_url, timeout=5, stream=True) as response:
+            if response.status_code != 200:
+                return False, f"Network Response Failed (status {response.status_code})", "OK"
+            body, reason = stream_image_body(response, Path(save_path).parent, IMAGE_VALIDATION_CONFIG)
+        if body is None:
+            return False, reason, "OK"
+        os.replace(body.path, save_path)
         return True, "OK", "OK"
     except Exception as e:
-        error_msg = traceback.format_exc()
-        exception_reason = f"Error downloading: {type(e).__name__} - {str(e)}"
-        logger.error(f"Downloading: {save_path}, {img_url}: {exception_reason}")
-        return False, exception_reason, error_msg
+        return log_download_exception(img_url, save_path, e)
 
 
-def process_image(img_url: str, title: str, price: str, author: str, page: int, idx: int, context) -> tuple[str, str]:
-    """Process a single image: validate, sanitize filename, and download.
+def log_download_exception(img_url: str, save_path, error: Exception) -> tuple[bool, str, str]:
+    """Log an unexpected download error and return the matching failure status."""
+    error_msg = traceback.format_exc()
+    exception_reason = f"Error downloading: {type(error).__name__} - {str(error)}"
+    logger.error(f"Downloading: {save_path}, {img_url}: {exception_reason}")
+    return False, exception_reason, error_msg
+
+
+def prepare_image(img_url: str, title: str, page: int, idx: int, context) -> tuple[Path, tuple[str, str] | None]:
+    """Build the cover's file path and serve it without a request when possible.
+
+    A cover is served locally when a resumed run already saved it, or when the
+    content-addressed store knows its URL.
 
     Args:
         img_url (str): URL of the image to process.
         title (str): Product title.
-        price (str): Product price.
-        author (str): Product author.
         page (int): Page number.
         idx (int): Image index on the page.
         context: Runtime context containing directories and log paths.
 
     Returns:
-        tuple[str, str]: (image filename or status, image path or status)
+        tuple[Path, tuple[str, str] | None]: (image path, final result or None if it must be fetched)
     """
     safe_title = sanitize_filename(title, SANITIZE_RULES)
     img_filename = f"page{page}_{idx}_{safe_title}.jpg"
     img_path = context.images_dir / img_filename
 
-    is_valid, new_img_url, not_valid_reason = validate_image_with_retry(
-        img_url, img_path, title, price, author, context, IMAGE_VALIDATION_CONFIG
-    )
+    # Resumed run: keep covers already saved by the interrupted run
+    checkpoint = getattr(context, "checkpoint", None)
+    if checkpoint is not None and checkpoint.resume and img_path.exists() \
+            and img_path.stat().st_size >= IMAGE_VALIDATION_CONFIG.get("min_image_file_size"):
+        return img_path, (os.path.basename(img_path), img_path)
+
+    # Cover already in the content-addressed store: link it, no request needed
+    store = getattr(context, "image_store", None)
+    if store is not None and store.skip_known_urls:
+        blob = store.lookup(normalize_image_url(img_url))
+        if blob is not None:
+            try:
+                store.link(blob, img_path)
+                return img_path, (os.path.basename(img_path), img_path)
+            except Exception as e:
+                logger.error(f"Linking stored image failed, downloading again: {img_path}: {e}")
+    return img_path, None
+
+
+def finish_image(result: tuple, img_path, title: str, price: str, author: str, page: int, idx: int,
+                 context) -> tuple[str, str]:
+    """Save a validated cover, or turn a failed validation into the row's image columns.
+
+    Args:
+        result (tuple): Verdict returned by `validate_image_with_retry`.
+        img_path: Local path to save the image.
+        title (str): Product title.
+        price (str): Product price.
+        author (str): Product author.
+        page (int): Page number.
+        idx (int): Image index on the page.
+        context: Runtime context containing directories and log paths.
+
+    Returns:
+        tuple[str, str]: (image filename or status, image path or status)
+    """
+    is_valid, new_img_url, not_valid_reason, body = result
 
     if is_valid:
-        download_success, fail_reason, error_msg = download_image(new_img_url, img_path, IMAGE_DOWNLOAD_CONFIG)
+        store = getattr(context, "image_store", None)
+        download_success, fail_reason, error_msg = save_image_body(body, img_path, new_img_url, store)
         if download_success:
             return os.path.basename(img_path), img_path
         else:
             fail_download_image_add_logging(
-                context.first_download_fail_list, img_url, img_path, title, price, author,
+                context.first_download_fail_list, new_img_url, img_path, title, price, author,
                 page, idx, fail_reason, error_msg, 0, False
             )
             return "Download Failed", "No Image"
     else:
-        if not_valid_reason not in ["Network Response Failed", "Incomplete Image"]:
+        if not is_retryable(not_valid_reason):
             return "No Image or Placeholder", "No Image"
         else:
             return not_valid_reason, "No Image"
 
 
-def final_download_for_fail_img(all_pages_data: dict, context, config: dict):
+def process_image(img_url: str, title: str, price: str, author: str, page: int, idx: int, context) -> tuple[str, str]:
+    """Process a single image: validate, sanitize filename, and save.
+
+    The body streamed during validation is moved straight into place, so each image
+    costs a single request. `download_image` is only used by the second-pass retry.
+
+    Args:
+        img_url (str): URL of the image to process.
+        title (str): Product title.
+        price (str): Product price.
+        author (str): Product author.
+        page (int): Page number.
+        idx (int): Image index on the page.
+        context: Runtime context containing directories and log paths.
+
+    Returns:
+        tuple[str, str]: (image filename or status, image path or status)
+    """
+    img_path, result = prepare_image(img_url, title, page, idx, context)
+    if result is not None:
+        return result
+
+    validation = validate_image_with_retry(
+        img_url, img_path, title, price, author, context, IMAGE_VALIDATION_CONFIG
+    )
+    return finish_image(validation, img_path, title, price, author, page, idx, context)
+
+
+class ImageDownloadStage:
+    """Bounded worker stage that processes cover images while parsing continues.
+
+    Parsing only enqueues image jobs through `submit`; a thread pool validates and
+    saves the images in the background so the browser can move on to the next page.
+    Each row's image columns are filled as soon as its job finishes, keyed by
+    (page, idx). Once a page is closed with `close_page` and all of its jobs are done,
+    its rows are handed to the context's streaming sink. `join` waits for everything.
+
+    When the context carries an asyncio engine, jobs run as coroutines on its event
+    loop instead of the thread pool, bounded by `async_max_in_flight`; their completion
+    work (sink writes, checkpoint appends, error logs) is handed to a single completion
+    thread so it never blocks the loop and the downloads in flight on it. With
+    `max_workers` set to 0 (and no engine) the stage runs every job inline, which
+    matches the original sequential behaviour.
+    """
+
+    def __init__(self, context, config: dict):
+        """
+        Args:
+            context: Runtime context passed through to `process_image`.
+            config (dict): Download configuration with max_workers and max_in_flight
+                (async_max_in_flight with an asyncio engine).
+        """
+        self.context = context
+        self.max_workers = config.get("max_workers", 0)
+        self._engine = getattr(context, "async_engine", None)
+        self._completion = None
+        if self._engine is not None:
+            max_in_flight = max(config.get("async_max_in_flight", 1), 1)
+            self._executor = None
+            # Done-callbacks of engine futures run on the loop thread; finish jobs elsewhere
+            self._completion = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-completion")
+        else:
+            max_in_flight = max(config.get("max_in_flight", self.max_workers), self.max_workers, 1)
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers) if self.max_workers > 0 else None
+        self._queued = self._engine is not None or self._executor is not None
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._all_done = threading.Condition(self._lock)
+        self._in_progress = 0
+        # page -> {"rows": [BookRecord], "pending": int, "closed": bool}
+        self._pages = {}
+
+    def _page(self, page: int) -> dict:
+        return self._pages.setdefault(page, {"rows": [], "pending": 0, "closed": False})
+
+    def _index_row(self, record: BookRecord):
+        """Keep a row whose cover failed to save reachable by (page, idx) for the second-pass retry."""
+        result_index = getattr(self.context, "result_index", None)
+        if result_index is not None:
+            result_index[(record.page, record.idx)] = record
+
+    def submit(self, record: BookRecord, img_url: str):
+        """Queue the cover image of one product row.
+
+        Blocks only when `max_in_flight` jobs are already queued or running.
+
+        Args:
+            record (BookRecord): Product row to update once the image is processed.
+            img_url (str): URL of the image to process.
+        """
+        title, price, author, page, idx = record.title, record.price, record.author, record.page, record.idx
+        with self._lock:
+            page_state = self._page(page)
+            page_state["rows"].append(record)
+            page_state["pending"] += 1
+            self._in_progress += 1
+
+        if not self._queued:
+            future = Future()
+            try:
+                future.set_result(process_image(img_url, title, price, author, page, idx, self.context))
+            except Exception as e:
+                future.set_exception(e)
+            self._finish(record, future)
+            return
+
+        self._slots.acquire()
+        try:
+            if self._engine is not None:
+                future = self._engine.submit(
+                    self._engine.process_image(img_url, title, price, author, page, idx, self.context)
+                )
+            else:
+                future = self._executor.submit(process_image, img_url, title, price, author, page, idx, self.context)
+        except Exception:
+            self._slots.release()
+            with self._lock:
+                page_state["rows"].pop()
+                page_state["pending"] -= 1
+                self._in_progress -= 1
+            raise
+        if self._completion is not None:
+            future.add_done_callback(lambda f: self._completion.submit(self._finish, record, f))
+        else:
+            future.add_done_callback(lambda f: self._finish(record, f))
+
+    def add_ready(self, record: BookRecord):
+        """Register a row whose image columns are already filled (e.g. restored from a checkpoint)."""
+        with self._lock:
+            self._page(record.page)["rows"].append(record)
+
+    def close_page(self, page: int):
+        """Mark a page as fully queued; its rows are streamed once its jobs are done."""
+        with self._lock:
+            page_state = self._page(page)
+            page_state["closed"] = True
+            ready = page_state["pending"] == 0
+        if ready:
+            self._emit_page(page)
+
+    def _finish(self, record: BookRecord, future: Future):
+        """Fill the row from a finished job, checkpoint it and stream the page if it is complete."""
+        page, idx = record.page, record.idx
+        try:
+            error = future.exception()
+            if error is None:
+                record.cover_img_filename, record.cover_img_path = future.result()
+                checkpoint = getattr(self.context, "checkpoint", None)
+                if checkpoint is not None:
+                    checkpoint.record_image(page, idx, record.cover_img_filename, record.cover_img_path)
+                if record.cover_img_filename == "Download Failed":
+                    self._index_row(record)
+            else:
+                error_msg = "".join(traceback.format_exception(error))
+                logger.error(f"Failed to process image for book {idx} on page {page}: {error_msg}")
+                log_to_text(f"{datetime.now()} - Page {page} Book {idx}: {error_msg}\n",
+                            self.context.parsing_error_log_path)
+                record.cover_img_filename, record.cover_img_path = "Download Failed", "No Image"
+        finally:
+            if self._queued:
+                self._slots.release()
+            with self._lock:
+                page_state = self._page(page)
+                page_state["pending"] -= 1
+                ready = page_state["closed"] and page_state["pending"] == 0
+                self._in_progress -= 1
+                self._all_done.notify_all()
+            if ready:
+                self._emit_page(page)
+
+    def _emit_page(self, page: int):
+        """Hand a completed page to the streaming sink and drop the stage's references to it."""
+        with self._lock:
+            page_state = self._pages.pop(page, None)
+        sink = getattr(self.context, "sink", None)
+        if page_state is None or sink is None:
+            return
+        sink.write_rows(sorted(page_state["rows"], key=lambda record: record.idx))
+
+    def join(self):
+        """Wait for all queued jobs; pages not closed explicitly are streamed now."""
+        with self._all_done:
+            if self._in_progress:
+                logger.info(f"Waiting for {self._in_progress} queued image jobs to finish")
+            self._all_done.wait_for(lambda: self._in_progress == 0)
+            remaining = list(self._pages)
+        for page in remaining:
+            self.close_page(page)
+
+    def shutdown(self):
+        """Release the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        if self._completion is not None:
+            self._completion.shutdown(wait=True)
+
+
+class FailedImageRetryQueue:
+    """Second-pass downloads ordered by the time each one is next eligible.
+
+    Every entry of `context.first_download_fail_list` starts eligible immediately; a failed
+    attempt is pushed back with an exponential delay (`backoff_factor * 2 ** (attempts - 1)`)
+    until `total_num_of_retry` attempts are used up.
+
+    A successful attempt patches the row, streams the updated row to the sink and
+    checkpoints it. The row comes from `context.result_index` (which only holds rows whose
+    cover failed to save) or is rebuilt from the failure entry.
+
+    The queue itself is not thread-safe: one driver (thread or event loop) pops entries,
+    runs the downloads concurrently and records their results.
+    """
+
+    def __init__(self, context, config: dict):
+        """
+        Args:
+            context: Runtime context with fail lists, result index, sink and checkpoint.
+            config (dict): Download configuration with total_num_of_retry and backoff_factor.
+        """
+        self.context = context
+        self.total_num_of_retry = config.get("total_num_of_retry")
+        self.backoff_factor = config.get("backoff_factor", 1)
+        self._heap = []
+        self._seq = itertools.count()
+        now = time.monotonic()
+        for item in context.first_download_fail_list:
+            if not item.retry_success and self.total_num_of_retry > 0:
+                self._push(item, now)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _push(self, item: ImageFailure, eligible_at: float):
+        heapq.heappush(self._heap, (eligible_at, next(self._seq), item))
+
+    def pop_ready(self) -> ImageFailure | None:
+        """Return the next `ImageFailure` whose delay has passed, or None."""
+        if self._heap and self._heap[0][0] <= time.monotonic():
+            return heapq.heappop(self._heap)[2]
+        return None
+
+    def next_wait(self) -> float | None:
+        """Seconds until the next entry becomes eligible (None if the queue is empty)."""
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - time.monotonic(), 0.0)
+
+    def record(self, item: ImageFailure, result: tuple, elapsed: float = None):
+        """Apply one attempt: patch the row on success, reschedule or give up on failure.
+
+        Args:
+            item (ImageFailure): Entry of `context.first_download_fail_list`.
+            result (tuple): (success_flag, reason, error_message) returned by `download_image`.
+            elapsed (float, optional): Duration of the attempt in seconds, for the run metrics.
+        """
+        download_success, second_fail_reason, error_msg = result
+        item.retry_count += 1
+        num_of_retry = item.retry_count
+        metrics = metrics_for(self.context)
+        if elapsed is not None:
+            metrics.observe("image_download_seconds", elapsed, result="ok" if download_success else "failed")
+        if download_success:
+            metrics.inc("image_bytes_total", os.path.getsize(item.img_path))
+            self._patch_row(item)
+        elif num_of_retry < self.total_num_of_retry:
+            metrics.inc("image_retries_total", stage="download", reason=reason_label(second_fail_reason))
+            self._push(item, time.monotonic() + self.backoff_factor * 2 ** (num_of_retry - 1))
+        else:
+            metrics.inc("image_failures_total", stage="download", reason=reason_label(second_fail_reason))
+            logger.info(f"{item.img_url} second download failed, adding to fail summary")
+            fail_download_image_add_logging(
+                self.context.second_download_fail_list, item.img_url, item.img_path,
+                item.title, item.price, item.author, item.page, item.idx,
+                second_fail_reason, error_msg, num_of_retry
+            )
+
+    def _patch_row(self, item: ImageFailure):
+        """Fill the image columns of the row a retried `ImageFailure` belongs to."""
+        entry = getattr(self.context, "result_index", {}).get((item.page, item.idx))
+        if entry is None:
+            # Rows are not kept in memory; the failure entry carries the product fields
+            entry = BookRecord(item.title, item.price, item.author, item.page, item.idx)
+        elif entry.title != item.title:
+            logger.error("!!! Unknown data recording ERROR, recommend retrying entire data capture process !!!")
+            return
+        entry.cover_img_filename = os.path.basename(item.img_path)
+        entry.cover_img_path = item.img_path
+        item.retry_success = True
+
+        # The page was already streamed; the sink keeps the last row written for (Page, Index)
+        sink = getattr(self.context, "sink", None)
+        if sink is not None:
+            sink.write_rows([entry], update=True)
+        checkpoint = getattr(self.context, "checkpoint", None)
+        if checkpoint is not None:
+            checkpoint.record_image(entry.page, entry.idx, entry.cover_img_filename, entry.cover_img_path)
+
+
+def final_download_for_fail_img(context, config: dict):
     """Retry download for images that failed in the first attempt.
 
+    Entries come from a `FailedImageRetryQueue` and are downloaded concurrently
+    (`max_workers` threads, or the asyncio engine when the context carries one);
+    a failed entry waits out its backoff without holding a worker. Patched rows are
+    written to the sink again, where the last version of each (page, idx) wins.
+
     Args:
-        all_pages_data (dict): All scraped page data containing image references.
         context: Runtime context with fail lists and directories.
         config (dict): Download configuration with retry counts.
     """
-    total_num_of_retry = config.get("total_num_of_retry")
-    if len(context.first_download_fail_list):
-        logger.info("Starting second attempt for failed images")
-
-        for num_of_retry in range(1, total_num_of_retry + 1):
-            for item in context.first_download_fail_list:
-                if not item["Retry_Success"]:
-                    download_success, second_fail_reason, error_msg = download_image(
-                        item["Img_URL"], item["Img_Path"], IMAGE_DOWNLOAD_CONFIG
-                    )
-                    item["Retry_Count"] = num_of_retry
-                    if download_success:
-                        img_status = os.path.basename(item["Img_Path"])
-                        entry = all_pages_data["Page"]["Index"]
-                        if entry["Title"] == item["Title"]:
-                            entry["Cover_Img_Filename"] = img_status
-                            entry["Cover_Img_Path"] = item["Img_Path"]
-                            item["Retry_Success"] = True
-                        else:
-                            logger.error("!!! Unknown data recording ERROR, recommend retrying entire data capture process !!!")
-                    else:
-                        if num_of_retry == total_num_of_retry:
-                            logger.info(f"{item['Img_URL']} second download failed, adding to fail summary")
-                            fail_download_image_add_logging(
-                                context.second_download_fail_list, item["Img_URL"], str(item["Img_Path"]),
-                                item["Title"], item["Price"], item["Author"], item["Page"], item["Index"],
-                                second_fail_reason, error_msg, num_of_retry
-                            )
-                                second_fail_reason, error_msg, num_of_retry
-                            )
+    engine = getattr(context, "async_engine", None)
+    if engine is not None:
+        return engine.run(engine.final_download_for_fail_img(context, config))
+
+    retry_queue = FailedImageRetryQueue(context, config)
+    if not len(retry_queue):
+        return
+    logger.info(f"Starting second attempt for {len(retry_queue)} failed images")
+
+    max_workers = max(config.get("max_workers", 1), 1)
+    client = getattr(context, "image_client", None)
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while len(retry_queue) or running:
+            while len(running) < max_workers:
+                item = retry_queue.pop_ready()
+                if item is None:
+                    break
+                future = pool.submit(download_image, item.img_url, item.img_path, IMAGE_DOWNLOAD_CONFIG, client)
+                running[future] = (item, time.perf_counter())
+
+            timeout = retry_queue.next_wait() if len(running) < max_workers else None
+            if not running:
+                time.sleep(timeout)
+                continue
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                item, start = running.pop(future)
+                retry_queue.record(item, future.result(), time.perf_counter() - start)
@@ -0,0 +1,213 @@
+"""
+image_store.py
+==============
+
+This module provides a content-addressed store for cover images that is shared by all runs.
+
+- Every image body is saved once under its SHA-256 hash (`<store_dir>/ab/abcdef....jpg`).
+- A persistent URL -> hash index (append-only JSONL) lets later runs skip URLs they already know.
+- The per-run file name (`page{page}_{idx}_{title}.jpg`) is a hard link (or symlink / copy) to the
+  stored blob, so identical covers from different runs or keywords take disk space only once.
+- Hit / miss counters are kept for the end-of-run summary.
+
+本模块提供按内容寻址的封面图存储，在多次运行之间共享。
+
+- 每张图片按 SHA-256 哈希只保存一份（`<store_dir>/ab/abcdef....jpg`）。
+- 持久化的 URL -> 哈希索引（追加写入的 JSONL），后续运行可跳过已知 URL 的下载。
+- 每次运行的图片文件名（`page{page}_{idx}_{title}.jpg`）通过硬链接（或软链接 / 复制）指向存储文件，
+  相同封面在不同运行或关键词之间只占用一份磁盘空间。
+- 记录命中 / 未命中统计，用于运行结束时汇总。
+"""
+
+# ===== Standard Library Modules =====
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+# ===== Custom Project Modules =====
+from logger import logger
+
+
+class ImageStore:
+    """
+    Content-addressed image store with a persistent URL -> SHA-256 index.
+
+    Attributes:
+        store_dir (Path): Root directory of the stored blobs and the index.
+        link_mode (str): How per-run files point to blobs: "hardlink", "symlink" or "copy".
+        skip_known_urls (bool): Serve indexed URLs without a request (otherwise they are
+            revalidated, e.g. through the HTTP cache).
+        url_hits (int): Images served from the index without any request.
+        content_hits (int): Downloaded images whose bytes were already stored.
+        misses (int): Images stored for the first time.
+    """
+
+    def __init__(self, store_dir, link_mode: str = "hardlink", skip_known_urls: bool = True):
+        """
+        Args:
+            store_dir: Root directory of the store.
+            link_mode: "hardlink" (falls back to copy across filesystems), "symlink" or "copy".
+            skip_known_urls: Serve indexed URLs without a request.
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.store_dir / "url_index.jsonl"
+        self.link_mode = link_mode
+        self.skip_known_urls = skip_known_urls
+        self.url_hits = 0
+        self.content_hits = 0
+        self.misses = 0
+        self._index = {}
+        self._lock = threading.Lock()
+        self._load_index()
+        self._index_file = self.index_path.open("a", encoding="utf-8")
+
+    def _load_index(self):
+        """Load the URL index; entries whose blob no longer exists are dropped."""
+        if not self.index_path.exists():
+            return
+        with self.index_path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if self.blob_path(entry["sha256"]).exists():
+                    self._index[entry["url"]] = entry["sha256"]
+        logger.info(f"Image store index loaded: {len(self._index)} URLs from {self.index_path}")
+
+    def blob_path(self, digest: str) -> Path:
+        """Path of the stored blob for a SHA-256 hex digest."""
+        return self.store_dir / digest[:2] / f"{digest}.jpg"
+
+    def lookup(self, url: str) -> Path | None:
+        """
+        Return the stored blob for a known URL and count the hit.
+
+        Args:
+            url: Normalized image URL.
+
+        Returns:
+            Path | None: Blob path, or None if the URL is unknown or its blob is gone.
+        """
+        with self._lock:
+            digest = self._index.get(url)
+        if digest is None:
+            return None
+        blob = self.blob_path(digest)
+        if not blob.exists():
+            return None
+        with self._lock:
+            self.url_hits += 1
+        return blob
+
+    def put_file(self, url: str, body_path, digest: str, size: int) -> Path:
+        """
+        Store a validated image body once by content hash and index the URL.
+
+        The body file is moved into the store (or deleted if the same content is
+        already stored), so the caller must not use `body_path` afterwards.
+
+        Args:
+            url: Normalized image URL.
+            body_path: Temporary file holding the validated body.
+            digest: SHA-256 hex digest of the body.
+            size: Body size in bytes.
+
+        Returns:
+            Path: Blob path holding the content.
+        """
+        body_path = Path(body_path)
+        blob = self.blob_path(digest)
+        if blob.exists():
+            body_path.unlink(missing_ok=True)
+            with self._lock:
+                self.content_hits += 1
+        else:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            # Rename into place, so concurrent writers never expose a partial blob
+            try:
+                os.replace(body_path, blob)
+            except OSError:
+                # Different filesystem: copy next to the blob, then rename
+                tmp_path = blob.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                shutil.move(body_path, tmp_path)
+                os.replace(tmp_path, blob)
+            with self._lock:
+                self.misses += 1
+
+        with self._lock:
+            if self._index.get(url) != digest:
+                self._index[url] = digest
+                self._index_file.write(json.dumps({"url": url, "sha256": digest, "size": size}) + "\n")
+                self._index_file.flush()
+        return blob
+
+    def link(self, blob: Path, target) -> None:
+        """
+        Make the per-run file name point to a stored blob.
+
+        Args:
+            blob: Stored blob path.
+            target: Per-run image path.
+        """
+        target = Path(target)
+        if target.exists() or target.is_symlink():
+            target.unlink()
+        if self.link_mode == "symlink":
+            target.symlink_to(blob.resolve())
+            return
+        if self.link_mode == "hardlink":
+            try:
+                os.link(blob, target)
+                return
+            except OSError:
+                pass
+        shutil.copyfile(blob, target)
+
+    def stats(self) -> dict:
+        """Return hit / miss counters and the index size."""
+        with self._lock:
+            total = self.url_hits + self.content_hits + self.misses
+            return {
+                "url_hits": self.url_hits,
+                "content_hits": self.content_hits,
+                "misses": self.misses,
+                "hit_ratio": round((self.url_hits + self.content_hits) / total, 3) if total else 0.0,
+                "indexed_urls": len(self._index)
+            }
+
+    def close(self):
+        """Close the index file."""
+        with self._lock:
+            self._index_file.close()
+
+
+# Stores are shared by every run of the process that uses the same directory
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_image_store(config: dict) -> ImageStore | None:
+    """
+    Return the shared image store for a configuration, creating it on first use.
+
+    Args:
+        config: Image store configuration, e.g. IMAGE_STORE_CONFIG.
+
+    Returns:
+        ImageStore | None: Shared store, or None if the store is disabled.
+    """
+    if not config.get("enabled"):
+        return None
+    store_dir = Path(config.get("store_dir"))
+    if not store_dir.is_absolute():
+        store_dir = Path(__file__).resolve().parent.parent / store_dir
+    with _stores_lock:
+        if store_dir not in _stores:
+            _stores[store_dir] = ImageStore(
+                store_dir, config.get("link_mode", "hardlink"), config.get("skip_known_urls", True)
+            )
+        return _stores[store_dir]
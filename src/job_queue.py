@@ -0,0 +1,305 @@
+"""
+job_queue.py
+============
+
+This module provides the persistent job queue shared by crawl nodes.
+
+- `JobQueue` defines the backend interface: `put` / `put_many` add jobs (deduplicated by key),
+  `lease` hands one job to a worker for a visibility timeout, `ack` completes it and `fail`
+  schedules a retry with exponential backoff or marks the job dead after `max_attempts` leases.
+- A leased job whose visibility timeout expires (its node crashed or stalled) becomes
+  available again; acks and failures carry the lease token, so a node that lost its lease
+  cannot complete a job another node has taken over.
+- `SqliteJobQueue` keeps jobs in one SQLite file (WAL mode), so several processes on one
+  machine, or nodes sharing the file, can pull from the same queue. Other backends (e.g.
+  Redis: a sorted set by availability time plus a hash of leases) register in `QUEUE_BACKENDS`.
+
+本模块提供各抓取节点共享的持久化任务队列。
+
+- `JobQueue` 定义后端接口：`put` / `put_many` 按去重键添加任务，`lease` 在可见性超时内将任务交给
+  一个工作者，`ack` 完成任务，`fail` 按指数退避安排重试，租约次数达到 `max_attempts` 后标记为失败。
+- 租约超时（节点崩溃或卡住）的任务会重新变为可领取；确认和失败操作都携带租约令牌，
+  失去租约的节点无法完成已被其他节点接手的任务。
+- `SqliteJobQueue` 将任务保存在一个 SQLite 文件中（WAL 模式），同一台机器上的多个进程或共享该文件的节点
+  可以从同一个队列领取任务。其他后端（如 Redis：按可用时间排序的有序集合加租约哈希）注册到 `QUEUE_BACKENDS`。
+"""
+
+# ===== Standard Library Modules =====
+import abc
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+# ===== Custom Project Modules =====
+from logger import logger
+from sqlite_util import connect_sqlite, project_path
+
+
+@dataclass(slots=True)
+class Job:
+    """
+    One leased job.
+
+    Attributes:
+        id: Backend job id.
+        kind: Job type, e.g. "page" or "image".
+        payload: JSON-serializable job data.
+        attempts: Leases so far, this one included.
+        lease_token: Token of the current lease; required to ack or fail the job.
+    """
+    id: int
+    kind: str
+    payload: dict
+    attempts: int
+    lease_token: str
+
+
+class JobQueue(abc.ABC):
+    """
+    Interface of job queue backends.
+
+    Job states: "queued" (waiting, possibly until a retry time), "leased", "done" and "dead".
+    """
+
+    @classmethod
+    @abc.abstractmethod
+    def from_config(cls, config: dict) -> "JobQueue":
+        """Open the backend from the queue configuration."""
+
+    def put(self, kind: str, payload: dict, key: str = None, priority: int = 0) -> bool:
+        """Add a job; returns False if a job with the same key already exists."""
+        return self.put_many(kind, [(payload, key)], priority) == 1
+
+    @abc.abstractmethod
+    def put_many(self, kind: str, jobs: list[tuple[dict, str | None]], priority: int = 0) -> int:
+        """Add (payload, key) jobs in one batch; returns how many were new. Lower priority runs first."""
+
+    @abc.abstractmethod
+    def lease(self, kinds: list[str], owner: str) -> Job | None:
+        """Take the next available job of the given kinds for one visibility timeout, or None."""
+
+    @abc.abstractmethod
+    def ack(self, job: Job) -> bool:
+        """Mark a leased job done; False if the lease was lost."""
+
+    @abc.abstractmethod
+    def fail(self, job: Job, error: str, retry: bool = True) -> str | None:
+        """Record a failed attempt; returns the new state ("queued" or "dead"), or None if the lease was lost."""
+
+    @abc.abstractmethod
+    def pending(self) -> int:
+        """Jobs not finished yet (queued or leased)."""
+
+    @abc.abstractmethod
+    def dead_jobs(self) -> list[dict]:
+        """Jobs given up on, with kind, payload, attempts and last error."""
+
+    @abc.abstractmethod
+    def stats(self) -> dict:
+        """Job counts by kind and state."""
+
+    def close(self):
+        pass
+
+
+class SqliteJobQueue(JobQueue):
+    """
+    Job queue in a SQLite file.
+
+    Leasing runs in a `BEGIN IMMEDIATE` transaction, so two processes never take the same job.
+    Each thread uses its own connection.
+
+    Attributes:
+        path (Path): Database file.
+        visibility_timeout (float): Seconds a lease lasts.
+        max_attempts (int): Leases per job before it is marked dead.
+        retry_delay (float): Delay before the first retry of a failed job; doubles per attempt.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            job_key TEXT UNIQUE,
+            payload TEXT NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            available_at REAL NOT NULL,
+            lease_owner TEXT,
+            lease_token TEXT,
+            lease_expires REAL,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, kind, priority, available_at);
+        CREATE INDEX IF NOT EXISTS jobs_leases ON jobs (status, lease_expires);
+    """
+
+    def __init__(self, path, visibility_timeout: float = 120, max_attempts: int = 5, retry_delay: float = 5.0,
+                 busy_timeout: float = 30.0):
+        """
+        Args:
+            path: Database file (created if missing).
+            visibility_timeout: Seconds a lease lasts.
+            max_attempts: Leases per job before it is marked dead.
+            retry_delay: Delay before the first retry of a failed job.
+            busy_timeout: Seconds to wait for another process's write lock.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._conn().executescript(self.SCHEMA)
+
+    @classmethod
+    def from_config(cls, config: dict) -> "SqliteJobQueue":
+        return cls(
+            project_path(config.get("path", "output/queue/jobs.sqlite3")),
+            visibility_timeout=config.get("visibility_timeout", 120),
+            max_attempts=config.get("max_attempts", 5),
+            retry_delay=config.get("retry_delay", 5.0),
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect_sqlite(self.path, self.busy_timeout)
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def put_many(self, kind: str, jobs: list[tuple[dict, str | None]], priority: int = 0) -> int:
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (kind, job_key, payload, priority, available_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(kind, key, json.dumps(payload, ensure_ascii=False), priority, now, now, now)
+                 for payload, key in jobs]
+            )
+            added = conn.total_changes - before
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def lease(self, kinds: list[str], owner: str) -> Job | None:
+        now = time.time()
+        placeholders = ",".join("?" * len(kinds))
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Expired leases of jobs out of attempts are given up instead of handed out again
+            conn.execute(
+                "UPDATE jobs SET status = 'dead', lease_token = NULL, updated_at = ?,"
+                " last_error = COALESCE(last_error, 'Lease expired') "
+                "WHERE status = 'leased' AND lease_expires <= ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            row = conn.execute(
+                f"SELECT id, kind, payload, attempts FROM jobs WHERE kind IN ({placeholders}) AND ("
+                f"(status = 'queued' AND available_at <= ?) OR (status = 'leased' AND lease_expires <= ?)) "
+                f"ORDER BY priority, available_at, id LIMIT 1",
+                (*kinds, now, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            job_id, kind, payload, attempts = row
+            token = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, lease_token = ?,"
+                " lease_expires = ?, updated_at = ? WHERE id = ?",
+                (owner, token, now + self.visibility_timeout, now, job_id)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return Job(job_id, kind, json.loads(payload), attempts + 1, token)
+
+    def ack(self, job: Job) -> bool:
+        cursor = self._conn().execute(
+            "UPDATE jobs SET status = 'done', lease_token = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_token = ?",
+            (time.time(), job.id, job.lease_token)
+        )
+        if cursor.rowcount != 1:
+            logger.warning(f"Lease of job {job.id} ({job.kind}) was lost before it was acknowledged")
+            return False
+        return True
+
+    def fail(self, job: Job, error: str, retry: bool = True) -> str | None:
+        now = time.time()
+        status = "queued" if retry and job.attempts < self.max_attempts else "dead"
+        available_at = now + self.retry_delay * 2 ** (job.attempts - 1)
+        cursor = self._conn().execute(
+            "UPDATE jobs SET status = ?, available_at = ?, last_error = ?, lease_token = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_token = ?",
+            (status, available_at, error, now, job.id, job.lease_token)
+        )
+        if cursor.rowcount != 1:
+            logger.warning(f"Lease of job {job.id} ({job.kind}) was lost before its failure was recorded")
+            return None
+        return status
+
+    def pending(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'leased')").fetchone()[0]
+
+    def dead_jobs(self) -> list[dict]:
+        rows = self._conn().execute(
+            "SELECT kind, payload, attempts, last_error FROM jobs WHERE status = 'dead' ORDER BY id"
+        ).fetchall()
+        return [
+            {"kind": kind, "payload": json.loads(payload), "attempts": attempts, "last_error": last_error}
+            for kind, payload, attempts, last_error in rows
+        ]
+
+    def stats(self) -> dict:
+        stats = {}
+        for kind, status, count in self._conn().execute(
+                "SELECT kind, status, COUNT(*) FROM jobs GROUP BY kind, status ORDER BY kind, status"):
+            stats.setdefault(kind, {})[status] = count
+        return stats
+
+    def close(self):
+        """Close the connections of all threads."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+QUEUE_BACKENDS = {"sqlite": SqliteJobQueue}
+
+
+def create_queue(config: dict) -> JobQueue:
+    """
+    Open the job queue backend selected in the configuration.
+
+    Args:
+        config: Queue configuration, e.g. QUEUE_CONFIG.
+
+    Returns:
+        JobQueue: Opened queue.
+    """
+    backend = config.get("backend", "sqlite")
+    if backend not in QUEUE_BACKENDS:
+        raise ValueError(f"Unknown job queue backend: {backend} (available: {', '.join(QUEUE_BACKENDS)})")
+    return QUEUE_BACKENDS[backend].from_config(config)
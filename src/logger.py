@@ -4,26 +4,35 @@ logger.py
 
 This module provides logging utilities for the project, including:
 - Global logger with console and file handlers
-- Size and time-based rotating file handler
+- Queue-based logging: callers enqueue records, one listener thread does all file and console I/O
+- Size and time-based rotating file handler (size checked from a running estimate)
 - Context-specific logger for per-run log files
-- JSON and text log helper functions
+- Thread-scoped run log files for concurrent (batch) runs
+- JSON Lines and text log helper functions, buffered and flushed in batches
+- Per-process global log files for worker processes (also safe after fork)
 
 本模块提供项目日志功能，包括：
 - 全局日志（控制台 + 文件）
-- 按大小和时间轮转的日志处理器
+- 基于队列的日志：调用线程只负责入队，由单个监听线程完成文件和控制台写入
+- 按大小和时间轮转的日志处理器（按累计估算大小判断，不重复格式化）
 - Context 专属日志（每次运行独立日志文件）
-- JSON 和文本日志写入辅助函数
+- 并发批量运行时按线程区分的运行日志
+- JSON Lines 和文本日志写入辅助函数（缓冲后批量刷新）
+- 工作进程使用独立的全局日志文件（fork 后同样可用）
 """
 
 from pathlib import Path
+import atexit
 import logging
 import os
 import json
 import re
 import time
 import glob
+import queue
+import threading
 from datetime import datetime
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 
 # ================= Global log path =================
 current_file = Path(__file__).resolve()
@@ -31,6 +40,8 @@ project_root = current_file.parent.parent  # Project root directory
 log_dir = project_root / "logs"
 log_dir.mkdir(parents=True, exist_ok=True)
 GLOBAL_LOG_PATH = log_dir / "run_log.log"
+# Rough length of "asctime - levelname - name - " for size estimates (non-ASCII text is undercounted)
+RECORD_PREFIX_BYTES = 48
 
 
 class SizeAndTimeRotatingFileHandler(TimedRotatingFileHandler):
@@ -52,18 +63,31 @@ class SizeAndTimeRotatingFileHandler(TimedRotatingFileHandler):
         self.backupDays = backupDays
         super().__init__(filename, when, interval, backupCount=0, encoding=encoding)
 
+    def _open(self):
+        stream = super()._open()
+        # Bytes in the file, kept up to date by `emit` so no record is measured on disk
+        self.current_size = os.fstat(stream.fileno()).st_size
+        return stream
+
+    @staticmethod
+    def estimate_size(record) -> int:
+        """Approximate bytes a record adds: message length plus the formatter prefix (no formatting/encoding)."""
+        return len(str(record.msg)) + RECORD_PREFIX_BYTES
+
     def shouldRollover(self, record):
-        """Check if rollover is needed based on size or time."""
+        """Check if rollover is needed based on time or the estimated file size."""
         if super().shouldRollover(record):
             return 1
         if self.stream is None:
             self.stream = self._open()
-        if self.maxBytes > 0:
-            msg = f"{self.format(record)}\n"
-            if self.stream.tell() + len(msg.encode(self.encoding or "utf-8")) >= self.maxBytes:
-                return 1
+        if self.maxBytes > 0 and self.current_size + self.estimate_size(record) >= self.maxBytes:
+            return 1
         return 0
 
+    def emit(self, record):
+        super().emit(record)
+        self.current_size += self.estimate_size(record)
+
     def doRollover(self):
         """Perform rollover and clean old logs."""
         super().doRollover()
@@ -88,11 +112,50 @@ class SizeAndTimeRotatingFileHandler(TimedRotatingFileHandler):
 
 
 # ================= Logger configuration =================
+class HandlerFanout(logging.Handler):
+    """
+    Handler that passes each record on to a changeable set of handlers.
+    - Runs on the queue listener thread, so file and console writes never block the caller
+    - Handlers can be attached and detached while the listener is running
+
+    将每条日志转发给一组可变处理器的处理器
+    - 在队列监听线程中运行，文件和控制台写入不会阻塞调用线程
+    - 监听器运行期间可以动态添加和移除处理器
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.handlers = ()
+
+    def add(self, handler: logging.Handler):
+        with self.lock:
+            self.handlers = self.handlers + (handler,)
+
+    def discard(self, handler: logging.Handler):
+        with self.lock:
+            self.handlers = tuple(h for h in self.handlers if h is not handler)
+
+    def handle(self, record):
+        flushed = getattr(record, "flush_event", None)
+        if flushed is not None:
+            flushed.set()
+            return True
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+
 logger = logging.getLogger("app_logger")
 logger.setLevel(logging.INFO)
 
 formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
 
+# Callers only put records on the queue; one listener thread formats and writes them
+log_queue = queue.SimpleQueue()
+log_fanout = HandlerFanout()
+queue_listener = QueueListener(log_queue, log_fanout)
+
 # --------- Global log handler (append mode) ---------
 if not logger.handlers:
     global_file_handler = SizeAndTimeRotatingFileHandler(
@@ -104,11 +167,44 @@ if not logger.handlers:
         encoding="utf-8"
     )
     global_file_handler.setFormatter(formatter)
-    logger.addHandler(global_file_handler)
+    log_fanout.add(global_file_handler)
 
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    log_fanout.add(console_handler)
+
+    logger.addHandler(QueueHandler(log_queue))
+    queue_listener.start()
+    atexit.register(queue_listener.stop)
+
+
+def use_process_log(log_path: Path):
+    """
+    Write this process's global log to its own file instead of the shared global log.
+    - Used by shard worker processes, so several processes never rotate one file
+
+    将当前进程的全局日志写入独立文件，代替共享的全局日志
+    - 分片工作进程使用，避免多个进程同时轮转同一个文件
+    """
+    global global_file_handler
+    drain_log_queue()
+    Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+    handler = SizeAndTimeRotatingFileHandler(filename=log_path, encoding="utf-8")
+    handler.setFormatter(formatter)
+    log_fanout.discard(global_file_handler)
+    global_file_handler.close()
+    log_fanout.add(handler)
+    global_file_handler = handler
+
+
+def drain_log_queue(timeout: float = 5.0):
+    """Block until every record queued so far has been written."""
+    if queue_listener._thread is None:
+        return
+    flushed = threading.Event()
+    log_queue.put_nowait(logging.makeLogRecord({"flush_event": flushed}))
+    flushed.wait(timeout)
+
 
 # Context-specific log handler (can be switched dynamically)
 context_file_handler = None
@@ -127,46 +223,195 @@ def reconfigure_file_handler(context_log_path: Path):
     global context_file_handler
 
     if context_file_handler:
-        logger.removeHandler(context_file_handler)
+        drain_log_queue()
+        log_fanout.discard(context_file_handler)
+        context_file_handler.close()
 
     Path(context_log_path).parent.mkdir(parents=True, exist_ok=True)
 
     handler = logging.FileHandler(context_log_path, mode="w", encoding="utf-8")
     handler.setFormatter(formatter)
 
-    logger.addHandler(handler)
+    log_fanout.add(handler)
     context_file_handler = handler
 
     logger.info(" ====== Context log separator ======")
     logger.info(f"Context log switched to: {context_log_path}")
 
 
+class ThreadFilter(logging.Filter):
+    """Only pass records emitted by one thread."""
+
+    def __init__(self, thread_id: int):
+        super().__init__()
+        self.thread_id = thread_id
+
+    def filter(self, record):
+        return record.thread == self.thread_id
+
+
+def add_file_handler(log_path: Path) -> logging.Handler:
+    """
+    Attach a run log file that receives records from every thread of the process.
+    - Used by crawl nodes (one per process), whose jobs run on worker threads
+    - Remove it with `remove_file_handler` when the run ends
+
+    添加记录本进程所有线程日志的运行日志文件
+    - 用于抓取节点（每个进程一个），其任务在工作线程中执行
+    - 运行结束后使用 `remove_file_handler` 移除
+    """
+    Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+
+    handler = logging.FileHandler(log_path, mode="w", encoding="utf-8")
+    handler.setFormatter(formatter)
+    log_fanout.add(handler)
+    return handler
+
+
+def add_thread_file_handler(log_path: Path) -> logging.Handler:
+    """
+    Attach a run log file that only receives records from the calling thread.
+    - Used by concurrent batch runs, where the shared context handler cannot be switched
+    - Remove it with `remove_file_handler` when the run ends
+
+    为并发批量运行添加仅记录当前线程日志的运行日志文件
+    - 批量运行时无法切换共享的 Context 日志，因此按线程区分
+    - 运行结束后使用 `remove_file_handler` 移除
+    """
+    handler = add_file_handler(log_path)
+    handler.addFilter(ThreadFilter(threading.get_ident()))
+    return handler
+
+
+def remove_file_handler(handler: logging.Handler):
+    """Detach and close a run log handler (see `add_file_handler`) once its queued records are written."""
+    drain_log_queue()
+    log_fanout.discard(handler)
+    handler.close()
+
+
+# ---------------- Buffered structured log files ----------------
+LOG_BUFFER_MAX_ENTRIES = 256   # Entries held per file before a flush is forced
+LOG_FLUSH_INTERVAL = 2.0       # Seconds between background flushes
+
+
+class BufferedLogWriter:
+    """
+    Append-only log file written through an in-memory buffer.
+    - Entries are written in one batch when the buffer is full, by the periodic flusher,
+      or on `flush` / interpreter exit, instead of one open/append/close per entry
+    - Safe to call from worker threads
+
+    通过内存缓冲写入的追加式日志文件
+    - 缓冲区满、定时刷新、显式 `flush` 或解释器退出时批量写入，而不是每条记录打开/追加/关闭一次文件
+    - 可在工作线程中安全调用
+    """
+
+    def __init__(self, file_path: Path, max_entries: int = LOG_BUFFER_MAX_ENTRIES):
+        self.file_path = Path(file_path)
+        self.max_entries = max_entries
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def write(self, line: str):
+        """Queue one line (without trailing newline)."""
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.max_entries:
+                self._flush_locked()
+
+    def flush(self):
+        """Write all queued lines to the file."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        lines, self._buffer = self._buffer, []
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.file_path.open("a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to flush {len(lines)} log entries to {self.file_path}: {e}")
+
+
+_log_writers = {}
+_log_writers_lock = threading.Lock()
+_flusher_thread = None
+
+
+def _flush_periodically():
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        flush_log_writers()
+
+
+def get_log_writer(file_path: Path) -> BufferedLogWriter:
+    """Return the buffered writer of a log file, creating it (and the background flusher) on first use."""
+    global _flusher_thread
+    file_path = Path(file_path).resolve()
+    writer = _log_writers.get(file_path)
+    if writer is None:
+        with _log_writers_lock:
+            writer = _log_writers.get(file_path)
+            if writer is None:
+                writer = _log_writers[file_path] = BufferedLogWriter(file_path)
+            if _flusher_thread is None:
+                _flusher_thread = threading.Thread(target=_flush_periodically, name="log-flusher", daemon=True)
+                _flusher_thread.start()
+    return writer
+
+
+def flush_log_writers():
+    """Flush every buffered log file (end of a run, shutdown)."""
+    with _log_writers_lock:
+        writers = list(_log_writers.values())
+    for writer in writers:
+        writer.flush()
+
+
+atexit.register(flush_log_writers)
+
+
+def _reset_after_fork():
+    """
+    Restart logging in a forked child: the listener and flusher threads do not survive fork(),
+    and records or buffered lines copied from the parent are the parent's to write.
+    """
+    global log_queue, _log_writers_lock, _flusher_thread
+    log_queue = queue.SimpleQueue()
+    for handler in logger.handlers:
+        if isinstance(handler, QueueHandler):
+            handler.queue = log_queue
+    queue_listener.queue = log_queue
+    queue_listener._thread = None
+    queue_listener.start()
+    _log_writers_lock = threading.Lock()
+    _log_writers.clear()
+    _flusher_thread = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
 # ---------------- Helper functions ----------------
 def log_to_json(data: dict, file_path: Path):
-    """Write a JSON log entry (append mode)."""
-    file_path = Path(file_path)
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-
+    """Append a JSON log entry as one line (JSON Lines); a timestamp is added if missing."""
     try:
-        with file_path.open("a", encoding="utf-8") as f:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            f.write(f"[{timestamp}]\n")
-            json.dump(data, f, ensure_ascii=False)
-            f.write("\n")
-        logger.info(f"JSON log written: {file_path} | {data}")
+        if "timestamp" not in data:
+            data = {"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), **data}
+        get_log_writer(file_path).write(json.dumps(data, ensure_ascii=False, default=str))
     except Exception as e:
         logger.error(f"Failed to write JSON log: {e} | data={data}")
 
 
 def log_to_text(message: str, file_path: Path):
-    """Write a text log entry (append mode)."""
-    file_path = Path(file_path)
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-
+    """Append a text log entry."""
     try:
-        with file_path.open("a", encoding="utf-8") as f:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            f.write(f"[{timestamp}] {message}\n")
-        logger.info(f"Text log written: {file_path} | {message}")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        get_log_writer(file_path).write(f"[{timestamp}] {message.rstrip()}")
     except Exception as e:
         logger.error(f"Failed to write text log: {e} | message={message}")
@@ -4,22 +4,37 @@ main.py
 
 This is the main pipeline controller for the project.
 - Creates necessary folders and files
-- Opens the browser to the search page
+- Fetches search result pages over HTTP (falls back to the browser if that fails)
 - Parses product information
 - Handles image downloading (including retry for failed downloads)
 - Saves extracted data
 - Logs the entire process
+- Runs many keywords concurrently over a shared browser pool (batch mode)
+- Exports run metrics (JSON summary, optional Prometheus textfile)
+- Optional profiling of a run (--profile)
+- Multi-process sharded crawling with merged output (--processes)
+- Crawl nodes working off a persistent job queue (--queue)
 
 主流程控制文件
 - 创建必要的文件夹和文件路径
-- 打开浏览器访问搜索页面
+- 直接通过 HTTP 获取搜索结果页（失败时回退到浏览器）
 - 解析产品信息
 - 图片下载及失败图片二次下载处理
 - 保存抓取到的数据
 - 记录整个流程日志
+- 批量模式：多个关键词共享浏览器池并发抓取
+- 导出运行指标（JSON 汇总，可选 Prometheus 文本文件）
+- 可选的运行性能分析（--profile）
+- 多进程分片抓取并合并输出（--processes）
+- 从持久化任务队列领取任务的抓取节点（--queue）
 """
 
 # ===== Standard Library Modules =====
+import argparse
+import multiprocessing
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
 
 # ===== Third-Party Library Modules =====
 
@@ -29,20 +44,31 @@ import request_module as req_m
 import parse_module as parse_m
 import image_process as img_pro
 import storage_module as sto_m
-from logger import logger
+import rate_limiter as rate_lim
+import metrics as met
+import profiling
+import sharding as shard
+import job_queue as jq
+import crawl_node
+from logger import logger, remove_file_handler, flush_log_writers
 from config import *
 
 
 def run_pipeline(
         keyword: str,
         target_website: str,
+        driver_pool: req_m.DriverPool = None,
+        batch: bool = False,
+        resume: bool = False,
+        pages: tuple[int, int] = None,
+        run_name: str = None,
 ):
     """
     Main pipeline execution function.
 
     Steps:
     1. Create folders and file paths
-    2. Open the browser and navigate to search page
+    2. Fetch and parse result pages over HTTP, or open the browser as fallback
     3. Parse product information
     4. Retry downloading failed images
     5. Save extracted data
@@ -52,37 +78,332 @@ def run_pipeline(
 
     步骤：
     1. 创建文件夹和文件路径
-    2. 打开浏览器并访问搜索页面
+    2. 通过 HTTP 获取并解析结果页，失败时打开浏览器访问搜索页面
     3. 解析产品信息
     4. 对下载失败的图片进行二次下载
     5. 保存抓取到的数据
     6. 记录完成日志
+
+    Args:
+        keyword: The keyword to search for.
+        target_website: The base URL of the website.
+        driver_pool: Optional shared driver pool; a driver is borrowed instead of started.
+        batch: Give this keyword its own output/log directories (for concurrent runs).
+        resume: Skip pages and images already finished by an interrupted earlier run.
+        pages: Inclusive (first, last) result page range of a shard run; default all configured pages.
+        run_name: Directory name of a shard run (used with `batch`).
     """
     # ===== Create folders and file paths =====
-    context = ctx_mod.create_context()
+    context = ctx_mod.create_context(keyword if batch else None, resume=resume, run_name=run_name)
+    parse_config = PARSE_PRODUCT_CONFIG
+    if pages is not None:
+        parse_config = dict(PARSE_PRODUCT_CONFIG, start_page=pages[0], total_pages=pages[1])
+    browser_fallback = True
 
-    # ===== Open browser and navigate to search page =====
-    driver = req_m.open_search_page(keyword, target_website, PARSE_PRODUCT_CONFIG)
     try:
-        # ===== Enter main data acquisition flow =====
-        all_pages_data = parse_m.parse_product(driver, context, PARSE_PRODUCT_CONFIG, selectors=None)
+        page_counts = {}
+
+        # ===== Browserless data acquisition flow =====
+        if HTTP_FETCH_CONFIG.get("fetch_mode") == "http":
+            page_counts = parse_m.parse_product_http(keyword, context, parse_config, HTTP_FETCH_CONFIG)
+            if not page_counts and parse_config.get("start_page", 1) > 1:
+                # A later shard without products is most likely past the last result page
+                logger.warning(f"HTTP fetch returned no products from page {parse_config['start_page']}, "
+                               f"no browser fallback for a later shard.")
+                browser_fallback = False
+            elif not page_counts:
+                logger.warning("HTTP fetch returned no products, falling back to Selenium.")
+
+        if not page_counts and browser_fallback:
+            # ===== Open browser and navigate to search page =====
+            if driver_pool is None:
+                with context.metrics.timer("browser_startup_seconds", source="new"):
+                    driver = req_m.open_search_page(keyword, target_website, parse_config)
+                try:
+                    # ===== Enter main data acquisition flow =====
+                    page_counts = parse_m.parse_product(driver, context, parse_config, selectors=None)
+                finally:
+                    # ===== Close browser =====
+                    req_m.driver_quit(driver)
+            else:
+                with context.metrics.timer("browser_startup_seconds", source="pool"):
+                    driver = driver_pool.acquire()
+                try:
+                    with context.metrics.timer("page_wait_seconds", mode="search"):
+                        req_m.open_search_page(keyword, target_website, parse_config, driver=driver)
+                    page_counts = parse_m.parse_product(driver, context, parse_config, selectors=None)
+                except Exception:
+                    # ===== Do not hand a broken browser to the next keyword =====
+                    driver_pool.discard(driver)
+                    raise
+                else:
+                    driver_pool.release(driver)
 
         # ===== Retry downloading failed images =====
-        img_pro.final_download_for_fail_img(all_pages_data, context, IMAGE_DOWNLOAD_CONFIG)
+        img_pro.final_download_for_fail_img(context, IMAGE_DOWNLOAD_CONFIG)
+
+        # ===== Report shared image session connection reuse =====
+        if context.async_engine is not None:
+            logger.info(f"Async image engine stats: {context.async_engine.stats()}")
+        else:
+            logger.info(f"Image HTTP client stats: {context.image_client.stats()}")
+        if context.rate_limiter is not None:
+            context.rate_limiter.record_metrics(context.metrics)
+            logger.info(f"Per-host request rates (process total): {context.rate_limiter.stats()}")
+        if context.image_store is not None:
+            logger.info(f"Image store stats (process total): {context.image_store.stats()}")
+        if context.http_cache is not None:
+            context.http_cache.save()
+            logger.info(f"HTTP cache stats (process total): {context.http_cache.stats()}")
+
+        # ===== Save extracted data and information =====
+        sto_m.save_info(context)
+
+        # ===== Log pipeline completion =====
+        logger.info(f"Data scraping and saving completed for keyword '{keyword}'.")
+    finally:
+        context.image_client.close()
+        if context.async_engine is not None:
+            context.async_engine.close()
+        context.checkpoint.close()
+        met.export_run_metrics(context.metrics, context.metrics_summary_path, context.run_name, METRICS_CONFIG)
+        flush_log_writers()
+        if context.run_log_handler is not None:
+            remove_file_handler(context.run_log_handler)
+
+
+def load_keywords(keywords_file) -> list[str]:
+    """
+    Read keywords from a text file, one per line.
+
+    Blank lines and lines starting with '#' are skipped; duplicates are dropped in order.
+
+    Args:
+        keywords_file: Path to the keyword file (UTF-8).
+
+    Returns:
+        list[str]: Keywords to crawl.
+    """
+    lines = Path(keywords_file).read_text(encoding="utf-8").splitlines()
+    keywords = [line.strip() for line in lines if line.strip() and not line.strip().startswith("#")]
+    return list(dict.fromkeys(keywords))
+
+
+def run_batch(keywords: list[str], target_website: str, config: dict, resume: bool = False) -> dict[str, str]:
+    """
+    Crawl several keywords concurrently.
+
+    Every keyword runs `run_pipeline` with its own Context (own output and log directories).
+    At most `max_workers` keywords run at the same time, and browsers needed for the
+    Selenium fallback come from one shared pool capped at `max_drivers`.
+
+    批量并发抓取多个关键词。
+    每个关键词使用独立的 Context（独立的输出和日志目录），同时运行的关键词数量受 `max_workers`
+    限制，Selenium 回退所需的浏览器来自共享的浏览器池（上限为 `max_drivers`）。
+
+    Args:
+        keywords: Keywords to crawl.
+        target_website: The base URL of the website.
+        config: Batch configuration (max_workers, max_drivers).
+        resume: Resume every keyword from its own checkpoint.
+
+    Returns:
+        dict[str, str]: Keyword -> "OK" or the error that stopped its run.
+    """
+    keywords = list(dict.fromkeys(keywords))
+    results = {}
+    driver_pool = req_m.DriverPool(config.get("max_drivers", 1))
+    logger.info(f"Batch run started: {len(keywords)} keywords, {config.get('max_workers')} workers")
+    try:
+        with ThreadPoolExecutor(max_workers=max(config.get("max_workers", 1), 1)) as executor:
+            futures = {
+                executor.submit(run_pipeline, keyword, target_website, driver_pool, True, resume): keyword
+                for keyword in keywords
+            }
+            for future in as_completed(futures):
+                keyword = futures[future]
+                try:
+                    future.result()
+                    results[keyword] = "OK"
+                except Exception as e:
+                    logger.error(f"Keyword '{keyword}' failed: {type(e).__name__} - {e}")
+                    results[keyword] = f"{type(e).__name__} - {e}"
+    finally:
+        driver_pool.close()
+
+    failed = [k for k, status in results.items() if status != "OK"]
+    logger.info(f"Batch run finished: {len(results) - len(failed)} succeeded, {len(failed)} failed {failed}")
+    rate_limiter = rate_lim.get_rate_limiter(RATE_LIMIT_CONFIG)
+    if rate_limiter is not None:
+        logger.info(f"Per-host request rates at batch end: {rate_limiter.stats()}")
+    return results
+
+
+def _run_shard(task: shard.ShardTask, target_website: str, resume: bool):
+    """Worker process entry: crawl one shard with its own Context."""
+    run_pipeline(task.keyword, target_website, batch=True, resume=resume,
+                 pages=(task.first_page, task.last_page), run_name=task.name)
+
+
+def run_sharded(keywords: list[str], target_website: str, config: dict, resume: bool = False) -> dict[str, str]:
+    """
+    Crawl keywords in worker processes, sharded by page range, and merge the results.
+
+    Every keyword's pages are cut into shards of `pages_per_shard` pages; `processes` worker
+    processes crawl one shard at a time, each with its own Context directories and logs, so
+    parsing, jieba and DataFrame work is spread over several interpreters instead of one GIL.
+    Once all shards have finished, their outputs are merged into `output/<merge_name>/` and a
+    single failure summary under `dev_logs/<merge_name>/`.
+
+    按页码范围分片，在多个工作进程中抓取关键词并合并结果。
+    每个关键词的结果页按 `pages_per_shard` 切分为分片，由 `processes` 个工作进程逐个抓取，
+    每个分片使用独立的 Context 目录和日志，解析、jieba 分词和 DataFrame 构建分散到多个解释器，
+    不再受单个 GIL 限制。全部分片结束后，输出合并到 `output/<merge_name>/`，
+    失败记录汇总到 `dev_logs/<merge_name>/`。
+
+    Args:
+        keywords: Keywords to crawl.
+        target_website: The base URL of the website.
+        config: Shard configuration (processes, pages_per_shard, start_method, merge_name).
+        resume: Resume every shard from its own checkpoint.
+
+    Returns:
+        dict[str, str]: Shard name -> "OK" or the error that stopped it.
+    """
+    tasks = shard.plan_shards(keywords, PARSE_PRODUCT_CONFIG["total_pages"], config.get("pages_per_shard", 5))
+    merge_name = config.get("merge_name", "merged")
+    _, merge_dev_log_dir = sto_m.run_dirs(merge_name)
+    mp_context = multiprocessing.get_context(config.get("start_method"))
+    processes = max(config.get("processes", 1), 1)
+    results = {}
+    logger.info(f"Sharded run started: {len(tasks)} shards of {len(dict.fromkeys(keywords))} keywords, "
+                f"{processes} processes ({mp_context.get_start_method()})")
+    with ProcessPoolExecutor(max_workers=processes, mp_context=mp_context, initializer=shard.init_worker,
+                             initargs=(merge_dev_log_dir / "workers", JIEBA_CONFIG)) as executor:
+        futures = {executor.submit(_run_shard, task, target_website, resume): task for task in tasks}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                future.result()
+                results[task.name] = "OK"
+            except Exception as e:
+                logger.error(f"Shard '{task.name}' failed: {type(e).__name__} - {e}")
+                results[task.name] = f"{type(e).__name__} - {e}"
+
+    failed = [name for name, status in results.items() if status != "OK"]
+    logger.info(f"Sharded run finished: {len(results) - len(failed)} shards succeeded, {len(failed)} failed {failed}")
+    shard.merge_shards(tasks, results, merge_name, OUTPUT_CONFIG)
+    return results
+
+
+def run_queue(action: str, keywords: list[str], config: dict, processes: int = None) -> dict:
+    """
+    Enqueue, work off, export or inspect the persistent job queue.
+
+    - "enqueue": add a page job for every keyword and result page
+    - "work": run crawl nodes until the queue is drained; with `processes`, that many nodes
+      run in worker processes on this machine, otherwise one node runs in this process
+    - "export": write the shared result store and the dead jobs under `output/<name>/`
+    - "status": log the job counts by kind and state
+
+    Further machines join a crawl by running "work" against the same queue and store.
+
+    操作持久化任务队列：添加任务、运行抓取节点直到队列清空、导出结果或查看任务状态。
+    其他机器对同一队列和结果库运行 "work" 即可加入抓取。
+
+    Args:
+        action: "enqueue", "work", "export" or "status".
+        keywords: Keywords to enqueue.
+        config: Queue configuration, e.g. QUEUE_CONFIG.
+        processes: Node processes started by "work".
+
+    Returns:
+        dict: Outcome of the action (job counts, node counts or export summary).
+    """
+    if action == "work":
+        if not processes:
+            return {"node": crawl_node.run_node(config)}
+        _, dev_log_dir = sto_m.run_dirs(config.get("name", "queue"))
+        mp_context = multiprocessing.get_context(SHARD_CONFIG.get("start_method"))
+        nodes = {}
+        with ProcessPoolExecutor(max_workers=processes, mp_context=mp_context, initializer=shard.init_worker,
+                                 initargs=(dev_log_dir / "workers", JIEBA_CONFIG)) as executor:
+            futures = [executor.submit(crawl_node.run_node, config) for _ in range(processes)]
+            for number, future in enumerate(as_completed(futures), start=1):
+                try:
+                    nodes[f"node_{number}"] = future.result()
+                except Exception as e:
+                    logger.error(f"Crawl node process failed: {type(e).__name__} - {e}")
+                    nodes[f"node_{number}"] = f"{type(e).__name__} - {e}"
+        return nodes
+
+    queue = jq.create_queue(config)
+    try:
+        if action == "enqueue":
+            crawl_node.enqueue_keywords(queue, keywords, PARSE_PRODUCT_CONFIG["total_pages"])
+        elif action == "export":
+            store = crawl_node.ResultStore(config.get("store_path", config.get("path")))
+            try:
+                return crawl_node.export_results(queue, store, config, OUTPUT_CONFIG)
+            finally:
+                store.close()
+        stats = queue.stats()
+        logger.info(f"Job queue {config.get('path')}: {stats}")
+        return stats
     finally:
-        # ===== Close browser =====
-        req_m.driver_quit(driver)
+        queue.close()
 
-    # ===== Save extracted data and information =====
-    sto_m.save_info(all_pages_data, context)
 
-    # ===== Log pipeline completion =====
-    logger.info("Data scraping and saving completed.")
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options for single and batch runs."""
+    parser = argparse.ArgumentParser(description="DangDang book scraper")
+    parser.add_argument("--keyword", default=SEARCH_KEYWORD, help="Keyword for a single run")
+    parser.add_argument("--keywords", nargs="+", help="Keywords for a batch run")
+    parser.add_argument("--keywords-file", help="Text file with one keyword per line for a batch run")
+    parser.add_argument("--workers", type=int, default=BATCH_CONFIG["max_workers"],
+                        help="Keywords crawled at the same time in a batch run")
+    parser.add_argument("--max-drivers", type=int, default=BATCH_CONFIG["max_drivers"],
+                        help="Max Chrome instances in the shared driver pool")
+    parser.add_argument("--processes", type=int, nargs="?", const=SHARD_CONFIG["processes"],
+                        help="Crawl in worker processes, sharding every keyword's pages; "
+                             "outputs are merged under output/merged/")
+    parser.add_argument("--pages-per-shard", type=int, default=SHARD_CONFIG["pages_per_shard"],
+                        help="Result pages per shard in a multi-process run")
+    parser.add_argument("--queue", choices=["enqueue", "work", "export", "status"],
+                        help="Use the persistent job queue: enqueue keywords, run a crawl node "
+                             "(--processes N: N nodes), export the results or show job counts")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run from its checkpoint under output/")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_CONFIG["mode"], choices=["cprofile", "sample"],
+                        help="Profile the run (all-thread stack sampling by default, or cProfile, which only "
+                             "covers the main thread; plus tracemalloc snapshots per page); reports go to "
+                             "dev_logs/profiles/")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    # Default parameters for local execution
-    run_pipeline(
-        keyword="AI",
-        target_website='https://www.dangdang.com/'
-    )
+    args = parse_args()
+    if JIEBA_CONFIG.get("prewarm"):
+        img_pro.warm_tokenizer(JIEBA_CONFIG)
+    batch_keywords = list(args.keywords or [])
+    if args.keywords_file:
+        batch_keywords += load_keywords(args.keywords_file)
+
+    with profiling.RunProfiler(args.profile, PROFILE_CONFIG) if args.profile else nullcontext():
+        if args.queue:
+            run_queue(args.queue, batch_keywords or [args.keyword], QUEUE_CONFIG, processes=args.processes)
+        elif args.processes:
+            run_sharded(batch_keywords or [args.keyword], TARGET_SITE,
+                        dict(SHARD_CONFIG, processes=args.processes, pages_per_shard=args.pages_per_shard),
+                        resume=args.resume)
+        elif batch_keywords:
+            run_batch(batch_keywords, TARGET_SITE,
+                      dict(BATCH_CONFIG, max_workers=args.workers, max_drivers=args.max_drivers),
+                      resume=args.resume)
+        else:
+            # Default parameters for local execution
+            run_pipeline(
+                keyword=args.keyword,
+                target_website=TARGET_SITE,
+                resume=args.resume
+            )
@@ -0,0 +1,286 @@
+"""
+metrics.py
+==========
+
+This module provides the run metrics registry (counters, gauges, histograms, timers).
+
+- Every Context owns a `MetricsRegistry`; pipeline stages record into it with `inc`,
+  `observe` and the `timer` context manager, and end-of-run state (e.g. per-host rate
+  limits) with `set_gauge`. Updates are thread-safe.
+- Histograms keep count, sum, min, max and fixed latency buckets, so percentiles can be
+  estimated without storing samples.
+- At the end of a run the registry is written as a JSON run summary next to the run's dev
+  logs and, if configured, as a Prometheus textfile for node_exporter's textfile collector.
+- `METRIC_HELP` lists every metric the pipeline records.
+
+本模块提供运行指标注册表（计数器、仪表、直方图、计时器）。
+
+- 每个 Context 持有一个 `MetricsRegistry`，各流程阶段通过 `inc`、`observe` 和 `timer` 上下文管理器记录指标，
+  运行结束时的状态（如按主机的限速）通过 `set_gauge` 记录，线程安全。
+- 直方图只保存次数、总和、最小/最大值和固定的延迟分桶，无需保留样本即可估算分位数。
+- 运行结束时写出 JSON 运行汇总（与该次运行的开发日志放在一起），并可按配置写出供 node_exporter
+  textfile collector 采集的 Prometheus 文本文件。
+- `METRIC_HELP` 列出流程记录的全部指标。
+"""
+
+# ===== Standard Library Modules =====
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# ===== Custom Project Modules =====
+from logger import logger
+
+# Prefix of every exported Prometheus metric
+METRIC_PREFIX = "dangdang_"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+METRIC_HELP = {
+    "run_seconds": "Wall time of the whole run",
+    "browser_startup_seconds": "Time to start (or borrow) a browser and open the search page",
+    "page_wait_seconds": "Time waiting for a result page (WebDriverWait or HTTP fetch)",
+    "page_bytes_total": "Bytes of result page HTML fetched over HTTP",
+    "item_extract_seconds": "Time to extract the fields of one product",
+    "items_parsed_total": "Products extracted from result pages",
+    "item_errors_total": "Products whose extraction raised",
+    "image_validate_seconds": "Latency of one cover validation request (request + streamed body)",
+    "image_download_seconds": "Latency of one second-pass cover download",
+    "image_bytes_total": "Cover image bytes received (including bodies reused after a 304)",
+    "image_retries_total": "Cover attempts repeated, by the reason the previous attempt failed",
+    "image_failures_total": "Covers left without a usable image, by stage and final reason",
+    "excel_write_seconds": "Time to export the Excel workbook",
+    "rate_limit_rate": "Current request rate allowed for a host (req/s, process-wide limiter)",
+    "rate_limit_paused_seconds": "Seconds a host is still paused for after a Retry-After",
+    "rate_limit_requests": "Requests paced by the limiter for a host (process total)",
+    "rate_limit_throttled": "Throttled responses (429 / 5xx / errors / slow) from a host (process total)",
+    "rate_limit_decreases": "Times a host's rate was cut (process total)",
+}
+
+
+def reason_label(reason: str) -> str:
+    """Reduce a failure reason to a low-cardinality label (drops exception messages and URLs)."""
+    return reason.split(" - ")[0].strip() or "unknown"
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 6)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Histogram:
+    """Count, sum, min, max and cumulative bucket counts of one labelled series."""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self, bounds: tuple):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * len(bounds)
+
+    def quantile(self, q: float, bounds: tuple) -> float | None:
+        """Estimate the q-quantile by linear interpolation inside its bucket (as Prometheus does)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        lower, below = 0.0, 0
+        for bound, cumulative in zip(bounds, self.buckets):
+            if cumulative >= rank and cumulative > below:
+                estimate = lower + (bound - lower) * (rank - below) / (cumulative - below)
+                return min(max(estimate, self.min), self.max)
+            lower, below = bound, cumulative
+        return self.max
+
+
+class MetricsRegistry:
+    """
+    Counters, gauges and histograms of one run.
+
+    Attributes:
+        buckets (tuple): Upper bounds of the histogram buckets (seconds).
+        const_labels (dict): Labels added to every exported series (e.g. the run name).
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, const_labels: dict = None):
+        """
+        Args:
+            buckets: Upper bounds of the histogram buckets.
+            const_labels: Labels added to every exported series.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.const_labels = dict(const_labels or {})
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        """Seconds since the registry was created (the start of the run)."""
+        return time.perf_counter() - self._started
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Add `amount` to a counter."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a gauge to its current value."""
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record one value (usually seconds) in a histogram."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(self.buckets)
+            histogram.count += 1
+            histogram.total += value
+            histogram.min = value if histogram.min is None else min(histogram.min, value)
+            histogram.max = value if histogram.max is None else max(histogram.max, value)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram.buckets[i] += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the wall time of the `with` block in a histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def summary(self) -> dict:
+        """JSON-ready snapshot: counters and gauges as values, histograms as count/sum/mean/min/max/p50/p95."""
+        with self._lock:
+            counters = {
+                f"{name}{_format_labels(labels)}": value
+                for (name, labels), value in sorted(self._counters.items())
+            }
+            gauges = {
+                f"{name}{_format_labels(labels)}": value
+                for (name, labels), value in sorted(self._gauges.items())
+            }
+            histograms = {
+                f"{name}{_format_labels(labels)}": {
+                    "count": h.count,
+                    "sum": round(h.total, 6),
+                    "mean": round(h.total / h.count, 6) if h.count else None,
+                    "min": _round(h.min),
+                    "max": _round(h.max),
+                    "p50": _round(h.quantile(0.5, self.buckets)),
+                    "p95": _round(h.quantile(0.95, self.buckets)),
+                }
+                for (name, labels), h in sorted(self._histograms.items())
+            }
+        return {
+            "labels": self.const_labels,
+            "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "elapsed_seconds": round(self.elapsed(), 3),
+            "counters": counters,
+            "gauges": gauges,
+            "histograms": histograms,
+        }
+
+    def to_prometheus(self) -> str:
+        """Render every series in the Prometheus text exposition format."""
+        const = _label_key(self.const_labels)
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted(self._histograms.items())
+            seen = set()
+            for metric_type, series in (("counter", counters), ("gauge", gauges)):
+                for (name, labels), value in series:
+                    full = METRIC_PREFIX + name
+                    if full not in seen:
+                        seen.add(full)
+                        lines.append(f"# HELP {full} {METRIC_HELP.get(name, name)}")
+                        lines.append(f"# TYPE {full} {metric_type}")
+                    lines.append(f"{full}{_format_labels(const + labels)} {value}")
+            for (name, labels), h in histograms:
+                full = METRIC_PREFIX + name
+                if full not in seen:
+                    seen.add(full)
+                    lines.append(f"# HELP {full} {METRIC_HELP.get(name, name)}")
+                    lines.append(f"# TYPE {full} histogram")
+                for bound, cumulative in zip(self.buckets, h.buckets):
+                    lines.append(f"{full}_bucket{_format_labels(const + labels + (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{full}_bucket{_format_labels(const + labels + (('le', '+Inf'),))} {h.count}")
+                lines.append(f"{full}_sum{_format_labels(const + labels)} {h.total}")
+                lines.append(f"{full}_count{_format_labels(const + labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_summary(self, path) -> Path:
+        """Write `summary()` as indented JSON."""
+        return _write_atomic(Path(path), json.dumps(self.summary(), ensure_ascii=False, indent=2))
+
+    def write_prometheus(self, textfile_dir, name: str) -> Path:
+        """Write `to_prometheus()` to `<textfile_dir>/<name>.prom` (renamed into place, as the collector expects)."""
+        safe_name = re.sub(r"[^0-9A-Za-z_-]", "_", name) or "default"
+        return _write_atomic(Path(textfile_dir) / f"{METRIC_PREFIX}{safe_name}.prom", self.to_prometheus())
+
+
+def _write_atomic(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def export_run_metrics(registry: MetricsRegistry, summary_path, run_name: str | None, config: dict):
+    """
+    Write the end-of-run exports selected in the configuration.
+
+    Args:
+        registry: Metrics of the run.
+        summary_path: Path of the JSON run summary.
+        run_name: Per-keyword run name, used for the Prometheus file name (None: "default").
+        config: Export configuration, e.g. METRICS_CONFIG.
+    """
+    registry.observe("run_seconds", registry.elapsed())
+    try:
+        if config.get("summary_json", True):
+            logger.info(f"Run metrics summary written: {registry.write_summary(summary_path)}")
+        textfile_dir = config.get("prometheus_textfile_dir")
+        if textfile_dir:
+            logger.info(f"Prometheus textfile written: {registry.write_prometheus(textfile_dir, run_name or 'default')}")
+    except OSError as e:
+        logger.error(f"Failed to export run metrics: {e}")
+
+
+# Catch-all for code paths called without a Context (ad-hoc scripts); never exported
+_unbound = MetricsRegistry()
+
+
+def metrics_for(context) -> MetricsRegistry:
+    """Return the context's registry, or a discarded one if the context has none."""
+    metrics = getattr(context, "metrics", None)
+    return metrics if metrics is not None else _unbound
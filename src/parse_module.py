@@ -4,21 +4,28 @@ parse_module.py
 
 This module encapsulates the product parsing functionality.
 - Extracts book information (title, price, author, cover image) from search result pages.
-- Handles image downloading through the image_process module.
+- Queues cover images to the image_process worker stage while pagination continues.
 - Supports multi-pages crawling and error logging.
-- Stores all parsed data in a structured list.
+- Can read each result page once (page_source + lxml) instead of one WebDriver call per field.
+- Can fetch result pages over plain HTTP (no browser) and parse them with the same selectors.
+- Streams parsed rows to the run's sink; only per-page row counts are kept in memory.
 
 本模块封装了商品解析功能。
 - 从搜索结果页面提取图书信息（标题、价格、作者、封面图）。
-- 通过 image_process 模块处理封面图下载。
+- 将封面图下载任务交给 image_process 的并发下载阶段，翻页不再等待下载。
 - 支持多页翻页抓取并记录解析错误。
-- 将所有解析数据存储在结构化列表中。
+- 可一次性读取页面源码并用 lxml 解析，避免逐字段调用 WebDriver。
+- 支持不启动浏览器、直接通过 HTTP 获取结果页，并使用相同的选择器解析。
+- 解析结果流式写入本次运行的 sink，内存中只保留每页的行数。
 """
 
 # ===== Standard Library Modules =====
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 # ===== Third-Party Library Modules =====
+from lxml import html as lxml_html
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -26,75 +33,149 @@ from selenium.webdriver.support import expected_conditions as EC
 # ===== Custom Project Modules =====
 from product_selectors import SELECTORS
 import image_process as img_pro
+import request_module as req_m
+import profiling
+from config import IMAGE_DOWNLOAD_CONFIG
 from logger import *
+from records import BookRecord
 
 
 def parse_product(driver, context, config, selectors=None):
     """
     Parses product information from search result pages.
 
+    Cover images are queued to an `img_pro.ImageDownloadStage` and processed in the
+    background; each page is streamed to the context's sink once its covers are done,
+    and all image jobs are joined before this function returns.
+
     Parameters:
         driver: Selenium WebDriver instance for browser interaction.
         context: Context object containing paths, logs, and temporary storage.
-        config: Configuration dictionary (total pages, wait time, etc.).
+        config: Configuration dictionary (total pages, wait time, etc.). With `start_page`
+            (shard runs) the pages before it are only paged through, not parsed.
         selectors: Optional dictionary of selectors; defaults to SELECTORS.
 
     Returns:
-        List of lists, where each sublist contains product data dictionaries for one page.
-        Each dictionary includes:
-            - "Title"
-            - "Price"
-            - "Author"
-            - "Cover_Img_Filename"
-            - "Cover_Img_Path"
+        dict[int, int]: Rows parsed per page, in page order. The rows themselves
+        (`BookRecord`s) are only held until their page is streamed to the sink.
     """
     if selectors is None:
         selectors = SELECTORS
 
-    # Create a container for storing all page data
-    all_pages_data = []
+    # Rows parsed per page; the rows go to the sink, not into memory
+    page_counts = {}
+    start_page = config.get("start_page", 1)
     total_pages = config.get("total_pages")
     wait_time = config.get("wait_time")
+    extract_mode = config.get("extract_mode", "webdriver")
+
+    image_stage = img_pro.ImageDownloadStage(context, IMAGE_DOWNLOAD_CONFIG)
+    try:
+        _parse_pages(driver, context, selectors, start_page, total_pages, wait_time, extract_mode, image_stage,
+                     page_counts)
+        # Fill image columns once all queued image jobs have finished
+        image_stage.join()
+    finally:
+        image_stage.shutdown()
+
+    return page_counts
+
+
+def extract_fields_webdriver(item, selectors: dict) -> tuple[str, str, str, str]:
+    """
+    Extract title, price, author and cover URL from a WebElement (one WebDriver call per field).
+
+    Parameters:
+        item: Selenium WebElement of one product container.
+        selectors: Dictionary of selectors.
+
+    Returns:
+        Tuple of (title, price, author, img_url).
+    """
+    title = item.find_element(By.XPATH, selectors["title"]).text.strip()
+    price = item.find_element(By.CLASS_NAME, selectors["price"]).text.strip()
+    author = item.find_element(By.XPATH, selectors["author"]).text.strip()
+    img_el = item.find_element(By.TAG_NAME, selectors["image"])
+    img_url = img_el.get_attribute('data-original') or img_el.get_attribute('src')
+    return title, price, author, img_url
+
+
+def extract_fields_html(item, selectors: dict) -> tuple[str, str, str, str]:
+    """
+    Extract title, price, author and cover URL from an lxml element, using the same selectors.
+
+    Parameters:
+        item: lxml element of one product container.
+        selectors: Dictionary of selectors.
+
+    Returns:
+        Tuple of (title, price, author, img_url).
+
+    Raises:
+        LookupError: If a required element is missing (mirrors WebDriver's NoSuchElementException).
+    """
+    def first(elements, name):
+        if not elements:
+            raise LookupError(f"Element not found for selector '{name}'")
+        return elements[0]
+
+    title = first(item.xpath(selectors["title"]), "title").text_content().strip()
+    price = first(item.find_class(selectors["price"]), "price").text_content().strip()
+    author = first(item.xpath(selectors["author"]), "author").text_content().strip()
+    img_el = first(list(item.iter(selectors["image"])), "image")
+    img_url = img_el.get('data-original') or img_el.get('src')
+    return title, price, author, img_url
+
+
+def html_product_items(page_html: str | bytes, selectors: dict) -> list:
+    """
+    Parse a result page's HTML and return its product containers as lxml elements.
+
+    Parameters:
+        page_html: Full HTML of a search result page (str, or raw bytes so lxml can honour the page charset).
+        selectors: Dictionary of selectors.
+
+    Returns:
+        List of lxml elements matching selectors["product_container"].
+    """
+    if not page_html:
+        return []
+    return lxml_html.fromstring(page_html).xpath(selectors["product_container"])
+
 
+def _parse_pages(driver, context, selectors, start_page, total_pages, wait_time, extract_mode, image_stage,
+                 page_counts):
+    """Walk the result pages, extract rows from `start_page` on and queue their cover images."""
     # Loop through pages
     for page in range(1, total_pages + 1):
-        page_data = []
         logger.info(f"Scraping page {page}...")
 
         # Wait until all product containers are loaded
+        start = time.perf_counter()
         WebDriverWait(driver, wait_time).until(
             EC.presence_of_all_elements_located((By.XPATH, selectors["product_container"]))
         )
-        items = driver.find_elements(By.XPATH, selectors["product_container"])
+        waited = time.perf_counter() - start
+        context.metrics.observe("page_wait_seconds", waited, mode="webdriver")
+        logger.info(f"Page {page} loaded in {waited:.2f}s")
 
-        for idx, item in enumerate(items, start=1):
-            try:
-                # ===== Extract title, price, author, cover image URL =====
-                title = item.find_element(By.XPATH, selectors["title"]).text.strip()
-                price = item.find_element(By.CLASS_NAME, selectors["price"]).text.strip()
-                author = item.find_element(By.XPATH, selectors["author"]).text.strip()
-                img_el = item.find_element(By.TAG_NAME, selectors["image"])
-                img_url = img_el.get_attribute('data-original') or img_el.get_attribute('src')
-
-                # ===== Download cover image =====
-                img_status, img_path = img_pro.process_image(img_url, title, price, author, page, idx, context)
-
-                page_data.append({
-                    "Title": title,
-                    "Price": price,
-                    "Author": author,
-                    "Cover_Img_Filename": img_status,
-                    "Cover_Img_Path": img_path
-                })
-
-            except Exception:
-                error_msg = traceback.format_exc()
-                logger.error(f"Failed to parse book {idx} on page {page}: {error_msg}")
-                log_to_text(f"{datetime.now()} - Page {page} Book {idx}: {error_msg}\n", context.parsing_error_log_path)
-                continue
-
-        # Add current page data to overall data
-        all_pages_data.append(page_data)
+        if page < start_page:
+            # Before this shard's page range: only move on to the next page
+            logger.info(f"Page {page} skipped (pages before {start_page} belong to another shard)")
+        else:
+            restored = _restore_page(page, context, image_stage)
+            if restored is not None:
+                # Finished in an earlier run: its rows are streamed again, then move on to the next page
+                page_counts[page] = restored
+            elif extract_mode == "page_source":
+                # One round trip for the whole page, then parse in-process
+                items = html_product_items(driver.page_source, selectors)
+                page_counts[page] = _parse_page_items(items, extract_fields_html, page, context, selectors, image_stage)
+            else:
+                items = driver.find_elements(By.XPATH, selectors["product_container"])
+                page_counts[page] = _parse_page_items(items, extract_fields_webdriver, page, context, selectors,
+                                                      image_stage)
+            profiling.page_snapshot(page)
 
         # Navigate to next page
         if page < total_pages:
@@ -105,4 +186,115 @@ def parse_product(driver, context, config, selectors=None):
                 logger.error("Next page button not found, ending pagination early.")
                 break
 
-    return all_pages_data
+
+def _parse_page_items(items, extract_fields, page, context, selectors, image_stage) -> int:
+    """Extract the rows of one page, queue their cover images and checkpoint the page; returns the row count."""
+    checkpoint_items = []
+    metrics = context.metrics
+    for idx, item in enumerate(items, start=1):
+        try:
+            # ===== Extract title, price, author, cover image URL =====
+            start = time.perf_counter()
+            title, price, author, img_url = extract_fields(item, selectors)
+            metrics.observe("item_extract_seconds", time.perf_counter() - start)
+            metrics.inc("items_parsed_total")
+
+            record = BookRecord(title, price, author, page, idx)
+            checkpoint_items.append((img_url, record))
+
+            # ===== Queue cover image download =====
+            image_stage.submit(record, img_url)
+
+        except Exception:
+            metrics.inc("item_errors_total")
+            error_msg = traceback.format_exc()
+            logger.error(f"Failed to parse book {idx} on page {page}: {error_msg}")
+            log_to_text(f"{datetime.now()} - Page {page} Book {idx}: {error_msg}\n", context.parsing_error_log_path)
+            continue
+
+    if context.checkpoint is not None:
+        context.checkpoint.record_page(page, checkpoint_items)
+    # All covers of this page are queued; its rows are streamed once they are done
+    image_stage.close_page(page)
+    return len(checkpoint_items)
+
+
+def _restore_page(page, context, image_stage) -> int | None:
+    """Restore a page finished by an earlier run (returns its row count); covers not done yet are queued again."""
+    if context.checkpoint is None:
+        return None
+    restored = context.checkpoint.restore_page(page)
+    if restored is None:
+        return None
+
+    for img_url, record, image_done in restored:
+        if image_done:
+            image_stage.add_ready(record)
+        else:
+            image_stage.submit(record, img_url)
+    image_stage.close_page(page)
+    logger.info(f"Page {page} restored from checkpoint ({len(restored)} items)")
+    return len(restored)
+
+
+def parse_product_http(keyword, context, config, fetch_config, selectors=None):
+    """
+    Parses product information from search result pages fetched without a browser.
+
+    Result page URLs are built directly, downloaded in parallel over a pooled HTTP session
+    and parsed in page order with the same selectors as the Selenium path. Pagination stops
+    at the first page that fails to download or contains no products. Pages finished by an
+    earlier run are restored from the checkpoint and not downloaded again.
+
+    Parameters:
+        keyword: The keyword to search for.
+        context: Context object containing paths, logs, and temporary storage.
+        config: Configuration dictionary (total pages, optional `start_page` of a shard run).
+        fetch_config: HTTP fetch configuration (search URL, page workers, session settings).
+        selectors: Optional dictionary of selectors; defaults to SELECTORS.
+
+    Returns:
+        Same as `parse_product`; empty if the first requested page yields no products.
+    """
+    if selectors is None:
+        selectors = SELECTORS
+
+    page_counts = {}
+    start_page = config.get("start_page", 1)
+    total_pages = config.get("total_pages")
+    urls = {
+        page: req_m.build_search_url(keyword, page, fetch_config) for page in range(start_page, total_pages + 1)
+    }
+    done_pages = {page for page in urls if context.checkpoint is not None and context.checkpoint.is_page_done(page)}
+
+    page_client = img_pro.ImageHttpClient(fetch_config, context.rate_limiter)
+    image_stage = img_pro.ImageDownloadStage(context, IMAGE_DOWNLOAD_CONFIG)
+    try:
+        with ThreadPoolExecutor(max_workers=max(fetch_config.get("page_workers", 1), 1)) as pool:
+            pages_html = {
+                page: pool.submit(req_m.fetch_search_page, url, page_client, fetch_config)
+                for page, url in urls.items() if page not in done_pages
+            }
+            for page in urls:
+                if page in done_pages:
+                    page_counts[page] = _restore_page(page, context, image_stage)
+                    continue
+                logger.info(f"Scraping page {page} (HTTP)...")
+                with context.metrics.timer("page_wait_seconds", mode="http"):
+                    page_html = pages_html[page].result()
+                context.metrics.inc("page_bytes_total", len(page_html or b""))
+                items = html_product_items(page_html, selectors)
+                if not items:
+                    logger.error(f"No products found on page {page} ({urls[page]}), ending pagination early.")
+                    for future in pages_html.values():
+                        future.cancel()
+                    break
+                page_counts[page] = _parse_page_items(items, extract_fields_html, page, context, selectors, image_stage)
+                profiling.page_snapshot(page)
+        image_stage.join()
+    finally:
+        image_stage.shutdown()
+        logger.info(f"Search page HTTP client stats: {page_client.stats()}")
+        page_client.close()
+
+    return page_counts
@@ -0,0 +1,222 @@
+"""
+profiling.py
+============
+
+This module provides the `--profile` hook of the main entry point.
+
+- `RunProfiler` wraps a run in cProfile (calling thread, `.prof` for pstats / snakeviz) or in
+  a sampling profiler that records the stacks of every thread (image workers and the asyncio
+  loop included) as folded stacks for flamegraph.pl / speedscope.
+- Time is also summed per component (WebDriver, jieba, HTTP, pandas/Excel, lxml, waiting),
+  so a slow run shows at a glance where it went.
+- tracemalloc snapshots are taken at page boundaries (`page_snapshot`, called by the parsers)
+  and written as a top-N allocation report with the growth since the previous page.
+- Everything goes to `dev_logs/profiles/<timestamp>/`.
+
+本模块提供主入口 `--profile` 选项使用的性能分析功能。
+
+- `RunProfiler` 用 cProfile（仅调用线程，生成可用 pstats / snakeviz 查看的 `.prof`）或采样分析器
+  （记录所有线程的调用栈，包括图片工作线程和 asyncio 事件循环，输出 flamegraph.pl / speedscope 可读的折叠栈）包裹一次运行。
+- 按组件（WebDriver、jieba、HTTP、pandas/Excel、lxml、等待）汇总耗时，慢运行的耗时去向一目了然。
+- 在翻页边界（解析模块调用 `page_snapshot`）拍摄 tracemalloc 快照，输出前 N 条内存分配报告及与上一页相比的增长。
+- 所有文件写入 `dev_logs/profiles/<时间戳>/`。
+"""
+
+# ===== Standard Library Modules =====
+import collections
+import cProfile
+import io
+import pstats
+import re
+import sys
+import threading
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# ===== Custom Project Modules =====
+from logger import logger
+
+# Path fragments and builtin names that attribute time to a component (first match wins)
+COMPONENTS = [
+    ("webdriver", ("selenium",)),
+    ("jieba", ("jieba",)),
+    ("pandas/excel", ("pandas", "openpyxl", "pyarrow", "numpy", "xlsxwriter")),
+    ("lxml", ("lxml",)),
+    ("http", ("requests", "urllib3", "aiohttp", "http/client", "http\\client", "ssl", "socket")),
+    ("waiting", ("lock", "sleep", "select", "poll", "wait", "Condition", "Event")),
+]
+
+_active = None
+
+
+def component_of(filename: str, function: str = "") -> str:
+    """Component a frame belongs to, from its file path (or the builtin's name)."""
+    text = f"{filename} {function}"
+    for component, markers in COMPONENTS:
+        if any(marker in text for marker in markers):
+            return component
+    return "other"
+
+
+class StackSampler(threading.Thread):
+    """Daemon thread that samples the stacks of all other threads at a fixed interval."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.leaf_components = collections.Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: re.sub(r"_\d+$", "", thread.name) for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                leaf = frame
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+                self.leaf_components[component_of(leaf.f_code.co_filename, leaf.f_code.co_name)] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class RunProfiler:
+    """
+    Context manager that profiles one run and writes its reports on exit.
+
+    Attributes:
+        mode (str): "cprofile" or "sample".
+        out_dir (Path): Report directory.
+    """
+
+    def __init__(self, mode: str, config: dict):
+        """
+        Args:
+            mode: "cprofile" (deterministic, calling thread) or "sample" (all threads).
+            config: Profiling configuration, e.g. PROFILE_CONFIG.
+        """
+        self.mode = mode
+        self.top_n = config.get("top_n", 30)
+        self.sample_interval = config.get("sample_interval", 0.005)
+        self.trace_memory = config.get("tracemalloc", True)
+        self.trace_frames = config.get("tracemalloc_frames", 1)
+        out_dir = Path(config.get("output_dir", "dev_logs/profiles"))
+        if not out_dir.is_absolute():
+            out_dir = Path(__file__).resolve().parent.parent / out_dir
+        self.out_dir = out_dir / datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._profile = None
+        self._sampler = None
+        self._snapshots = []
+
+    def __enter__(self):
+        global _active
+        if self.trace_memory:
+            tracemalloc.start(self.trace_frames)
+            self._snapshots.append(("start", tracemalloc.take_snapshot()))
+        if self.mode == "sample":
+            self._sampler = StackSampler(self.sample_interval)
+            self._sampler.start()
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        _active = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _active
+        _active = None
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        if self.trace_memory:
+            self._snapshots.append(("end", tracemalloc.take_snapshot()))
+            tracemalloc.stop()
+        try:
+            self.write_reports()
+        except OSError as e:
+            logger.error(f"Failed to write profile reports: {e}")
+        return False
+
+    def snapshot(self, label: str):
+        """Take a tracemalloc snapshot (no-op when memory tracing is off)."""
+        if self.trace_memory and tracemalloc.is_tracing():
+            self._snapshots.append((label, tracemalloc.take_snapshot()))
+
+    def write_reports(self):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        if self._profile is not None:
+            self._write_cprofile()
+        if self._sampler is not None:
+            self._write_samples()
+        if self._snapshots:
+            self._write_allocations()
+        logger.info(f"Profile reports written to {self.out_dir}")
+
+    def _write_cprofile(self):
+        self._profile.dump_stats(self.out_dir / "run.prof")
+        stats = pstats.Stats(self._profile)
+        components = collections.Counter()
+        for (filename, _, function), (_, _, tottime, _, _) in stats.stats.items():
+            components[component_of(filename, function)] += tottime
+        buffer = io.StringIO()
+        buffer.write(_component_table("Time by component (own time, calling thread)", components, "s"))
+        for sort_key in ("cumulative", "tottime"):
+            buffer.write(f"\n===== Top {self.top_n} by {sort_key} =====\n")
+            pstats.Stats(self._profile, stream=buffer).sort_stats(sort_key).print_stats(self.top_n)
+        (self.out_dir / "run_stats.txt").write_text(buffer.getvalue(), encoding="utf-8")
+
+    def _write_samples(self):
+        sampler = self._sampler
+        with (self.out_dir / "stacks.folded").open("w", encoding="utf-8") as f:
+            for stack, count in sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        lines = [_component_table("Samples by component (leaf frame, all threads)", sampler.leaf_components, "")]
+        lines.append(f"\n===== Top {self.top_n} stacks =====\n")
+        for stack, count in sampler.stacks.most_common(self.top_n):
+            lines.append(f"{count:>8}  {stack}\n")
+        (self.out_dir / "samples.txt").write_text("".join(lines), encoding="utf-8")
+
+    def _write_allocations(self):
+        lines = []
+        previous = None
+        for label, snapshot in self._snapshots:
+            snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+            total = sum(stat.size for stat in snapshot.statistics("filename"))
+            lines.append(f"===== {label}: {total / 1024 / 1024:.1f} MB traced =====\n")
+            for stat in snapshot.statistics("lineno")[:self.top_n]:
+                lines.append(f"{stat}\n")
+            if previous is not None:
+                lines.append("--- growth since previous snapshot ---\n")
+                for stat in snapshot.compare_to(previous, "lineno")[:self.top_n]:
+                    lines.append(f"{stat}\n")
+            lines.append("\n")
+            previous = snapshot
+        (self.out_dir / "allocations.txt").write_text("".join(lines), encoding="utf-8")
+
+
+def _component_table(title: str, totals: collections.Counter, unit: str) -> str:
+    grand_total = sum(totals.values()) or 1
+    lines = [f"===== {title} =====\n"]
+    for component, value in totals.most_common():
+        amount = f"{value:.3f}{unit}" if unit else f"{value:.0f}"
+        lines.append(f"{component:<14}{amount:>12}  {value / grand_total:>6.1%}\n")
+    return "".join(lines)
+
+
+def page_snapshot(page: int):
+    """Take a tracemalloc snapshot at a page boundary if a run is being profiled."""
+    profiler = _active
+    if profiler is not None:
+        profiler.snapshot(f"after page {page}")
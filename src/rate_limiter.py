@@ -0,0 +1,207 @@
+"""
+rate_limiter.py
+===============
+
+This module provides a per-host adaptive rate limiter shared by page fetching and image downloading.
+
+- Every host gets a token bucket; a request waits for a token before it is sent.
+- Bucket rates follow AIMD: each successful response raises the rate a little (additive
+  increase), while 429 / 5xx responses, connection errors and slow responses cut it by a
+  factor (multiplicative decrease). Throughput climbs as long as the server keeps up and
+  backs off as soon as it pushes back.
+- A Retry-After header on a throttled response pauses the host for that long.
+- Waiting is blocking for thread callers (`acquire`) and non-blocking for asyncio callers
+  (`acquire_async`).
+- Current rates, pauses and throttle counters are recorded as gauges in the run metrics
+  (JSON summary and Prometheus textfile).
+
+本模块提供按主机自适应的限速器，由结果页抓取和图片下载共享。
+
+- 每个主机对应一个令牌桶，请求发送前需先获取令牌。
+- 速率按 AIMD 调整：每次成功响应小幅提高速率（加性增），遇到 429 / 5xx、连接错误或响应过慢时
+  按比例降低速率（乘性减）。服务器能承受时吞吐持续上升，一旦出现限流迹象立即回退。
+- 限流响应带有 Retry-After 头时，该主机暂停相应时长。
+- 线程调用方（`acquire`）阻塞等待，asyncio 调用方（`acquire_async`）非阻塞等待。
+- 当前速率、暂停时长和限流统计以仪表形式写入运行指标（JSON 汇总和 Prometheus 文本文件）。
+"""
+
+# ===== Standard Library Modules =====
+import asyncio
+import threading
+import time
+from urllib.parse import urlsplit
+
+# ===== Custom Project Modules =====
+from logger import logger
+
+
+class _HostBucket:
+    """Token bucket and AIMD state of one host."""
+
+    __slots__ = ("rate", "tokens", "updated", "paused_until", "last_decrease",
+                 "requests", "throttled", "decreases")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.decreases = 0
+
+
+class HostRateLimiter:
+    """
+    Per-host token buckets with AIMD rate adjustment.
+
+    Attributes:
+        initial_rate (float): Requests per second a new host starts with.
+        min_rate (float): Lower bound of a host's rate.
+        max_rate (float): Upper bound of a host's rate.
+        burst (float): Bucket capacity (requests that may be sent back to back).
+    """
+
+    def __init__(self, config: dict):
+        """
+        Args:
+            config: Rate limit configuration, e.g. RATE_LIMIT_CONFIG.
+        """
+        self.initial_rate = config.get("initial_rate", 5.0)
+        self.min_rate = config.get("min_rate", 0.5)
+        self.max_rate = config.get("max_rate", 50.0)
+        self.burst = max(config.get("burst", 1), 1)
+        self.increase_step = config.get("increase_step", 1.0)
+        self.decrease_factor = config.get("decrease_factor", 0.5)
+        self.latency_threshold = config.get("latency_threshold", 0)
+        self.cooldown = config.get("cooldown", 1.0)
+        self.throttle_statuses = set(config.get("throttle_statuses", [429, 500, 502, 503, 504]))
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlsplit(url).netloc
+
+    def _bucket(self, host: str) -> _HostBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _HostBucket(self.initial_rate, self.burst)
+        return bucket
+
+    def _reserve(self, url: str) -> float:
+        """Take a token for the URL's host and return how long to wait before sending."""
+        with self._lock:
+            bucket = self._bucket(self.host_of(url))
+            now = time.monotonic()
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+            # Tokens may go negative: later callers queue up behind earlier reservations
+            bucket.tokens -= 1
+            bucket.requests += 1
+            return max(-bucket.tokens / bucket.rate, bucket.paused_until - now, 0.0)
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to the URL's host may be sent; returns the time waited."""
+        wait = self._reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        """Non-blocking `acquire` for coroutines running on an event loop."""
+        wait = self._reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def observe(self, url: str, status: int | None, latency: float, retry_after: str | None = None):
+        """
+        Adjust the host's rate from the outcome of one request.
+
+        Args:
+            url: Request URL.
+            status: HTTP status, or None if the request failed without a response.
+            latency: Seconds until the response headers arrived.
+            retry_after: Retry-After header of the response, if any.
+        """
+        congested = status is None or status in self.throttle_statuses \
+            or (self.latency_threshold and latency > self.latency_threshold)
+        host = self.host_of(url)
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+            if not congested:
+                # Additive increase: about `increase_step` req/s more per second of successful traffic
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase_step / max(bucket.rate, 1.0))
+                return
+
+            bucket.throttled += 1
+            pause = _parse_retry_after(retry_after)
+            if pause:
+                bucket.paused_until = max(bucket.paused_until, now + pause)
+            # Multiplicative decrease, once per cooldown so a burst of failures does not collapse the rate
+            if now - bucket.last_decrease < self.cooldown:
+                return
+            bucket.last_decrease = now
+            bucket.decreases += 1
+            old_rate = bucket.rate
+            new_rate = bucket.rate = max(self.min_rate, bucket.rate * self.decrease_factor)
+        logger.warning(f"Rate limit for {host} lowered {old_rate:.2f} -> {new_rate:.2f} req/s "
+                       f"(status {status}, {latency:.2f}s)")
+
+    def stats(self) -> dict:
+        """Return the current rate, remaining Retry-After pause and counters of every host."""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                host: {
+                    "rate": round(bucket.rate, 2),
+                    "paused_seconds": round(max(bucket.paused_until - now, 0.0), 2),
+                    "requests": bucket.requests,
+                    "throttled": bucket.throttled,
+                    "decreases": bucket.decreases
+                }
+                for host, bucket in self._buckets.items()
+            }
+
+    def record_metrics(self, registry):
+        """Set the `rate_limit_*` gauges of a run's `MetricsRegistry` from the current host states."""
+        for host, host_stats in self.stats().items():
+            for key, value in host_stats.items():
+                registry.set_gauge(f"rate_limit_{key}", value, host=host)
+
+
+def _parse_retry_after(value: str | None) -> float:
+    """Seconds from a Retry-After header (the HTTP-date form is ignored)."""
+    if not value:
+        return 0.0
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return 0.0
+
+
+# One limiter per process: every run talks to the same hosts from the same address
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter(config: dict) -> HostRateLimiter | None:
+    """
+    Return the shared rate limiter, creating it on first use.
+
+    Args:
+        config: Rate limit configuration, e.g. RATE_LIMIT_CONFIG.
+
+    Returns:
+        HostRateLimiter | None: Shared limiter, or None if rate limiting is disabled.
+    """
+    global _limiter
+    if not config.get("enabled"):
+        return None
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = HostRateLimiter(config)
+        return _limiter
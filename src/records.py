@@ -0,0 +1,136 @@
+"""
+records.py
+==========
+
+This module defines the compact record types held in memory during a crawl.
+
+- `BookRecord`: one scraped product row (title, price, author, position, cover image columns).
+- `ImageFailure`: one entry of the validation / download failure lists on the Context.
+
+Both are `__slots__` dataclasses, so a record costs a fixed set of attribute slots instead of
+a per-row dict. Conversion to the dict / column layout (`to_row`, `to_dict`) only happens at
+the sink, the Excel export and the JSON failure logs. Tracebacks stored in failures are cut
+to their last lines and interned, so identical errors share one string.
+
+本模块定义抓取过程中驻留内存的紧凑记录类型。
+
+- `BookRecord`：单条商品数据（标题、价格、作者、页码位置、封面图字段）。
+- `ImageFailure`：Context 中校验 / 下载失败列表的单条记录。
+
+两者均为带 `__slots__` 的数据类，每条记录只占固定的属性槽位，而不是每行一个字典。
+仅在写入 sink、导出 Excel 和写 JSON 失败日志时才转换为字典 / 列格式（`to_row`、`to_dict`）。
+失败记录中的异常堆栈只保留末尾部分并做字符串驻留，相同错误共享同一个字符串。
+"""
+
+# ===== Standard Library Modules =====
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+# Longest traceback tail kept in a failure record (the end holds the exception itself)
+MAX_TRACEBACK_CHARS = 2000
+
+
+def compact_traceback(error_msg: str | None) -> str | None:
+    """Keep only the tail of a traceback and intern it."""
+    if error_msg is None:
+        return None
+    if len(error_msg) > MAX_TRACEBACK_CHARS:
+        error_msg = "..." + error_msg[-MAX_TRACEBACK_CHARS:]
+    return sys.intern(error_msg)
+
+
+@dataclass(slots=True)
+class BookRecord:
+    """One scraped product row.
+
+    Attributes:
+        title: Product title.
+        price: Product price text.
+        author: Product author text.
+        page: Result page number.
+        idx: 1-based position on the page.
+        cover_img_filename: Saved cover file name, or a status such as "No Image or Placeholder".
+        cover_img_path: Saved cover path, or "No Image".
+    """
+    title: str
+    price: str
+    author: str
+    page: int = 0
+    idx: int = 0
+    cover_img_filename: str | None = None
+    cover_img_path: Path | str | None = None
+
+    def to_row(self) -> dict:
+        """Column layout used by the sinks and the Excel export."""
+        return {
+            "Page": self.page,
+            "Index": self.idx,
+            "Title": self.title,
+            "Price": self.price,
+            "Author": self.author,
+            "Cover_Img_Filename": self.cover_img_filename,
+            "Cover_Img_Path": self.cover_img_path
+        }
+
+    def checkpoint_row(self) -> dict:
+        """Product fields written to the crawl checkpoint (image columns are recorded separately)."""
+        return {"Title": self.title, "Price": self.price, "Author": self.author}
+
+    @classmethod
+    def from_checkpoint_row(cls, row: dict, page: int, idx: int) -> "BookRecord":
+        """Rebuild a record from `checkpoint_row` output."""
+        return cls(row["Title"], row["Price"], row["Author"], page, idx)
+
+
+@dataclass(slots=True)
+class ImageFailure:
+    """One image that failed validation or download.
+
+    Validation failures leave the download fields (page, idx, img_path, error_msg,
+    retry_success) unset; unset fields are left out of `to_dict`.
+
+    Attributes:
+        title: Product title.
+        price: Product price text.
+        author: Product author text.
+        img_url: Normalized image URL.
+        fail_reason: Last failure reason.
+        retry_count: Attempts made after the first one.
+        page: Result page number.
+        idx: Position on the page.
+        img_path: Local path the image should be saved to.
+        error_msg: Traceback or error message (tail only, interned).
+        retry_success: Whether a second-pass download succeeded.
+    """
+    title: str
+    price: str
+    author: str
+    img_url: str
+    fail_reason: str
+    retry_count: int = 0
+    page: int | None = None
+    idx: int | None = None
+    img_path: str | None = None
+    error_msg: str | None = None
+    retry_success: bool | None = None
+
+    def __post_init__(self):
+        self.error_msg = compact_traceback(self.error_msg)
+
+    def to_dict(self) -> dict:
+        """Key layout of the failure JSON logs and the 'Failure Summary' sheet."""
+        fields = {
+            "Title": self.title,
+            "Price": self.price,
+            "Author": self.author,
+            "Page": self.page,
+            "Index": self.idx,
+            "Img_URL": self.img_url,
+            "Img_Path": self.img_path,
+            "Fail_Reason": self.fail_reason,
+            "Error_MSG": self.error_msg,
+            "Retry_Count": self.retry_count,
+            "Retry_Success": self.retry_success
+        }
+        return {key: value for key, value in fields.items() if value is not None}
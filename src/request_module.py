@@ -4,20 +4,33 @@ request_module.py
 
 This module encapsulates browser operations using Selenium to open DangDang search
 pages, input search keywords, wait for the results to load, and handle browser closure.
+It also provides a browserless mode that requests the search result pages directly.
 
 It provides:
+0. `create_driver`: Start Chrome with the configured ("fast" or "default") profile.
 1. `open_search_page`: Open the target website, input a keyword, wait for the product list to load.
 2. `driver_quit`: Safely quit the Selenium WebDriver session.
+   `DriverPool`: Reusable, size-capped pool of drivers for concurrent keyword runs.
+3. `build_search_url`: Build the search result URL for a keyword and page number.
+4. `fetch_search_page`: Download one search result page over a pooled HTTP session.
 
 本模块封装了使用 Selenium 的浏览器操作，用于打开当当搜索页面、输入搜索关键词、
 等待搜索结果加载，并处理浏览器关闭。
+同时提供无浏览器模式，直接请求搜索结果页。
 
 提供的功能：
+0. `create_driver`：按配置（"fast" 或 "default"）启动 Chrome。
 1. `open_search_page`：打开目标网站，输入搜索关键词，并等待商品列表加载完成。
 2. `driver_quit`：安全退出 Selenium WebDriver 会话。
+   `DriverPool`：可复用、数量受限的浏览器池，用于并发抓取多个关键词。
+3. `build_search_url`：根据关键词和页码构造搜索结果页 URL。
+4. `fetch_search_page`：通过连接池 HTTP 会话下载单个搜索结果页。
 """
 
 # ===== Standard Library Modules =====
+import threading
+import time
+from urllib.parse import urlencode
 
 # ===== Third-Party Libraries =====
 from selenium import webdriver
@@ -29,8 +42,78 @@ from selenium.webdriver.support import expected_conditions as EC
 from product_selectors import SELECTORS
 
 # ===== Custom Project Modules =====
+from config import DRIVER_CONFIG
+from logger import logger
 
-def open_search_page(keyword: str, target_website: str, config: dict, selectors: dict = None) -> webdriver.Chrome:
+# Headers sent with browserless result page requests
+SEARCH_PAGE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0',
+    'Referer': 'https://www.dangdang.com'
+}
+
+def build_chrome_options(driver_config: dict) -> Options:
+    """
+    Build Chrome options for the configured driver profile.
+
+    The "fast" profile runs headless, uses the 'eager' page load strategy, blocks image
+    loading through content settings and can reuse a user-data dir. The "default" profile
+    keeps the original maximized, fully loading browser.
+
+    Parameters:
+    - driver_config (dict): Driver configuration, see DRIVER_CONFIG.
+
+    Returns:
+    - Options: Chrome options.
+    """
+    options = Options()
+    if driver_config.get("profile") != "fast":
+        options.add_argument('--start-maximized')
+        return options
+
+    if driver_config.get("headless"):
+        options.add_argument('--headless=new')
+        options.add_argument('--window-size=1920,1080')
+    options.page_load_strategy = driver_config.get("page_load_strategy", "normal")
+    if driver_config.get("block_resources"):
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+        })
+    if driver_config.get("user_data_dir"):
+        options.add_argument(f'--user-data-dir={driver_config["user_data_dir"]}')
+    return options
+
+
+def create_driver(driver_config: dict = None) -> webdriver.Chrome:
+    """
+    Start a Chrome WebDriver with the configured profile and log the startup time.
+
+    With the "fast" profile and block_resources enabled, stylesheets, fonts and images are
+    also blocked by URL pattern through the Chrome DevTools Protocol.
+
+    Parameters:
+    - driver_config (dict, optional): Driver configuration; defaults to DRIVER_CONFIG.
+
+    Returns:
+    - driver (webdriver.Chrome): Started Chrome WebDriver instance.
+    """
+    if driver_config is None:
+        driver_config = DRIVER_CONFIG
+    profile = driver_config.get("profile")
+
+    start = time.perf_counter()
+    driver = webdriver.Chrome(options=build_chrome_options(driver_config))
+    if profile == "fast" and driver_config.get("block_resources"):
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": driver_config.get("blocked_url_patterns", [])})
+        except Exception as e:
+            logger.error(f"CDP URL blocking unavailable, continuing without it: {e}")
+    logger.info(f"Chrome started with '{profile}' profile in {time.perf_counter() - start:.2f}s")
+    return driver
+
+
+def open_search_page(keyword: str, target_website: str, config: dict, selectors: dict = None,
+                     driver_config: dict = None, driver: webdriver.Chrome = None) -> webdriver.Chrome:
     """
     Open the search page on DangDang and input the search keyword.
 
@@ -39,6 +122,8 @@ def open_search_page(keyword: str, target_website: str, config: dict, selectors:
     - target_website (str): The base URL of the website.
     - config (dict): Configuration dictionary with 'wait_time' key.
     - selectors (dict, optional): Dictionary of selectors for locating elements.
+    - driver_config (dict, optional): Chrome profile configuration; defaults to DRIVER_CONFIG.
+    - driver (webdriver.Chrome, optional): Existing driver to reuse (e.g. from a DriverPool).
 
     Returns:
     - driver (webdriver.Chrome): Selenium Chrome WebDriver instance with the search results loaded.
@@ -48,12 +133,13 @@ def open_search_page(keyword: str, target_website: str, config: dict, selectors:
         selectors = SELECTORS
 
     # Initialize Chrome browser
-    options = Options()
-    options.add_argument('--start-maximized')
-    driver = webdriver.Chrome(options=options)
+    if driver is None:
+        driver = create_driver(driver_config)
 
     # Navigate to the target website
+    start = time.perf_counter()
     driver.get(target_website)
+    logger.info(f"Home page loaded in {time.perf_counter() - start:.2f}s")
 
     # Wait for the search input box to appear (ensure page is loaded)
     WebDriverWait(driver, wait_time).until(
@@ -66,9 +152,11 @@ def open_search_page(keyword: str, target_website: str, config: dict, selectors:
     search_input.send_keys(Keys.ENTER)                 # Press Enter to search
 
     # Wait until product containers appear in the search results
+    start = time.perf_counter()
     WebDriverWait(driver, wait_time).until(
         EC.presence_of_all_elements_located((By.XPATH, selectors["product_container"]))
     )
+    logger.info(f"Search results loaded in {time.perf_counter() - start:.2f}s")
 
     return driver
 
@@ -80,3 +168,134 @@ def driver_quit(driver: webdriver.Chrome) -> None:
     - driver (webdriver.Chrome): The Selenium WebDriver instance to quit.
     """
     driver.quit()
+
+
+class DriverPool:
+    """
+    Reusable pool of Chrome drivers shared by concurrent keyword runs.
+
+    Drivers are created lazily, up to `max_size`; `acquire` blocks while all of them are
+    in use, which caps the number of browsers running at once. Drivers are returned with
+    `release`; `discard` quits a broken one and frees its slot, waking a waiting `acquire`.
+    """
+
+    def __init__(self, max_size: int, driver_config: dict = None):
+        """
+        Parameters:
+        - max_size (int): Maximum number of drivers alive at the same time.
+        - driver_config (dict, optional): Chrome profile configuration; defaults to DRIVER_CONFIG.
+        """
+        self.max_size = max(max_size, 1)
+        self.driver_config = driver_config if driver_config is not None else DRIVER_CONFIG
+        self._idle = []
+        self._drivers = {}  # driver -> index of its user-data dir
+        self._starting = set()  # indices of drivers being started
+        self._created = 0   # drivers alive or being started
+        self._available = threading.Condition()
+
+    def _driver_config_for(self, index: int) -> dict:
+        """Give every pooled driver its own user-data dir; Chrome cannot share one."""
+        driver_config = dict(self.driver_config)
+        if driver_config.get("user_data_dir"):
+            driver_config["user_data_dir"] = f"{driver_config['user_data_dir']}_{index}"
+        return driver_config
+
+    def _free_index(self) -> int:
+        """Lowest user-data dir index not held by a live driver (a discarded driver's is reused)."""
+        used = set(self._drivers.values()) | self._starting
+        return next(index for index in range(len(used) + 1) if index not in used)
+
+    def acquire(self) -> webdriver.Chrome:
+        """Take an idle driver, start a new one if below max_size, or wait for a release or discard."""
+        with self._available:
+            self._available.wait_for(lambda: self._idle or self._created < self.max_size)
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+            index = self._free_index()
+            self._starting.add(index)
+        # Chrome starts outside the lock so other keywords can release drivers meanwhile
+        try:
+            driver = create_driver(self._driver_config_for(index))
+        except Exception:
+            with self._available:
+                self._starting.discard(index)
+                self._created -= 1
+                self._available.notify()
+            raise
+        with self._available:
+            self._starting.discard(index)
+            self._drivers[driver] = index
+        return driver
+
+    def release(self, driver: webdriver.Chrome) -> None:
+        """Return a driver to the pool for the next keyword."""
+        with self._available:
+            self._idle.append(driver)
+            self._available.notify()
+
+    def discard(self, driver: webdriver.Chrome) -> None:
+        """Quit a driver that may be in a bad state and free its slot for a waiting keyword."""
+        with self._available:
+            if self._drivers.pop(driver, None) is not None:
+                self._created -= 1
+                self._available.notify()
+        try:
+            driver_quit(driver)
+        except Exception as e:
+            logger.error(f"Failed to quit pooled driver: {e}")
+
+    def close(self) -> None:
+        """Quit every driver created by the pool."""
+        with self._available:
+            drivers = list(self._drivers)
+            self._drivers = {}
+            self._idle = []
+            self._created = len(self._starting)
+            self._available.notify_all()
+        for driver in drivers:
+            try:
+                driver_quit(driver)
+            except Exception as e:
+                logger.error(f"Failed to quit pooled driver: {e}")
+
+
+def build_search_url(keyword: str, page: int, config: dict) -> str:
+    """
+    Build the DangDang search result URL for a keyword and page number.
+
+    Parameters:
+    - keyword (str): The keyword to search for.
+    - page (int): 1-based result page number.
+    - config (dict): Fetch configuration with 'search_url' and 'keyword_encoding' keys.
+
+    Returns:
+    - str: Absolute URL of the result page.
+    """
+    params = {"key": keyword, "act": "input"}
+    if page > 1:
+        params["page_index"] = page
+    query = urlencode(params, encoding=config.get("keyword_encoding", "gbk"))
+    return f"{config.get('search_url')}?{query}"
+
+
+def fetch_search_page(url: str, client, config: dict) -> bytes | None:
+    """
+    Download one search result page without a browser.
+
+    Parameters:
+    - url (str): Result page URL, usually from `build_search_url`.
+    - client: Pooled HTTP client exposing `get` (e.g. `image_process.ImageHttpClient`).
+    - config (dict): Fetch configuration with 'timeout' key.
+
+    Returns:
+    - bytes | None: Raw HTML, or None if the request failed.
+    """
+    try:
+        response = client.get(url, headers=SEARCH_PAGE_HEADERS, timeout=config.get("timeout", 10))
+        if response.status_code == 200:
+            return response.content
+        logger.error(f"Search page request failed: {url} (status {response.status_code})")
+    except Exception as e:
+        logger.error(f"Search page request failed: {url}: {type(e).__name__} - {e}")
+    return None
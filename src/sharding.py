@@ -0,0 +1,175 @@
+"""
+sharding.py
+===========
+
+This module splits a large crawl into shards for worker processes and merges their outputs.
+
+- `plan_shards` cuts every keyword's result pages into (keyword, first page, last page) units.
+- Each shard runs in a worker process with its own Context directories
+  (`output/<keyword>__p001-005/`, `dev_logs/<keyword>__p001-005/`) and run log;
+  `init_worker` gives every worker process its own global log file as well.
+- `merge_shards` combines the shards' row files into one dataset with a Keyword column (a result
+  slot crawled by more than one shard is kept once), their failure logs into one failure summary,
+  and records the outcome of every shard in a manifest.
+
+本模块将大规模抓取拆分为分片交给工作进程执行，并合并各分片的输出。
+
+- `plan_shards` 将每个关键词的结果页切分为（关键词、起始页、结束页）工作单元。
+- 每个分片在工作进程中运行，拥有独立的 Context 目录（`output/<关键词>__p001-005/`、
+  `dev_logs/<关键词>__p001-005/`）和运行日志；`init_worker` 让每个工作进程也写入独立的全局日志文件。
+- `merge_shards` 将各分片的数据文件合并为一个带 Keyword 列的数据集（被多个分片抓取的同一结果位置只保留一行），
+  将失败日志合并为一份失败汇总，并在清单文件中记录每个分片的结果。
+"""
+
+# ===== Standard Library Modules =====
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+# ===== Third-Party Library Modules =====
+import pandas as pd
+
+# ===== Custom Project Modules =====
+import image_process as img_pro
+import storage_module as sto_m
+from logger import logger, use_process_log
+
+
+@dataclass(frozen=True)
+class ShardTask:
+    """
+    One work unit: a keyword and an inclusive range of its result pages.
+
+    Attributes:
+        keyword: Search keyword.
+        first_page: First result page of the shard.
+        last_page: Last result page of the shard.
+    """
+    keyword: str
+    first_page: int
+    last_page: int
+
+    @property
+    def name(self) -> str:
+        """Directory name of the shard's output and dev logs."""
+        return f"{sto_m.run_dir_name(self.keyword)}__p{self.first_page:03d}-{self.last_page:03d}"
+
+
+def plan_shards(keywords: list[str], total_pages: int, pages_per_shard: int) -> list[ShardTask]:
+    """
+    Split every keyword's pages 1..total_pages into shards of at most `pages_per_shard` pages.
+
+    Args:
+        keywords: Keywords to crawl (duplicates are dropped in order).
+        total_pages: Result pages crawled per keyword.
+        pages_per_shard: Pages per work unit.
+
+    Returns:
+        list[ShardTask]: Shards ordered by keyword, then page.
+    """
+    step = max(pages_per_shard, 1)
+    return [
+        ShardTask(keyword, first, min(first + step - 1, total_pages))
+        for keyword in dict.fromkeys(keywords)
+        for first in range(1, total_pages + 1, step)
+    ]
+
+
+def init_worker(log_dir, jieba_config: dict):
+    """
+    Initializer of a shard worker process.
+
+    Moves the process's global log to `<log_dir>/worker_<pid>.log` and, if configured, loads
+    the jieba dictionary up front (from its cache file; a forked worker already has it).
+    """
+    use_process_log(Path(log_dir) / f"worker_{os.getpid()}.log")
+    if jieba_config.get("prewarm"):
+        img_pro.warm_tokenizer(jieba_config)
+
+
+def merge_shards(tasks: list[ShardTask], results: dict[str, str], merge_name: str, output_config: dict) -> dict:
+    """
+    Merge the outputs of finished shards.
+
+    Rows of all shards are combined with a leading Keyword column. Only rows whose (Keyword, Page,
+    Index) was crawled by more than one shard are dropped, keeping the last version; rows with the
+    same title, author and price are distinct listings (editions, sellers) and are all kept.
+    Failure log entries of all shards are written to one `failure_summary.jsonl`, tagged with
+    their shard and stage.
+
+    Args:
+        tasks: Planned shards, in order.
+        results: Shard name -> "OK" or the error that stopped it.
+        merge_name: Directory name of the merged output under output/ and dev_logs/.
+        output_config: Output configuration (format, export_excel), e.g. OUTPUT_CONFIG.
+
+    Returns:
+        dict: Manifest of the merge (also written to `dev_logs/<merge_name>/shards.json`).
+    """
+    output_dir, dev_log_dir = sto_m.run_dirs(merge_name)
+
+    frames = []
+    failures = []
+    shards = []
+    for task in tasks:
+        shard_output_dir, shard_dev_log_dir = sto_m.run_dirs(task.name)
+        rows = 0
+        found = sto_m.find_sink_file(shard_output_dir)
+        if found is not None:
+            sink_cls, path = found
+            df = sink_cls.read_file(path)
+            df.insert(0, "Keyword", task.keyword)
+            frames.append(df)
+            rows = len(df)
+        for stage, log_name in sto_m.FAILURE_LOG_NAMES.items():
+            failures += _read_failures(shard_dev_log_dir / log_name, task, stage)
+        shards.append({
+            "shard": task.name, "keyword": task.keyword, "first_page": task.first_page,
+            "last_page": task.last_page, "status": results.get(task.name, "not run"), "rows": rows
+        })
+
+    merged = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["Keyword", *sto_m.SINK_COLUMNS])
+    rows_read = len(merged)
+    merged = merged.drop_duplicates(subset=["Keyword", "Page", "Index"], keep="last")
+
+    failure_keys = {}
+    for entry in failures:
+        key = (entry["Keyword"], entry["Stage"], entry.get("Page"), entry.get("Index"), entry.get("Img_URL"))
+        failure_keys[key] = entry
+
+    data_path, failure_path = sto_m.write_dataset(
+        merged, list(failure_keys.values()), output_dir, dev_log_dir, output_config
+    )
+
+    manifest = {
+        "shards": shards,
+        "failed_shards": [shard["shard"] for shard in shards if shard["status"] != "OK"],
+        "rows_read": rows_read,
+        "rows": len(merged),
+        "duplicates_dropped": rows_read - len(merged),
+        "failures": len(failure_keys),
+        "data_path": str(data_path),
+        "failure_summary_path": str(failure_path),
+    }
+    (dev_log_dir / "shards.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info(
+        f"Merged {len(tasks)} shards: {len(merged)} rows ({manifest['duplicates_dropped']} duplicates dropped), "
+        f"{len(failure_keys)} failures -> {data_path}"
+    )
+    return manifest
+
+
+def _read_failures(path: Path, task: ShardTask, stage: str) -> list[dict]:
+    """Entries of one shard failure log, tagged with keyword, shard and stage (a truncated line is skipped)."""
+    if not path.exists():
+        return []
+    entries = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries.append({"Keyword": task.keyword, "Shard": task.name, "Stage": stage, **entry})
+    return entries
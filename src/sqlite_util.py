@@ -0,0 +1,38 @@
+"""
+sqlite_util.py
+==============
+
+This module holds the SQLite helpers shared by the modules that keep state in a database file.
+
+- `project_path` resolves a configured path relative to the project root.
+- `connect_sqlite` opens a connection suited to a file shared by several processes (WAL mode,
+  autocommit, busy timeout). Used by the job queue, the crawl nodes' result store and the HTTP
+  cache index.
+
+本模块提供多个模块共用的 SQLite 辅助函数。
+
+- `project_path` 将配置中的路径解析为相对于项目根目录的路径。
+- `connect_sqlite` 打开适合多进程共享数据库文件的连接（WAL 模式、自动提交、忙等待超时），
+  供任务队列、抓取节点的结果库和 HTTP 缓存索引使用。
+"""
+
+# ===== Standard Library Modules =====
+import sqlite3
+from pathlib import Path
+
+
+def project_path(path) -> Path:
+    """Resolve a configured path relative to the project root."""
+    path = Path(path)
+    return path if path.is_absolute() else Path(__file__).resolve().parent.parent / path
+
+
+def connect_sqlite(path, busy_timeout: float = 30.0) -> sqlite3.Connection:
+    """
+    Open a connection for a database shared by several processes: WAL mode (readers do not block
+    the writer), autocommit (transactions are opened explicitly) and a busy timeout.
+    """
+    conn = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
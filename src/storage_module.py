@@ -8,65 +8,138 @@ and download failures.
 
 Main functions:
 1. `create_file`: Create necessary directories and log paths for output, images, and debug logs.
-2. `save_info`: Save scraped data into Excel sheets per page, save failed image logs into JSON,
-   and log the summary information.
+2. `save_info`: Close the run's row sink, export the Excel workbook (one sheet per page) from it,
+   save failed image logs into JSON, and log the summary information.
+3. `CrawlCheckpoint`: Append-only JSONL record of finished pages and image outcomes, used to
+   resume an interrupted crawl.
+4. `create_sink`: Streaming row writers (CSV / JSONL / Parquet) that append each finished page,
+   with `export_excel` building the Excel workbook from the streamed file.
+5. `write_dataset`: Write a combined multi-keyword dataset (shard merge, queue export) and its
+   failure summary.
 
 本模块封装了当当图书爬虫项目的数据存储操作。
 负责创建输出目录、写入 Excel 文件，并记录图片验证和下载失败日志。
 
 主要功能：
 1. `create_file`：创建 output、images 文件夹及各类日志路径。
-2. `save_info`：将抓取数据分页保存到 Excel，失败图片信息写入 JSON 并记录日志。
+2. `save_info`：关闭本次运行的数据 sink，并据此分页导出 Excel，失败图片信息写入 JSON 并记录日志。
+3. `CrawlCheckpoint`：以追加写入的 JSONL 记录已完成页面和图片结果，用于中断后续爬。
+4. `create_sink`：流式写入（CSV / JSONL / Parquet），每完成一页即追加；`export_excel` 由流式文件导出 Excel。
+5. `write_dataset`：写出多关键词合并数据集（分片合并、队列导出）及其失败汇总。
 """
 
 # ===== Standard Library Modules =====
+import abc
+import csv
+import json
+import os
+import re
+import threading
 from pathlib import Path
 
 # ===== Third-Party Libraries =====
 import pandas as pd
 
+# Optional: Parquet output
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
 # ===== Custom Project Modules =====
 from logger import logger, reconfigure_file_handler, log_to_json
+from metrics import metrics_for
+from records import BookRecord
+
+# Columns of streamed rows; (Page, Index) identifies a row, the last written version wins
+SINK_COLUMNS = ["Page", "Index", "Title", "Price", "Author", "Cover_Img_Filename", "Cover_Img_Path"]
+
+# Data rows an Excel sheet can hold (below the header)
+EXCEL_MAX_ROWS = 1_048_575
+
+# Failure logs of a run (under its dev log directory), by the stage that gave up on the image
+FAILURE_LOG_NAMES = {"validation": "img_validation_failures.jsonl", "download": "download_img_failures.jsonl"}
+
+
+def run_dir_name(keyword: str) -> str:
+    """
+    Turn a search keyword into a directory name for a per-keyword run.
+
+    Parameters:
+    - keyword (str): Search keyword.
+
+    Returns:
+    - str: Filesystem-safe directory name.
+    """
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", keyword.strip()) or "_"
+
+
+def run_dirs(run_name: str = None) -> tuple[Path, Path]:
+    """
+    Output and dev log directories of a run (not created).
+
+    Parameters:
+    - run_name (str, optional): Sub-directory name of a batch or shard run.
+
+    Returns:
+    - tuple[Path, Path]: `output[/<run_name>]` and `dev_logs[/<run_name>]` under the project root.
+    """
+    # Project root directory (parent of src)
+    project_root = Path(__file__).resolve().parent.parent
+    output_dir = project_root / "output"
+    dev_log_dir = project_root / "dev_logs"
+    if run_name:
+        output_dir = output_dir / run_name
+        dev_log_dir = dev_log_dir / run_name
+    return output_dir, dev_log_dir
+
 
-def create_file():
+def create_file(run_name: str = None):
     """
     Create project output directories and log file paths.
 
+    When `run_name` is given (batch runs), outputs and debug logs go into
+    `output/<run_name>/` and `dev_logs/<run_name>/`, and the shared context log
+    handler is left untouched so concurrent runs do not replace each other's log.
+
+    Parameters:
+    - run_name (str, optional): Sub-directory name for this run.
+
     Returns:
     - images_dir (Path): Directory to store downloaded images.
     - excel_path (Path): Path for saving Excel file.
     - run_log_path (Path): Path for run log.
-    - img_not_valid_retry_log_path (Path): JSON log for retryable invalid images.
-    - img_not_valid_unhandled_exception_log_path (Path): JSON log for unhandled exceptions during validation.
+    - img_not_valid_retry_log_path (Path): JSON Lines log for retryable invalid images.
+    - img_not_valid_unhandled_exception_log_path (Path): JSON Lines log for unhandled exceptions during validation.
     - parsing_error_log_path (Path): JSON log for parsing errors.
-    - img_validation_failures_log_path (Path): JSON log for images that failed validation.
-    - download_img_failures_log_path (Path): JSON log for images that failed to download.
+    - img_validation_failures_log_path (Path): JSON Lines log for images that failed validation.
+    - download_img_failures_log_path (Path): JSON Lines log for images that failed to download.
+    - metrics_summary_path (Path): JSON run summary of the metrics registry.
     """
-    # Current file path (src/storage_module.py)
-    current_file = Path(__file__).resolve()
-    # Project root directory (parent of src)
-    project_root = current_file.parent.parent
+    output_dir, dev_log_dir = run_dirs(run_name)
     # Output directories
-    output_dir = project_root / 'output'
     images_dir = output_dir / 'images'
     excel_path = output_dir / 'dangdang_books.xlsx'
     images_dir.mkdir(parents=True, exist_ok=True)
 
     # Development and debug log directories
-    dev_log_dir = project_root / "dev_logs"
     debug_log_dir = dev_log_dir / "debug_logs"
     debug_log_dir.mkdir(parents=True, exist_ok=True)
 
     # Configure context run log
     run_log_path = debug_log_dir / "run.log"
-    reconfigure_file_handler(run_log_path)
+    if not run_name:
+        reconfigure_file_handler(run_log_path)
 
     # Log paths
-    img_not_valid_retry_log_path = debug_log_dir / "img_not_valid_retry.json"
-    img_not_valid_unhandled_exception_log_path = debug_log_dir / "img_not_valid_unhandled_exception.json"
+    img_not_valid_retry_log_path = debug_log_dir / "img_not_valid_retry.jsonl"
+    img_not_valid_unhandled_exception_log_path = debug_log_dir / "img_not_valid_unhandled_exception.jsonl"
     parsing_error_log_path = debug_log_dir / "parsing_error.json"
-    img_validation_failures_log_path = dev_log_dir / "img_validation_failures.json"
-    download_img_failures_log_path = dev_log_dir / "download_img_failures.json"
+    img_validation_failures_log_path = dev_log_dir / FAILURE_LOG_NAMES["validation"]
+    download_img_failures_log_path = dev_log_dir / FAILURE_LOG_NAMES["download"]
+    metrics_summary_path = dev_log_dir / "metrics_summary.json"
 
     return (
         images_dir,
@@ -76,46 +149,438 @@ def create_file():
         img_not_valid_unhandled_exception_log_path,
         parsing_error_log_path,
         img_validation_failures_log_path,
-        download_img_failures_log_path
+        download_img_failures_log_path,
+        metrics_summary_path
     )
 
-def save_info(all_pages_data, context):
+class RowSink(abc.ABC):
+    """
+    Base class of streaming row writers.
+
+    Rows are appended as pages finish, so nothing has to be held in memory until the end of
+    the run. Writing the same (Page, Index) again with `update=True` records an update (e.g. a
+    retried cover); readers keep the last version, and `close` rewrites the file with one row
+    per (Page, Index) if any update was written. Subclasses implement `_write`, `_close`,
+    `_read` and `write_frame`.
+    """
+
+    suffix = ""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.rows_written = 0
+        self.updates_written = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def write_rows(self, rows: list[BookRecord], update: bool = False):
+        """Append rows; safe to call from worker threads. Records become column dicts only here.
+
+        `update=True` marks rows that replace ones already written for the same (Page, Index).
+        """
+        if not rows:
+            return
+        records = [{col: _sink_value(value) for col, value in row.to_row().items()} for row in rows]
+        with self._lock:
+            self._write(records)
+            self.rows_written += len(records)
+            if update:
+                self.updates_written += len(records)
+
+    def close(self):
+        """Close the file; if updates were appended, rewrite it with the last version of each row."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._close()
+            if self.updates_written:
+                self._compact()
+
+    def _compact(self):
+        """Replace the file by its deduplicated rows, so it can be read without `read_file`."""
+        df = self.read_file(self.path)
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        self.write_frame(df, tmp_path)
+        os.replace(tmp_path, self.path)
+        logger.info(f"{self.updates_written} updated rows merged into {self.path} ({len(df)} rows)")
+
+    def read_frame(self) -> pd.DataFrame:
+        """Load the streamed rows, keeping only the last version of each (Page, Index)."""
+        return self.read_file(self.path)
+
+    @classmethod
+    def read_file(cls, path) -> pd.DataFrame:
+        """Load a file written by this sink type (e.g. by another process), deduplicated like `read_frame`."""
+        df = cls._read(Path(path))
+        if df.empty:
+            return pd.DataFrame(columns=SINK_COLUMNS)
+        df = df.drop_duplicates(subset=["Page", "Index"], keep="last")
+        return df.sort_values(["Page", "Index"], kind="stable")
+
+    @abc.abstractmethod
+    def _write(self, records):
+        """Append column dicts to the file (called under the sink's lock)."""
+
+    @abc.abstractmethod
+    def _close(self):
+        """Flush and close the file."""
+
+    @staticmethod
+    @abc.abstractmethod
+    def _read(path: Path) -> pd.DataFrame:
+        """Load every row of a file in this format, superseded versions included."""
+
+    @staticmethod
+    @abc.abstractmethod
+    def write_frame(df: pd.DataFrame, path):
+        """Write a whole frame in this format (merged shard output)."""
+
+
+class CsvSink(RowSink):
+    """Streams rows into a UTF-8 (with BOM, Excel friendly) CSV file."""
+
+    suffix = ".csv"
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._file = self.path.open("w", encoding="utf-8-sig", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=SINK_COLUMNS)
+        self._writer.writeheader()
+
+    def _write(self, records):
+        self._writer.writerows(records)
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+    @staticmethod
+    def _read(path):
+        text_columns = {col: str for col in SINK_COLUMNS if col not in ("Page", "Index")}
+        return pd.read_csv(path, encoding="utf-8-sig", dtype=text_columns, keep_default_na=False)
+
+    @staticmethod
+    def write_frame(df: pd.DataFrame, path):
+        df.to_csv(path, encoding="utf-8-sig", index=False)
+
+
+class JsonlSink(RowSink):
+    """Streams rows into a JSON Lines file, one object per row."""
+
+    suffix = ".jsonl"
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._file = self.path.open("w", encoding="utf-8")
+
+    def _write(self, records):
+        self._file.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+    @staticmethod
+    def _read(path):
+        if path.stat().st_size == 0:
+            return pd.DataFrame(columns=SINK_COLUMNS)
+        return pd.read_json(path, lines=True, dtype=False)
+
+    @staticmethod
+    def write_frame(df: pd.DataFrame, path):
+        df.to_json(path, orient="records", lines=True, force_ascii=False)
+
+
+class ParquetSink(RowSink):
+    """Streams rows into a Parquet file, one row group per write (requires pyarrow)."""
+
+    suffix = ".parquet"
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._schema = pa.schema([
+            (col, pa.int32() if col in ("Page", "Index") else pa.string()) for col in SINK_COLUMNS
+        ])
+        self._writer = pq.ParquetWriter(self.path, self._schema)
+
+    def _write(self, records):
+        self._writer.write_table(pa.Table.from_pylist(records, schema=self._schema))
+
+    def _close(self):
+        self._writer.close()
+
+    @staticmethod
+    def _read(path):
+        return pq.read_table(path).to_pandas()
+
+    @staticmethod
+    def write_frame(df: pd.DataFrame, path):
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+
+
+SINK_FORMATS = {"csv": CsvSink, "jsonl": JsonlSink, "parquet": ParquetSink}
+
+
+def _sink_value(value):
+    """Store paths and other objects as text, keep page/index numbers as int."""
+    if value is None or isinstance(value, (int, str)):
+        return value
+    return str(value)
+
+
+def create_sink(base_path, fmt: str) -> RowSink:
+    """
+    Create the streaming row writer for a run.
+
+    Parameters:
+    - base_path: Output path (e.g. the Excel path); its suffix is replaced by the format's suffix.
+    - fmt (str): "csv", "jsonl" or "parquet". Parquet falls back to JSONL if pyarrow is not installed.
+
+    Returns:
+    - RowSink: Opened sink.
+    """
+    sink_cls = sink_class(fmt)
+    return sink_cls(Path(base_path).with_suffix(sink_cls.suffix))
+
+
+def sink_class(fmt: str) -> type[RowSink]:
+    """Sink class of an output format; Parquet falls back to JSONL if pyarrow is not installed."""
+    if fmt == "parquet" and pa is None:
+        logger.warning("pyarrow is not installed, streaming output falls back to JSONL.")
+        fmt = "jsonl"
+    if fmt not in SINK_FORMATS:
+        raise ValueError(f"Unknown output format: {fmt}")
+    return SINK_FORMATS[fmt]
+
+
+def find_sink_file(output_dir) -> tuple[type[RowSink], Path] | None:
+    """
+    Locate the streamed row file of a finished run (e.g. a shard written by another process).
+
+    Parameters:
+    - output_dir: Output directory of the run.
+
+    Returns:
+    - tuple | None: (sink class, file path), or None if the run wrote no rows file.
+    """
+    for sink_cls in SINK_FORMATS.values():
+        path = Path(output_dir) / f"dangdang_books{sink_cls.suffix}"
+        if path.exists():
+            return sink_cls, path
+    return None
+
+
+def write_dataset(df: pd.DataFrame, failures: list[dict], output_dir, dev_log_dir, output_config: dict) -> tuple[Path, Path]:
+    """
+    Write a combined dataset (rows of several runs, with a Keyword column) and its failure summary.
+
+    - Rows go to `dangdang_books.<format>` in `output_dir`, and to an Excel workbook ("Books" and
+      "Failure Summary" sheets) if `export_excel` is enabled and they fit in one sheet.
+    - Failure entries go to `failure_summary.jsonl` in `dev_log_dir`.
+
+    Parameters:
+    - df (pd.DataFrame): Deduplicated rows.
+    - failures (list): Failure entries (dicts).
+    - output_dir: Output directory of the combined dataset.
+    - dev_log_dir: Dev log directory of the combined dataset.
+    - output_config (dict): Output configuration (format, export_excel).
+
+    Returns:
+    - tuple[Path, Path]: Data file and failure summary paths.
+    """
+    output_dir, dev_log_dir = Path(output_dir), Path(dev_log_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    dev_log_dir.mkdir(parents=True, exist_ok=True)
+
+    sink_cls = sink_class(output_config.get("format", "csv"))
+    data_path = output_dir / f"dangdang_books{sink_cls.suffix}"
+    sink_cls.write_frame(df, data_path)
+    failure_path = dev_log_dir / "failure_summary.jsonl"
+    with failure_path.open("w", encoding="utf-8") as f:
+        f.writelines(json.dumps(entry, ensure_ascii=False, default=str) + "\n" for entry in failures)
+
+    if output_config.get("export_excel", True):
+        if len(df) > EXCEL_MAX_ROWS:
+            logger.warning(f"{len(df)} rows do not fit in one Excel sheet, Excel export skipped.")
+        else:
+            with pd.ExcelWriter(output_dir / "dangdang_books.xlsx") as writer:
+                df.to_excel(writer, sheet_name="Books", index=False)
+                if failures:
+                    pd.DataFrame(failures).to_excel(writer, sheet_name="Failure Summary", index=False)
+    return data_path, failure_path
+
+
+def export_excel(sink: RowSink, excel_path, failure_rows: list):
+    """
+    Build the Excel workbook from a closed sink: one sheet per page plus the failure summary.
+
+    Parameters:
+    - sink (RowSink): Closed sink holding the streamed rows.
+    - excel_path: Target .xlsx path.
+    - failure_rows (list): Second-download `ImageFailure`s for the 'Failure Summary' sheet.
+    """
+    df = sink.read_frame()
+    with pd.ExcelWriter(excel_path) as writer:
+        for page, page_df in df.groupby("Page", sort=True):
+            page_df.drop(columns=["Page", "Index"]).to_excel(writer, sheet_name=f"Page {page}", index=False)
+        if len(failure_rows):
+            pd.DataFrame([f.to_dict() for f in failure_rows]).to_excel(writer, sheet_name="Failure Summary", index=False)
+        if df.empty and not len(failure_rows):
+            pd.DataFrame(columns=SINK_COLUMNS).to_excel(writer, sheet_name="Page 1", index=False)
+
+
+def save_info(context):
     """
     Save scraped book data into Excel, and log failed images.
 
-    - Each page's data is saved to a separate Excel sheet.
-    - Second-download-failed images are saved into a 'failure summary' sheet.
+    - Rows were already written to the context's streaming sink page by page (nothing else
+      holds them); the sink is closed here and the Excel workbook is exported from it only if
+      `export_excel` is enabled. Second-download-failed images go to a 'Failure Summary' sheet.
     - Invalid image validation logs and second-download failures are written to JSON files.
 
     Parameters:
-    - all_pages_data (list): List of page data, each page as a list of dictionaries.
-    - context: Context object holding paths and fail lists.
+    - context: Context object holding the sink, paths and fail lists.
     """
-    # Save paginated data to Excel
-    with pd.ExcelWriter(context.excel_path) as writer:
-        for i, page_data in enumerate(all_pages_data, start=1):
-            df = pd.DataFrame(page_data)
-            df.to_excel(writer, sheet_name=f"Page {i}", index=False)
+    sink = context.sink
+    sink.close()
+    logger.info(f"{sink.rows_written} rows streamed to {sink.path}")
+    if getattr(context, "export_excel", False):
+        with metrics_for(context).timer("excel_write_seconds"):
+            export_excel(sink, context.excel_path, context.second_download_fail_list)
 
-        # Save second-download failed images if any
-        if len(context.second_download_fail_list):
-            df_fail = pd.DataFrame(context.second_download_fail_list)
-            df_fail.to_excel(writer, sheet_name="Failure Summary", index=False)
+    log_validation_failures(context)
 
-    # Log images that failed validation
+    # Log second-download failed images
+    if len(context.second_download_fail_list):
+        for item in context.second_download_fail_list:
+            log_to_json(item.to_dict(), context.download_img_failures_log_path)
+        logger.info(f"{len(context.second_download_fail_list)} images failed second download; logs saved to Excel and JSON.")
+    else:
+        logger.info("All images downloaded successfully, no failures.")
+
+
+def log_validation_failures(context):
+    """
+    Write the images that failed validation to the run's JSON log.
+
+    Parameters:
+    - context: Context object holding `img_validation_fail_list` and its log path.
+    """
     if len(context.img_validation_fail_list):
         for item in context.img_validation_fail_list:
-            log_to_json(item, context.img_validation_failures_log_path)
+            log_to_json(item.to_dict(), context.img_validation_failures_log_path)
         logger.info(
             f"{len(context.img_validation_fail_list)} images failed multiple validation attempts; logs saved to Excel and JSON."
         )
     else:
         logger.info("All images validated successfully, no failures.")
 
-    # Log second-download failed images
-    if len(context.second_download_fail_list):
-        for item in context.second_download_fail_list:
-            log_to_json(item, context.download_img_failures_log_path)
-        logger.info(f"{len(context.second_download_fail_list)} images failed second download; logs saved to Excel and JSON.")
-    else:
-        logger.info("All images downloaded successfully, no failures.")
+
+class CrawlCheckpoint:
+    """
+    Append-only JSONL checkpoint of crawl progress.
+
+    Two kinds of events are written as the crawl goes:
+    - {"type": "page", "page": n, "items": [{"idx", "img_url", "row"}, ...]} once a page is parsed
+    - {"type": "image", "page": n, "idx": i, "filename": ..., "path": ...} once a cover is processed
+
+    With `resume=True` the existing file is loaded and kept, so finished pages can be restored
+    instead of fetched again; otherwise the file is started fresh. Only a resumed run holds
+    events in memory (the ones loaded from the file); new events are only appended to it.
+
+    以追加写入的 JSONL 记录爬取进度（已解析页面、图片处理结果），resume 模式下加载已有记录以跳过已完成的工作。
+    """
+
+    def __init__(self, path, resume: bool = False):
+        """
+        Parameters:
+        - path: Checkpoint file path.
+        - resume (bool): Load and extend an existing checkpoint instead of starting a new one.
+        """
+        self.path = Path(path)
+        self.resume = resume
+        self.pages = {}
+        self.images = {}
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists():
+            self._load()
+            logger.info(f"Checkpoint loaded: {len(self.pages)} pages, {len(self.images)} images from {self.path}")
+        self._file = self.path.open("a" if resume else "w", encoding="utf-8")
+
+    def _load(self):
+        """Read existing events; a truncated last line from a crash is ignored."""
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if event.get("type") == "page":
+                    self.pages[event["page"]] = event["items"]
+                elif event.get("type") == "image":
+                    self.images[(event["page"], event["idx"])] = (event["filename"], event["path"])
+
+    def _append(self, event: dict):
+        with self._lock:
+            self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def record_page(self, page: int, items: list):
+        """
+        Record a parsed page.
+
+        Parameters:
+        - page (int): Page number.
+        - items (list): (img_url, BookRecord) tuples of the page's products.
+        """
+        entries = [
+            {"idx": record.idx, "img_url": img_url, "row": record.checkpoint_row()}
+            for img_url, record in items
+        ]
+        self._append({"type": "page", "page": page, "items": entries})
+
+    def record_image(self, page: int, idx: int, filename: str, path):
+        """Record the outcome of one cover image."""
+        self._append({"type": "image", "page": page, "idx": idx, "filename": filename, "path": str(path)})
+
+    def is_page_done(self, page: int) -> bool:
+        """Whether a resumed run can restore this page instead of fetching it."""
+        return self.resume and page in self.pages
+
+    def restore_page(self, page: int) -> list | None:
+        """
+        Return a finished page from the checkpoint.
+
+        An image counts as done if its file is still on disk, or if it was identified as
+        missing/placeholder; anything else (download failed, retryable, not recorded) has
+        to be processed again.
+
+        Parameters:
+        - page (int): Page number.
+
+        Returns:
+        - list | None: (img_url, BookRecord, image_done) tuples, or None if the page is not finished.
+        """
+        if not self.is_page_done(page):
+            return None
+        restored = []
+        for entry in self.pages[page]:
+            record = BookRecord.from_checkpoint_row(entry["row"], page, entry["idx"])
+            outcome = self.images.get((page, entry["idx"]))
+            image_done = False
+            if outcome is not None:
+                filename, path = outcome
+                image_done = (path != "No Image" and Path(path).exists()) or filename == "No Image or Placeholder"
+                if image_done:
+                    record.cover_img_filename = filename
+                    record.cover_img_path = Path(path) if path != "No Image" else path
+            restored.append((entry["img_url"], record, image_done))
+        return restored
+
+    def close(self):
+        """Close the checkpoint file."""
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,14 @@
+"""
+Test setup: the project modules import each other by name from src/, and the local
+fixture server lives in benchmarks/.
+
+测试配置：项目模块以 src/ 下的模块名相互导入，本地夹具服务器位于 benchmarks/。
+"""
+
+# ===== Standard Library Modules =====
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "benchmarks"))
+sys.path.insert(0, str(ROOT / "src"))
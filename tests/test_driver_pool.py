@@ -0,0 +1,43 @@
+"""Tests for request_module.DriverPool with stubbed Chrome drivers."""
+
+# ===== Standard Library Modules =====
+import threading
+
+# ===== Custom Project Modules =====
+import request_module as req_m
+
+
+def _stub_drivers(monkeypatch):
+    monkeypatch.setattr(req_m, "create_driver", lambda driver_config: object())
+    monkeypatch.setattr(req_m, "driver_quit", lambda driver: None)
+
+
+def test_discard_wakes_waiting_acquire(monkeypatch):
+    _stub_drivers(monkeypatch)
+    pool = req_m.DriverPool(1)
+    driver = pool.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    waiter.start()
+
+    pool.discard(driver)
+    waiter.join(timeout=5)
+
+    assert not waiter.is_alive()
+    assert acquired and acquired[0] is not driver
+    pool.close()
+
+
+def test_release_hands_driver_to_waiting_acquire(monkeypatch):
+    _stub_drivers(monkeypatch)
+    pool = req_m.DriverPool(1)
+    driver = pool.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    waiter.start()
+
+    pool.release(driver)
+    waiter.join(timeout=5)
+
+    assert acquired == [driver]
+    pool.close()
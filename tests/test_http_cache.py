@@ -0,0 +1,61 @@
+"""Tests for http_cache.HttpImageCache."""
+
+# ===== Standard Library Modules =====
+import hashlib
+
+# ===== Custom Project Modules =====
+import http_cache as http_c
+import image_store as img_store
+from image_process import ImageBody
+
+
+def _body(tmp_path, data: bytes) -> ImageBody:
+    path = tmp_path / "body.part"
+    path.write_bytes(data)
+    return ImageBody(path, len(data), hashlib.sha256(data).hexdigest())
+
+
+def test_store_backed_entry_keeps_no_copy_and_serves_blob(tmp_path):
+    store = img_store.ImageStore(tmp_path / "store")
+    cache = http_c.HttpImageCache(tmp_path / "cache", max_bytes=0, max_age_days=0, image_store=store)
+    body = _body(tmp_path, b"\xff\xd8\xff" + b"x" * 2000)
+
+    cache.store("http://img.example/a.jpg", {"ETag": '"v1"'}, body)
+    blob = store.put_file("http://img.example/a.jpg", body.path, body.sha256, body.size)
+
+    assert not any(cache.body_dir.iterdir())
+    assert cache.conditional_headers("http://img.example/a.jpg") == {"If-None-Match": '"v1"'}
+    assert cache.not_modified_path("http://img.example/a.jpg") == blob
+    # Eviction with a zero budget never deletes store blobs
+    cache.save()
+    assert blob.exists()
+    store.close()
+
+
+def test_without_store_the_body_is_copied(tmp_path):
+    cache = http_c.HttpImageCache(tmp_path / "cache", max_bytes=10_000, max_age_days=0)
+    body = _body(tmp_path, b"\xff\xd8\xff" + b"y" * 2000)
+
+    cache.store("http://img.example/b.jpg", {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, body)
+
+    cached = cache.not_modified_path("http://img.example/b.jpg")
+    assert cached.read_bytes() == body.path.read_bytes()
+    assert cache.stats()["cached_bytes"] == body.size
+
+
+def test_caches_sharing_a_directory_keep_each_others_entries(tmp_path):
+    # Two shard processes: each opens its own cache on the same directory and saves at the end
+    first = http_c.HttpImageCache(tmp_path / "cache", max_bytes=10_000, max_age_days=0)
+    second = http_c.HttpImageCache(tmp_path / "cache", max_bytes=10_000, max_age_days=0)
+    first.store("http://img.example/c.jpg", {"ETag": '"c"'}, _body(tmp_path, b"\xff\xd8\xff" + b"c" * 100))
+    second.store("http://img.example/d.jpg", {"ETag": '"d"'}, _body(tmp_path, b"\xff\xd8\xff" + b"d" * 100))
+    first.save()
+    second.save()
+    first.close()
+    second.close()
+
+    reopened = http_c.HttpImageCache(tmp_path / "cache", max_bytes=10_000, max_age_days=0)
+    assert reopened.conditional_headers("http://img.example/c.jpg") == {"If-None-Match": '"c"'}
+    assert reopened.conditional_headers("http://img.example/d.jpg") == {"If-None-Match": '"d"'}
+    assert reopened.stats()["entries"] == 2
+    reopened.close()
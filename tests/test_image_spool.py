@@ -0,0 +1,33 @@
+"""Tests for image_process.ImageSpool."""
+
+# ===== Custom Project Modules =====
+import image_process as img_pro
+from config import IMAGE_VALIDATION_CONFIG
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"p" * 4000
+WEBP = b"RIFF\x00\x10\x00\x00WEBPVP8 " + b"w" * 4000
+
+
+def _spool(tmp_path, chunks: list[bytes]):
+    spool = img_pro.ImageSpool(tmp_path, dict(IMAGE_VALIDATION_CONFIG, min_image_file_size=1000))
+    for chunk in chunks:
+        reason = spool.feed(chunk)
+        if reason is not None:
+            spool.abort()
+            return None, reason
+    return spool.finish()
+
+
+def test_signature_split_over_short_chunks_is_accepted(tmp_path):
+    for data in (PNG, WEBP):
+        chunks = [data[:1], data[1:5], data[5:9], data[9:]]
+        body, reason = _spool(tmp_path, chunks)
+        assert reason == "OK"
+        assert body.path.read_bytes() == data
+        body.discard()
+
+
+def test_wrong_signature_is_rejected_once_the_prefix_is_complete(tmp_path):
+    body, reason = _spool(tmp_path, [b"<htm", b"l><body>", b"x" * 4000])
+    assert (body, reason) == (None, "Not Image Content")
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,65 @@
+"""Tests for job_queue.SqliteJobQueue shared by several processes."""
+
+# ===== Standard Library Modules =====
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# ===== Custom Project Modules =====
+import job_queue as jq
+
+
+def _drain(path: str) -> list[int]:
+    """Node process: lease and ack jobs until none are pending; returns the numbers it acked."""
+    queue = jq.SqliteJobQueue(path, visibility_timeout=30)
+    acked = []
+    try:
+        while queue.pending():
+            job = queue.lease(["page"], f"node_{os.getpid()}")
+            if job is None:
+                time.sleep(0.01)
+                continue
+            assert queue.ack(job)
+            acked.append(job.payload["n"])
+    finally:
+        queue.close()
+    return acked
+
+
+def test_processes_ack_every_job_exactly_once(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    queue = jq.SqliteJobQueue(path)
+    assert queue.put_many("page", [({"n": n}, f"page:{n}") for n in range(300)]) == 300
+    # Same keys again are ignored
+    assert queue.put_many("page", [({"n": n}, f"page:{n}") for n in range(10)]) == 0
+
+    with ProcessPoolExecutor(max_workers=3, mp_context=multiprocessing.get_context("spawn")) as pool:
+        results = list(pool.map(_drain, [path] * 3))
+
+    acked = [n for result in results for n in result]
+    assert sorted(acked) == list(range(300))
+    assert queue.stats() == {"page": {"done": 300}}
+    queue.close()
+
+
+def test_expired_lease_is_leased_again(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    first = jq.SqliteJobQueue(path, visibility_timeout=0.2)
+    second = jq.SqliteJobQueue(path, visibility_timeout=0.2)
+    first.put("page", {"n": 1}, "page:1")
+
+    stalled = first.lease(["page"], "node_a")
+    assert stalled is not None and stalled.attempts == 1
+    assert second.lease(["page"], "node_b") is None
+
+    time.sleep(0.3)
+    taken_over = second.lease(["page"], "node_b")
+    assert taken_over is not None
+    assert (taken_over.id, taken_over.attempts) == (stalled.id, 2)
+    # The node that lost its lease can no longer complete the job
+    assert not first.ack(stalled)
+    assert second.ack(taken_over)
+    assert second.stats() == {"page": {"done": 1}}
+    first.close()
+    second.close()
@@ -0,0 +1,22 @@
+"""Tests for HostRateLimiter.record_metrics and the registry's gauges."""
+
+# ===== Custom Project Modules =====
+import metrics as met
+import rate_limiter as rate_lim
+
+
+def test_host_state_is_exported_as_gauges():
+    limiter = rate_lim.HostRateLimiter({"initial_rate": 10.0, "decrease_factor": 0.5, "cooldown": 0})
+    limiter.acquire("http://img.example/a.jpg")
+    limiter.observe("http://img.example/a.jpg", 503, 0.01, retry_after="30")
+    registry = met.MetricsRegistry(const_labels={"run": "test"})
+
+    limiter.record_metrics(registry)
+
+    gauges = registry.summary()["gauges"]
+    assert gauges['rate_limit_rate{host="img.example"}'] == 5.0
+    assert gauges['rate_limit_throttled{host="img.example"}'] == 1
+    assert 25 < gauges['rate_limit_paused_seconds{host="img.example"}'] <= 30
+    text = registry.to_prometheus()
+    assert "# TYPE dangdang_rate_limit_rate gauge" in text
+    assert 'dangdang_rate_limit_decreases{run="test",host="img.example"} 1' in text
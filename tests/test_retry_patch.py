@@ -0,0 +1,73 @@
+"""Tests for image_process.final_download_for_fail_img patching the rows it retries."""
+
+# ===== Standard Library Modules =====
+from types import SimpleNamespace
+
+# ===== Custom Project Modules =====
+import image_process as img_pro
+import storage_module as sto_m
+from config import IMAGE_DOWNLOAD_CONFIG
+from fixture_server import FixtureServer, FaultConfig
+from records import BookRecord
+
+
+def _context(tmp_path):
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    return SimpleNamespace(
+        images_dir=images_dir,
+        first_download_fail_list=[],
+        second_download_fail_list=[],
+        result_index={},
+        sink=sto_m.CsvSink(tmp_path / "rows.csv"),
+        checkpoint=None,
+        image_client=None,
+        async_engine=None,
+    )
+
+
+def _seed(context, record: BookRecord, base_url: str) -> str:
+    """Stream the row as the first pass would after a failed save and queue its retry."""
+    record.cover_img_filename = "Download Failed"
+    record.cover_img_path = "Download Failed"
+    context.sink.write_rows([record])
+    img_path = str(context.images_dir / f"page{record.page}_{record.idx}_{record.title}.jpg")
+    img_pro.fail_download_image_add_logging(
+        context.first_download_fail_list, f"{base_url}/img/retry/{record.page}_{record.idx}.jpg", img_path,
+        record.title, record.price, record.author, record.page, record.idx,
+        "Network Response Failed (status 503)", "OK", 0, False
+    )
+    return img_path
+
+
+def test_retry_patches_result_index_and_sink(tmp_path):
+    context = _context(tmp_path)
+    indexed = BookRecord("深度学习", "¥59.00", "作者甲", page=1, idx=2)
+    context.result_index[(1, 2)] = indexed
+    unindexed = BookRecord("机器学习", "¥45.00", "作者乙", page=2, idx=1)
+
+    server = FixtureServer(FaultConfig(pages=2, items_per_page=2)).start()
+    try:
+        indexed_path = _seed(context, indexed, server.base_url)
+        unindexed_path = _seed(context, unindexed, server.base_url)
+        img_pro.final_download_for_fail_img(context, dict(IMAGE_DOWNLOAD_CONFIG, total_num_of_retry=1))
+    finally:
+        server.stop()
+        context.sink.close()
+
+    assert context.second_download_fail_list == []
+    assert all(item.retry_success for item in context.first_download_fail_list)
+    # The indexed row object itself is patched
+    assert indexed.cover_img_filename == "page1_2_深度学习.jpg"
+    assert indexed.cover_img_path == indexed_path
+
+    # The retried rows replace the failed ones in the file itself, not only through read_frame
+    raw = sto_m.CsvSink._read(context.sink.path)
+    assert len(raw) == 2
+    rows = raw.set_index(["Page", "Index"])
+    assert rows.loc[(1, 2), "Cover_Img_Filename"] == "page1_2_深度学习.jpg"
+    assert rows.loc[(1, 2), "Cover_Img_Path"] == indexed_path
+    # A row missing from the index is rebuilt from the failure entry
+    assert rows.loc[(2, 1), "Title"] == "机器学习"
+    assert rows.loc[(2, 1), "Cover_Img_Filename"] == "page2_1_机器学习.jpg"
+    assert rows.loc[(2, 1), "Cover_Img_Path"] == unindexed_path
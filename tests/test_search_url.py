@@ -0,0 +1,24 @@
+"""Tests for request_module.build_search_url."""
+
+# ===== Third-Party Library Modules =====
+import requests
+
+# ===== Custom Project Modules =====
+import request_module as req_m
+from config import HTTP_FETCH_CONFIG
+from fixture_server import FixtureServer, FaultConfig
+
+
+def test_keyword_is_gbk_encoded_by_default():
+    url = req_m.build_search_url("人工智能", 2, dict(HTTP_FETCH_CONFIG, search_url="http://search.example/"))
+    assert url == "http://search.example/?key=%C8%CB%B9%A4%D6%C7%C4%DC&act=input&page_index=2"
+
+
+def test_fixture_server_decodes_gbk_keywords():
+    server = FixtureServer(FaultConfig(pages=2, items_per_page=1)).start()
+    try:
+        config = dict(HTTP_FETCH_CONFIG, search_url=server.base_url + "/search")
+        body = requests.get(req_m.build_search_url("人工智能", 1, config), timeout=5).content.decode("utf-8")
+    finally:
+        server.stop()
+    assert "人工智能 实战教程" in body
@@ -0,0 +1,27 @@
+"""Tests for image_process.is_valid_image on a body cut off mid-transfer."""
+
+# ===== Standard Library Modules =====
+from types import SimpleNamespace
+
+# ===== Custom Project Modules =====
+import image_process as img_pro
+from config import IMAGE_VALIDATION_CONFIG
+from fixture_server import FixtureServer, FaultConfig
+
+
+def test_truncated_body_is_a_retryable_failure(tmp_path):
+    context = SimpleNamespace(images_dir=tmp_path, image_client=None, http_cache=None, async_engine=None,
+                              img_not_valid_unhandled_exception_log_path=tmp_path / "unhandled.jsonl")
+    server = FixtureServer(FaultConfig(truncated_rate=1.0)).start()
+    try:
+        url = f"{server.base_url}/img/retry/1_1.jpg"
+        first = img_pro.is_valid_image(url, context, IMAGE_VALIDATION_CONFIG)
+        # Faults only hit the first request of a URL
+        second = img_pro.is_valid_image(url, context, IMAGE_VALIDATION_CONFIG)
+    finally:
+        server.stop()
+
+    assert first[:3] == (False, url, "Incomplete Image (Retryable)")
+    assert img_pro.is_retryable(first[2])
+    assert second[0] and second[3] is not None
+    assert list(tmp_path.iterdir()) == [second[3].path]